@@ -9,8 +9,12 @@ and register all namespaces.
 
 from flask import Flask
 from flask_restx import Api
+from app.cli import import_report
 from app.api.v1.users import api as users_ns
 from app.api.v1.places import api as places_ns
+from app.api.v1.amenities import api as amenities_ns
+from app.api.v1.reviews import api as reviews_ns
+from app.api.v1.changes import api as changes_ns
 
 
 def create_app():
@@ -36,5 +40,17 @@ def create_app():
     # Register the users namespace
     api.add_namespace(users_ns, path='/api/v1/users')
     api.add_namespace(places_ns, path='/api/v1/places')
+    api.add_namespace(amenities_ns, path='/api/v1/amenities')
+    api.add_namespace(reviews_ns, path='/api/v1/reviews')
+    api.add_namespace(changes_ns, path='/api/v1/changes')
+
+    from app.services import settings
+    if settings.METRICS:
+        from app.api.metrics import init_metrics
+        init_metrics(app, profile_dir=settings.PROFILE_DIR,
+                     sample_rate=settings.PROFILE_SAMPLE_RATE,
+                     slow_ms=settings.PROFILE_SLOW_MS)
+
+    app.cli.add_command(import_report)
 
     return app
@@ -0,0 +1,50 @@
+"""
+Conditional, cached JSON responses for the read endpoints.
+
+cached_json() derives a strong ETag from the cache key, which holds
+the versions the response is built from. A request whose
+If-None-Match matches is answered with 304 before anything is
+serialized; otherwise the body is served from the response cache, or
+built, serialized once and stored.
+"""
+
+import json
+from flask import current_app, request
+from app.services import response_cache
+
+
+def cached_json(key, build):
+    """
+    Return a JSON response for `key`, building it only on a cache miss.
+
+    Args:
+        key (tuple): Resource name followed by every version the
+            response depends on.
+        build (callable): Returns (data, headers) for the response;
+            data may also be a str holding already encoded JSON, as
+            produced by the compiled serializers.
+
+    Returns:
+        Response: 200 with the body and ETag, or 304 Not Modified.
+    """
+    etag = response_cache.etag(key)
+    if request.if_none_match.contains_weak(etag):
+        response_cache.count_not_modified()
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    entry = response_cache.get(key)
+    if entry is None:
+        data, headers = build()
+        if not isinstance(data, str):
+            data = json.dumps(data)
+        body = (data + "\n").encode()
+        response_cache.put(key, body, headers)
+    else:
+        body, headers = entry
+
+    response = current_app.response_class(
+        body, status=200, headers=headers, mimetype='application/json')
+    response.set_etag(etag)
+    return response
@@ -0,0 +1,112 @@
+"""
+Sparse fieldsets and expansion of related objects.
+
+The read endpoints of places and users accept two query parameters:
+
+    - `fields=id,title,price`: only these keys are returned;
+    - `expand=owner,amenities`: these related objects are embedded in
+      full. A relation that is not expanded is returned by id
+      (`owner_id`, `amenity_ids`).
+
+A FieldSet maps the selected keys to a compiled Serializer holding
+only those keys, so what is not requested is neither read from the
+objects nor serialized. Serializers are compiled once per distinct
+selection and kept.
+"""
+
+from app.api.serializers import Serializer
+
+
+def _names(value):
+    """Split a comma-separated query parameter, dropping empty items."""
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class FieldSet:
+    """
+    Keys a response can be reduced to.
+
+    Args:
+        name (str): Name of the serialized type.
+        spec (dict): Every selectable key -> flask-restx field, see
+            Serializer.
+        default (iterable): Keys returned when `fields` is not given.
+        relations (dict): Expandable key -> key returned instead
+            when it is not expanded, e.g. {'owner': 'owner_id'}.
+        extras (iterable): Selectable keys the endpoint adds itself
+            (e.g. a computed rating); serializers leave them out.
+    """
+    def __init__(self, name, spec, default, relations=None, extras=()):
+        self.name = name
+        self.spec = dict(spec)
+        self.relations = dict(relations or {})
+        self.extras = tuple(extras)
+        self.order = list(self.spec) + list(self.extras)
+        self.default = tuple(default)
+        self._serializers = {}
+        unknown = set(self.default) - set(self.order)
+        if unknown:
+            raise ValueError(f"Unknown default field: {sorted(unknown)[0]}")
+
+    def select(self, fields=None, expand=None, default_expand=()):
+        """
+        Return the keys selected by the query parameters.
+
+        Args:
+            fields (str): Value of `fields`, or None for the default
+                keys.
+            expand (str): Value of `expand`, or None.
+            default_expand (iterable): Relations expanded when
+                neither `fields` nor `expand` is given.
+
+        Returns:
+            tuple: Selected keys, in spec order.
+
+        Raises:
+            ValueError: If a field or relation name is unknown, or if
+                `fields` names no field.
+        """
+        if expand is not None:
+            expanded = set(_names(expand))
+        elif fields is None:
+            expanded = set(default_expand)
+        else:
+            expanded = set()
+        for name in expanded:
+            if name not in self.relations:
+                raise ValueError(f"Cannot expand: {name}")
+
+        if fields is None:
+            selected = set(self.default)
+            for relation, id_key in self.relations.items():
+                if relation in selected and relation not in expanded:
+                    selected.discard(relation)
+                    selected.add(id_key)
+        else:
+            selected = set(_names(fields))
+            if not selected:
+                raise ValueError("fields must name at least one field")
+            for name in selected:
+                if name not in self.order:
+                    raise ValueError(f"Unknown field: {name}")
+        selected |= expanded
+        return tuple(key for key in self.order if key in selected)
+
+    def serializer(self, keys):
+        """
+        Return the serializer of the selected keys.
+
+        Args:
+            keys (tuple): Value returned by select().
+
+        Returns:
+            Serializer: Builds the response of the keys of the spec;
+            extras are left to the caller.
+        """
+        serializer = self._serializers.get(keys)
+        if serializer is None:
+            serializer = Serializer(
+                f'{self.name}{len(self._serializers)}',
+                {key: self.spec[key] for key in keys if key in self.spec})
+            serializer = self._serializers.setdefault(keys, serializer)
+        return serializer
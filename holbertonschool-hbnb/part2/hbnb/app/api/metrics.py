@@ -0,0 +1,157 @@
+"""
+Request metrics and slow request profiles for the Flask application.
+
+init_metrics() is opt-in (HBNB_METRICS=1). It adds to an application:
+
+    - a latency histogram and status counters per endpoint, recorded
+      around every request;
+    - spans around every facade call and repository operation;
+    - GET /metrics, serving them in the Prometheus text format with
+      the response cache counters.
+
+With HBNB_PROFILE_SAMPLE_RATE above 0, that fraction of the requests
+also runs under cProfile. The profile is dumped to HBNB_PROFILE_DIR
+(load it with pstats or snakeviz) when the request took at least
+HBNB_PROFILE_SLOW_MS. One request is profiled at a time, and only the
+newest MAX_PROFILES dumps are kept.
+"""
+
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+from flask import current_app, g, request
+from app.services import app_metrics, facade, response_cache
+
+# Dumps kept in the profile directory
+MAX_PROFILES = 100
+
+# cProfile cannot profile two threads at once
+_profile_lock = threading.Lock()
+
+
+def _endpoint():
+    """Return the URL rule of the request, a bounded set of labels."""
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+class SlowRequestProfiler:
+    """
+    Profile a sample of the requests and keep the slow ones.
+
+    Args:
+        directory (str): Where the .prof dumps are written.
+        sample_rate (float): Fraction of the requests profiled.
+        slow_ms (float): Minimum duration of a dumped request.
+        max_profiles (int): Dumps kept; the oldest are removed.
+    """
+    def __init__(self, directory, sample_rate, slow_ms,
+                 max_profiles=MAX_PROFILES):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.max_profiles = max_profiles
+
+    def start(self):
+        """Return a running profiler for this request, or None."""
+        if random.random() >= self.sample_rate:
+            return None
+        if not _profile_lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active in this process
+            _profile_lock.release()
+            return None
+        return profiler
+
+    def stop(self, profiler, label, seconds):
+        """
+        Stop `profiler` and dump it if the request was slow.
+
+        Returns:
+            str: Path of the dump, or None.
+        """
+        profiler.disable()
+        _profile_lock.release()
+        if seconds * 1000 < self.slow_ms:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_')
+        path = os.path.join(
+            self.directory,
+            f'{time.time_ns()}-{slug}-{seconds * 1000:.0f}ms.prof')
+        profiler.dump_stats(path)
+        self._rotate()
+        return path
+
+    def _rotate(self):
+        dumps = sorted(name for name in os.listdir(self.directory)
+                       if name.endswith('.prof'))
+        for name in dumps[:-self.max_profiles]:
+            os.remove(os.path.join(self.directory, name))
+
+
+def metrics_view():
+    """Serve the metrics in the Prometheus text format."""
+    gauges = {f'hbnb_response_cache_{name}': value
+              for name, value in response_cache.stats().items()}
+    return current_app.response_class(
+        app_metrics.render(gauges),
+        mimetype='text/plain; version=0.0.4')
+
+
+def init_metrics(app, profile_dir='instance/profiles', sample_rate=0.0,
+                 slow_ms=500.0):
+    """
+    Record the metrics of the requests served by `app`.
+
+    Args:
+        app (Flask): Application to instrument.
+        profile_dir (str): Directory of the slow request profiles.
+        sample_rate (float): Fraction of the requests profiled, 0 to
+            disable profiling.
+        slow_ms (float): Minimum duration of a dumped profile.
+    """
+    app_metrics.instrument(facade, 'facade')
+    for name, repo in (('users', facade.user_repo),
+                       ('places', facade.place_repo),
+                       ('reviews', facade.review_repo),
+                       ('amenities', facade.amenity_repo)):
+        app_metrics.instrument(repo, f'repository.{name}')
+
+    profiler = None
+    if sample_rate > 0:
+        profiler = SlowRequestProfiler(profile_dir, sample_rate, slow_ms)
+    app.extensions['hbnb_profiler'] = profiler
+
+    @app.before_request
+    def start_timer():
+        g.metrics_profile = profiler.start() if profiler else None
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        seconds = time.perf_counter() - g.metrics_start
+        endpoint = _endpoint()
+        app_metrics.observe_request(request.method, endpoint,
+                                    response.status_code, seconds)
+        if g.metrics_profile is not None:
+            profile, g.metrics_profile = g.metrics_profile, None
+            profiler.stop(profile, f'{request.method} {endpoint}', seconds)
+        return response
+
+    @app.teardown_request
+    def stop_profile(error):
+        # after_request is skipped when the request failed
+        profile = g.pop('metrics_profile', None)
+        if profile is not None:
+            profile.disable()
+            _profile_lock.release()
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
@@ -0,0 +1,53 @@
+"""
+Streamed responses for the collection endpoints.
+
+stream_collection() writes a collection while it is being read from
+the repository: each batch pulled from the repository iterator is
+serialized and sent before the next one is fetched, so the memory
+used does not grow with the size of the collection. Two formats are
+produced:
+
+    - a JSON array sent in chunks (application/json);
+    - NDJSON, one object per line (application/x-ndjson), chosen
+      with `Accept: application/x-ndjson`.
+"""
+
+from flask import current_app, request
+
+NDJSON = 'application/x-ndjson'
+
+
+def wants_ndjson():
+    """Return True when the client prefers NDJSON to a JSON array."""
+    accept = request.accept_mimetypes
+    return accept[NDJSON] > accept['application/json']
+
+
+def stream_collection(batches, serializer, ndjson=False):
+    """
+    Return a streamed response of every object of `batches`.
+
+    Args:
+        batches (iterator): Lists of objects, e.g. from
+            Repository.iter_pages().
+        serializer (Serializer): Compiled serializer of the rows.
+        ndjson (bool): Write NDJSON instead of a JSON array.
+
+    Returns:
+        Response: 200 response with a chunked body.
+    """
+    def generate_ndjson():
+        for batch in batches:
+            yield '\n'.join(serializer.dumps_rows(batch)) + '\n'
+
+    def generate_array():
+        separator = '['
+        for batch in batches:
+            yield separator + ', '.join(serializer.dumps_rows(batch))
+            separator = ', '
+        yield '[]\n' if separator == '[' else ']\n'
+
+    if ndjson:
+        return current_app.response_class(generate_ndjson(), mimetype=NDJSON)
+    return current_app.response_class(
+        generate_array(), mimetype='application/json')
@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 
 from flask_restx import Namespace, Resource, fields
+from app.api.cache import cached_json
+from app.api.v1.serializers import amenity_serializer
 from app.services import facade
 
 api = Namespace('amenities', description='Amenity operations')
@@ -34,10 +36,11 @@ class AmenityList(Resource):
         """
 
         amenity_data = api.payload
-        amenity_new = facade.create_amenity(amenity_data)
-        if not new_amenity:
+        try:
+            new_amenity = facade.create_amenity(amenity_data)
+        except (ValueError, TypeError):
             return {'error': 'Invalid input data'}, 400
-        return {'id': new_amenity.id, 'name': new_amenity.name}, 201
+        return amenity_serializer(new_amenity), 201
 
     @api.response(200, 'List of amenities retrieved successfully')
     def get(self):
@@ -48,14 +51,47 @@ class AmenityList(Resource):
         This method queries the facade layer to
         retrieve all registered amenities.
 
+        Returns:
+        Response: List of amenities in dictionary format with its
+        ETag, or 304 if If-None-Match matches.
+        """
+
+        key = ('amenities', facade.collection_version('Amenity'))
+        return cached_json(key, lambda: (
+            amenity_serializer.dumps_many(facade.get_all_amenities()), {}))
+
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @api.expect([amenity_model])
+    @api.response(201, 'Batch processed, see per-item status')
+    @api.response(400, 'Payload is not a list')
+    def post(self):
+
+        """
+        Create several amenities in one request.
+
+        Each item is validated independently; the valid ones are
+        stored in a single repository call.
+
         Returns:
         tuple:
-            - list: List of amenities in dictionary format.
-            - int: HTTP code 200 if successful.
+            - list: One result per item, in order, with its HTTP
+              status and either the created amenity or an error.
+            - int: HTTP code 201.
         """
 
-        amenities = get_all_amenities()
-        return [amenity.to_dict() for amenity in amenities], 200
+        data = api.payload
+        if not isinstance(data, list):
+            return {'error': 'Expected a list of amenities'}, 400
+
+        results = []
+        for index, (amenity, error) in enumerate(facade.create_amenities(data)):
+            if error:
+                results.append({'index': index, 'status': 400, 'error': error})
+            else:
+                results.append({'index': index, 'status': 201,
+                                **amenity_serializer(amenity)})
+        return results, 201
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
@@ -82,12 +118,11 @@ class AmenityResource(Resource):
             - int: HTTP code 404.
         """
 
-        try:
-            amenity = get_amenity(amenity_id)
-        except ValueError:
+        amenity = facade.get_amenity(amenity_id)
+        if not amenity:
             return {"error": "Amenity not found"}, 404
 
-        return amenity.to_dict(), 200
+        return amenity_serializer(amenity), 200
 
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
@@ -118,14 +153,17 @@ class AmenityResource(Resource):
             - int: HTTP code 400.
         """
 
-        data = request.get_json()
+        data = api.payload
 
         if not data:
             return {"error": "Invalid input data"}, 400
 
         try:
-            updated_amenity = update_amenity(amenity_id, data)
+            updated_amenity = facade.update_amenity(amenity_id, data)
         except ValueError:
+            return {"error": "Invalid input data"}, 400
+
+        if not updated_amenity:
             return {"error": "Amenity not found"}, 404
 
-        return updated_amenity.to_dict(), 200
+        return amenity_serializer(updated_amenity), 200
@@ -0,0 +1,178 @@
+"""
+Change feed API namespace.
+
+GET /api/v1/changes/ returns the writes made to the repositories
+after a sequence number, so that a consumer (a search index, a cache,
+an analytics job) syncs incrementally instead of listing the
+collections. Two ways to follow the feed:
+
+    - long polling: `?since=CURSOR&wait=S` answers as soon as there
+      are events after the cursor, or after S seconds with none; the
+      next request passes the returned `next` as `since`;
+    - Server-Sent Events with `Accept: text/event-stream`: one SSE
+      event per write, its `id` being its cursor, so that a
+      reconnecting client resumes from `Last-Event-ID`.
+
+A cursor is "EPOCH:SEQ": the epoch identifies the feed of this
+process, whose sequence numbers restart after a restart. A bare
+sequence number is taken as one of the current feed (`since=0` reads
+the feed from its start).
+
+Only the newest events are kept (HBNB_CHANGE_FEED_SIZE). A consumer
+that fell behind them, or whose cursor is from another epoch (the
+server restarted, or another worker process answered), gets 410 Gone
+and must reload the collections.
+"""
+
+import json
+from flask import current_app, request
+from flask_restx import Namespace, Resource
+from app.services import facade
+
+api = Namespace('changes', description='Change feed of the repositories')
+
+COLLECTIONS = ('users', 'amenities', 'places', 'reviews')
+EVENT_STREAM = 'text/event-stream'
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+# Longest long poll, in seconds
+MAX_WAIT = 30
+# Seconds between two SSE comments keeping an idle connection open
+KEEPALIVE_SECONDS = 15
+
+changes_parser = api.parser()
+changes_parser.add_argument('since', type=str, location='args',
+                            help='Cursor returned in `next`, or a '
+                                 'sequence number (default: now)')
+changes_parser.add_argument('limit', type=int, location='args',
+                            help='Maximum number of events per response; '
+                                 'ends an event stream after that many')
+changes_parser.add_argument('wait', type=float, default=0, location='args',
+                            help=f'Seconds to wait for an event, at most '
+                                 f'{MAX_WAIT}')
+changes_parser.add_argument('collections', type=str, location='args',
+                            help='Comma-separated collections to follow')
+
+
+def _parse_collections(value):
+    """Return the set of collections named by `value`, None for all."""
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    for name in names:
+        if name not in COLLECTIONS:
+            raise ValueError(f"Unknown collection: {name}")
+    return names
+
+
+def _gone(since):
+    feed = facade.changes
+    return {'error': f'Events after {since} are no longer available; '
+                     f'reload the collections',
+            'epoch': feed.epoch,
+            'first_seq': feed.first_seq,
+            'last_seq': feed.last_seq,
+            'next': feed.cursor(feed.last_seq)}, 410
+
+
+def _sse(event):
+    """Format one ChangeEvent as a Server-Sent Event."""
+    return (f'id: {facade.changes.cursor(event.seq)}\n'
+            f'event: {event.type}\n'
+            f'data: {json.dumps(event.to_dict())}\n\n')
+
+
+def event_stream(since, collections, limit=None):
+    """
+    Yield the events after `since` as Server-Sent Events, for ever.
+
+    When the stream falls behind the feed, a `reset` event carrying
+    the sequence number to resume from is sent instead.
+
+    Args:
+        since (int): Last sequence number the client has seen.
+        collections (set): Collections followed, None for all.
+        limit (int): End the stream after that many events.
+    """
+    sent = 0
+    while limit is None or sent < limit:
+        batch = DEFAULT_LIMIT if limit is None else min(
+            DEFAULT_LIMIT, limit - sent)
+        result = facade.get_changes(since, batch, collections,
+                                    timeout=KEEPALIVE_SECONDS)
+        if result is None:
+            since = facade.changes.last_seq
+            cursor = facade.changes.cursor(since)
+            yield (f'id: {cursor}\nevent: reset\n'
+                   f'data: {json.dumps({"seq": since, "next": cursor})}'
+                   f'\n\n')
+            continue
+        events, since = result
+        if not events:
+            yield ': keepalive\n\n'
+            continue
+        yield ''.join(_sse(event) for event in events)
+        sent += len(events)
+
+
+@api.route('/')
+class ChangeList(Resource):
+    """Resource following the writes made to the collections."""
+
+    @api.expect(changes_parser)
+    @api.response(200, 'Events after `since`, oldest first')
+    @api.response(400, 'Invalid parameters')
+    @api.response(410, 'Events after `since` were dropped')
+    def get(self):
+        """
+        Retrieve the created / updated / deleted events after `since`.
+
+        Returns:
+        tuple: {"events": [...], "next": cursor to pass as `since`
+        next time, "epoch": epoch of the feed, "last_seq": newest
+        event} and 200, or an event stream with
+        `Accept: text/event-stream`.
+        """
+        args = changes_parser.parse_args()
+        try:
+            collections = _parse_collections(args['collections'])
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        limit = args['limit']
+        if limit is not None and not 1 <= limit <= MAX_LIMIT:
+            return {'error': f'limit must be between 1 and {MAX_LIMIT}'}, 400
+        if not 0 <= args['wait'] <= MAX_WAIT:
+            return {'error': f'wait must be between 0 and {MAX_WAIT}'}, 400
+
+        cursor = request.headers.get('Last-Event-ID', args['since'])
+        if cursor is None:
+            since = facade.changes.last_seq
+        else:
+            try:
+                since = facade.changes.parse_cursor(cursor)
+            except ValueError:
+                return {'error': 'since and Last-Event-ID must be a cursor '
+                                 'returned in next, or a non-negative '
+                                 'integer'}, 400
+            if since is None:
+                return _gone(cursor)
+
+        accept = request.accept_mimetypes
+        if accept[EVENT_STREAM] > accept['application/json']:
+            if facade.changes.since(since, 0) is None:
+                return _gone(since)
+            response = current_app.response_class(
+                event_stream(since, collections, limit),
+                mimetype=EVENT_STREAM)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+
+        result = facade.get_changes(since, limit or DEFAULT_LIMIT,
+                                    collections, timeout=args['wait'])
+        if result is None:
+            return _gone(since)
+        events, next_seq = result
+        return {'events': [event.to_dict() for event in events],
+                'next': facade.changes.cursor(next_seq),
+                'epoch': facade.changes.epoch,
+                'last_seq': facade.changes.last_seq}, 200
@@ -7,24 +7,17 @@ service layer to handle business logic and data persistence.
 """
 
 
-from flask_restx import Namespace, Resource, fields
+import json
+from flask_restx import Namespace, Resource, fields, inputs
+from app.api.cache import cached_json
+from app.api.streaming import stream_collection, wants_ndjson
+from app.api.v1.serializers import (
+    place_detail_fieldset, place_review_serializer, place_serializer,
+    place_summary_fieldset, place_summary_serializer)
 from app.services import facade
 
 api = Namespace('places', description='Place operations')
 
-# Define the models for related entities
-amenity_model = api.model('PlaceAmenity', {
-    'id': fields.String(description='Amenity ID'),
-    'name': fields.String(description='Name of the amenity')
-})
-
-user_model = api.model('PlaceUser', {
-    'id': fields.String(description='User ID'),
-    'first_name': fields.String(description='First name of the owner'),
-    'last_name': fields.String(description='Last name of the owner'),
-    'email': fields.String(description='Email of the owner')
-})
-
 # Define the place model for input validation and documentation
 place_model = api.model('Place', {
     'title': fields.String(required=True, description='Title of the place'),
@@ -45,24 +38,86 @@ place_model = api.model('Place', {
     )
 })
 
-review_model = api.model('PlaceReview', {
-    'id': fields.String(description='Review ID'),
-    'text': fields.String(description='Text of the review'),
-    'rating': fields.Integer(description='Rating of the place (1-5)'),
-    'user_id': fields.String(description='ID of the user')
-})
+# Query parameters for keyset pagination of the collection
+page_parser = api.parser()
+page_parser.add_argument('limit', type=int, location='args',
+                         help='Maximum number of places to return')
+page_parser.add_argument('cursor', type=str, location='args',
+                         help='Cursor returned in X-Next-Cursor')
+page_parser.add_argument('stream', type=inputs.boolean, default=False,
+                         location='args',
+                         help='Stream the whole collection in chunks')
+page_parser.add_argument('fields', type=str, location='args',
+                         help='Comma-separated keys to return')
+page_parser.add_argument('expand', type=str, location='args',
+                         help='Related objects to embed: owner, amenities')
+page_parser.add_argument('amenities', type=str, location='args',
+                         help='Comma-separated IDs of amenities a place '
+                              'must all have')
+page_parser.add_argument('min_price', type=float, location='args',
+                         help='Minimum price per night, inclusive')
+page_parser.add_argument('max_price', type=float, location='args',
+                         help='Maximum price per night, inclusive')
+page_parser.add_argument('offset', type=int, location='args',
+                         help='Number of filtered places to skip')
+
+# Query parameters of the place detail
+detail_parser = api.parser()
+detail_parser.add_argument('fields', type=str, location='args',
+                           help='Comma-separated keys to return')
+detail_parser.add_argument('expand', type=str, location='args',
+                           help='Related objects to embed: owner, amenities '
+                                '(both by default)')
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def related_versions(keys):
+    """Return the versions of the collections embedded by `keys`."""
+    versions = []
+    if 'owner' in keys:
+        versions.append(facade.collection_version('User'))
+    if 'amenities' in keys:
+        versions.append(facade.collection_version('Amenity'))
+    return tuple(versions)
+
+
+def filtered_places(args, keys, serializer):
+    """
+    Build the response of the place list filtered by amenities and price.
+
+    Returns:
+    Response: {"count": matches, "facets": {"amenities": {id: matches
+    having it}}, "places": [...]}, or an error and 400.
+    """
+    if args['cursor']:
+        return {'error': 'cursor cannot be combined with filters; '
+                         'use offset'}, 400
+    limit = DEFAULT_PAGE_SIZE if args['limit'] is None else args['limit']
+    offset = args['offset'] or 0
+    amenity_ids = tuple(sorted({
+        amenity_id.strip() for amenity_id in (args['amenities'] or '')
+        .split(',') if amenity_id.strip()}))
+
+    def build():
+        places, count, facets = facade.filter_places(
+            amenity_ids, args['min_price'], args['max_price'],
+            limit, offset)
+        # The places are already encoded by the compiled serializer
+        head = json.dumps({'count': count,
+                           'facets': {'amenities': facets}})
+        return (f'{head[:-1]}, "places": '
+                f'{serializer.dumps_many(places)}}}'), {}
+
+    key = ('places', facade.collection_version('Place'), 'filter',
+           amenity_ids, args['min_price'], args['max_price'], limit, offset)
+    if keys is not None:
+        key += (keys,) + related_versions(keys)
+    try:
+        return cached_json(key, build)
+    except ValueError as error:
+        return {'error': str(error)}, 400
 
-place_model = api.model('Place', {
-    'title': fields.String(required=True, description='Title of the place'),
-    'description': fields.String(description='Description of the place'),
-    'price': fields.Float(required=True, description='Price per night'),
-    'latitude': fields.Float(required=True, description='Latitude of the place'),
-    'longitude': fields.Float(required=True, description='Longitude of the place'),
-    'owner_id': fields.String(required=True, description='ID of the owner'),
-    'owner': fields.Nested(user_model, description='Owner of the place'),
-    'amenities': fields.List(fields.Nested(amenity_model), description='List of amenities'),
-    'reviews': fields.List(fields.Nested(review_model), description='List of reviews')
-})
 
 @api.route('/')
 class PlaceList(Resource):
@@ -94,82 +149,271 @@ class PlaceList(Resource):
             new_place = facade.create_place(place_data)
         except ValueError as error:
             return {'error': str(error)}, 400
-        return {
-            'id': new_place.id,
-            'title': new_place.title,
-            'description': new_place.description,
-            'price': new_place.price,
-            'latitude': new_place.latitude,
-            'longitude': new_place.longitude,
-            'owner_id': new_place.owner.id
-        }, 201
+        return place_serializer(new_place), 201
 
+    @api.expect(page_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
     def get(self):
         """
-        Retrieve the list of all locations.
+        Retrieve the list of all locations, or filter them.
 
         Retrieves all locations via the facade and returns a simplified list
         containing the ID, title, latitude, and longitude of each location.
+        `fields` and `expand` select other keys of the place, and
+        embed the owner or the amenities in each row. When `limit` or
+        `cursor` is given, only one page is returned and
+        the cursor of the next page, if any, is sent in X-Next-Cursor.
+        The response carries an ETag and is served from the response
+        cache until a place is written. With `stream=true` or
+        `Accept: application/x-ndjson`, the whole collection is
+        streamed from the repository in batches instead, as a chunked
+        JSON array or as NDJSON.
+        With `amenities` (places having all of them), `min_price` or
+        `max_price`, the places are filtered with the facade's bitmap
+        indexes and returned with their count and per-amenity counts,
+        `limit` and `offset` selecting the page.
 
         Returns:
-        tuple: A list of dictionaries representing each location and
-        the HTTP 200 code.
+        Response: A list of dictionaries representing each location,
+        the filtered places and their facets, or 304 if
+        If-None-Match matches.
         """
-        places = facade.get_all_places()
-        List_places = []
-        for place in places:
-            List_places.append({
-                'id': place.id,
-                'title': place.title,
-                'latitude': place.latitude,
-                'longitude': place.longitude
-            })
-        return List_places, 200
+        args = page_parser.parse_args()
+        paginated = args['limit'] is not None or bool(args['cursor'])
+        limit = args['limit']
+        if paginated and limit is None:
+            limit = DEFAULT_PAGE_SIZE
+        if paginated and limit < 1:
+            return {'error': 'limit must be a positive integer'}, 400
+        keys = None
+        serializer = place_summary_serializer
+        if args['fields'] is not None or args['expand'] is not None:
+            try:
+                keys = place_summary_fieldset.select(
+                    args['fields'], args['expand'])
+            except ValueError as error:
+                return {'error': str(error)}, 400
+            serializer = place_summary_fieldset.serializer(keys)
+        if (args['amenities'] is not None or args['min_price'] is not None
+                or args['max_price'] is not None):
+            return filtered_places(args, keys, serializer)
+        if not paginated and (args['stream'] or wants_ndjson()):
+            return stream_collection(facade.iter_places(), serializer,
+                                     ndjson=wants_ndjson())
+
+        def build():
+            headers = {}
+            if not paginated:
+                places = facade.get_all_places()
+            else:
+                places, next_cursor = facade.get_places_page(
+                    limit, args['cursor'])
+                if next_cursor:
+                    headers['X-Next-Cursor'] = next_cursor
+            return serializer.dumps_many(places), headers
+
+        key = ('places', facade.collection_version('Place'),
+               limit, args['cursor'])
+        if keys is not None:
+            key += (keys,) + related_versions(keys)
+        try:
+            return cached_json(key, build)
+        except ValueError as error:
+            return {'error': str(error)}, 400
+
+
+# Query parameters of the "places near me" search
+near_parser = api.parser()
+near_parser.add_argument('lat', type=float, required=True, location='args',
+                         help='Latitude of the center')
+near_parser.add_argument('lon', type=float, required=True, location='args',
+                         help='Longitude of the center')
+near_parser.add_argument('radius_km', type=float, default=10.0,
+                         location='args', help='Search radius in km')
+near_parser.add_argument('limit', type=int, default=10, location='args',
+                         help='Maximum number of places to return')
+
+MAX_NEAR_RADIUS_KM = 1000
+MAX_NEAR_LIMIT = 100
+
+
+@api.route('/near')
+class PlaceNear(Resource):
+    """
+    Resource for searching places around a point.
+    """
+    @api.expect(near_parser)
+    @api.response(200, 'Nearest places retrieved successfully')
+    @api.response(400, 'Invalid search parameters')
+    def get(self):
+        """
+        Retrieve the places nearest to a location.
+
+        Uses the facade's spatial index, so only the places in the
+        grid cells around the point are examined.
+
+        Returns:
+        tuple: A list of places ordered by distance, each with its
+        distance in km, and the HTTP 200 code.
+        """
+        args = near_parser.parse_args()
+        if args['radius_km'] > MAX_NEAR_RADIUS_KM:
+            return {'error': f'radius_km must be at most {MAX_NEAR_RADIUS_KM}'}, 400
+        if args['limit'] > MAX_NEAR_LIMIT:
+            return {'error': f'limit must be at most {MAX_NEAR_LIMIT}'}, 400
+
+        try:
+            nearest = facade.get_places_near(
+                args['lat'], args['lon'], args['radius_km'], args['limit'])
+        except ValueError as error:
+            return {'error': str(error)}, 400
+
+        return [{
+            **place_summary_serializer(place),
+            'distance_km': round(distance, 3)
+        } for place, distance in nearest], 200
+
+
+# Query parameters of the full-text search
+search_parser = api.parser()
+search_parser.add_argument('q', type=str, required=True, location='args',
+                           help='Words to search; the last one may be '
+                                'incomplete')
+search_parser.add_argument('limit', type=int, default=10, location='args',
+                           help='Maximum number of places to return')
+
+MAX_SEARCH_LIMIT = 100
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    """
+    Resource for the full-text search of places.
+    """
+    @api.expect(search_parser)
+    @api.response(200, 'Matching places retrieved successfully')
+    @api.response(400, 'Invalid search parameters')
+    def get(self):
+        """
+        Search places by title, description and amenity names.
+
+        Uses the facade's inverted index: only the places containing
+        every word of `q` are ranked (BM25), and the last word also
+        matches as a prefix, for autocomplete.
+
+        Returns:
+        tuple: A list of places ordered by relevance, each with its
+        score, and the HTTP 200 code.
+        """
+        args = search_parser.parse_args()
+        if args['limit'] > MAX_SEARCH_LIMIT:
+            return {'error': f'limit must be at most {MAX_SEARCH_LIMIT}'}, 400
+
+        try:
+            results = facade.search_places(args['q'], args['limit'])
+        except ValueError as error:
+            return {'error': str(error)}, 400
+
+        return [{
+            **place_summary_serializer(place),
+            'score': round(score, 4)
+        } for place, score in results], 200
+
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    """
+    Resource for creating many places in one request.
+    """
+    @api.expect([place_model])
+    @api.response(201, 'Batch processed, see per-item status')
+    @api.response(400, 'Payload is not a list')
+    def post(self):
+        """
+        Register several places.
+
+        Validates every item in one pass through the facade, which
+        resolves each distinct owner and amenity once and stores the
+        valid places in a single repository call.
+
+        Returns:
+        tuple: A list with one result per item, in order, holding its
+        HTTP status and either the new place or an error message, and
+        the HTTP status code 201.
+        """
+        places_data = api.payload
+        if not isinstance(places_data, list):
+            return {'error': 'Expected a list of places'}, 400
+
+        results = []
+        for index, (place, error) in enumerate(
+                facade.create_places(places_data)):
+            if error:
+                results.append({'index': index, 'status': 400, 'error': error})
+            else:
+                results.append({'index': index, 'status': 201,
+                                **place_serializer(place)})
+        return results, 201
 
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
+    @api.expect(detail_parser)
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(400, 'Invalid fields or expand parameter')
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """
         Retrieve details of a place by its ID.
 
         Retrieves a specific place via its ID. If the place does not exist,
-        returns a 404 error with an appropriate message.
+        returns a 404 error with an appropriate message. The owner and
+        the amenities are embedded unless `expand` leaves them out
+        (they are then returned by id), and `fields` reduces the
+        response to the listed keys. Only the selected keys are
+        serialized, and the rating is only computed if selected.
 
         Args:
         place_id (str): The unique identifier of the place to retrieve.
 
         Returns:
-        tuple: A dictionary containing detailed information
-        about the place and HTTP code 200 if found, or an error message
-        with code 404 if not found."""
+        Response: A dictionary containing detailed information
+        about the place with its ETag (304 if If-None-Match matches),
+        or an error message with code 404 if not found."""
+        args = detail_parser.parse_args()
+        try:
+            keys = place_detail_fieldset.select(
+                args['fields'], args['expand'],
+                default_expand=('owner', 'amenities'))
+        except ValueError as error:
+            return {'error': str(error)}, 400
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
-        return {
-            'id': place.id,
-            'title': place.title,
-            'description': place.description,
-            'price': place.price,
-            'latitude': place.latitude,
-            'longitude': place.longitude,
-            'owner': {
-                'id': place.owner.id,
-                'first_name': place.owner.first_name,
-                'last_name': place.owner.last_name,
-                'email': place.owner.email
-            },
-            'amenities': [
-                {
-                    'id': amenity.id,
-                    'name': amenity.name
-                }
-                for amenity in place.amenities
-            ]
-        }, 200
+        # Everything the selected keys are built from: the place and,
+        # when selected, its owner, its amenities and its rating.
+        key = ('place', keys, place.id, place.version)
+        if 'owner' in keys:
+            key += (place.owner.id, place.owner.version)
+        if 'amenities' in keys:
+            key += (tuple((amenity.id, amenity.version)
+                          for amenity in place.amenities),)
+        elif 'amenity_ids' in keys:
+            key += (tuple(place.amenity_ids),)
+        rating = None
+        if 'rating' in keys:
+            rating = facade.get_place_rating(place.id)
+            key += (tuple(rating['histogram'].values()),)
+        serializer = place_detail_fieldset.serializer(keys)
+
+        def build():
+            data = serializer(place)
+            if rating is not None:
+                data['rating'] = rating
+            return data, {}
+
+        return cached_json(key, build)
 
     @api.expect(place_model)
     @api.response(200, 'Place updated successfully')
@@ -201,15 +445,59 @@ class PlaceResource(Resource):
         if not update_place:
             return {'error': 'Place not found'}, 404
 
-        return {
-            'id': update_place.id,
-            'title': update_place.title,
-            'description': update_place.description,
-            'price': update_place.price,
-            'latitude': update_place.latitude,
-            'longitude': update_place.longitude,
-            'owner_id': update_place.owner.id
-        }, 200
+        return place_serializer(update_place), 200
+
+    @api.response(200, 'Place deleted successfully')
+    @api.response(404, 'Place not found')
+    def delete(self, place_id):
+        """
+        Delete a place and its reviews.
+
+        The place also leaves the facade's indexes (price columns,
+        amenity bitmaps, grid and search), so the filters and the
+        facet counts stop counting it.
+
+        Args:
+        place_id (str): The unique identifier of the place to delete.
+
+        Returns:
+        tuple: A confirmation message and HTTP code 200, or an error
+        message with code 404 if the place does not exist.
+        """
+        if not facade.delete_place(place_id):
+            return {'error': 'Place not found'}, 404
+        return {'message': 'Place deleted successfully'}, 200
+
+
+@api.route('/<place_id>/amenities/<amenity_id>')
+class PlaceAmenity(Resource):
+    @api.response(200, 'Amenity added to the place')
+    @api.response(400, 'Amenity not found')
+    @api.response(404, 'Place not found')
+    def put(self, place_id, amenity_id):
+        """
+        Add an amenity to a place.
+
+        Idempotent: a place already having the amenity is returned
+        unchanged. The amenity bitmaps used by the place filters are
+        updated with the place.
+
+        Args:
+        place_id (str): The unique identifier of the place.
+        amenity_id (str): The unique identifier of the amenity.
+
+        Returns:
+        tuple: The place and HTTP code 200, or an error message with
+        code 400 or 404.
+        """
+        try:
+            place = facade.add_place_amenity(place_id, amenity_id)
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        if not place:
+            return {'error': 'Place not found'}, 404
+        return place_serializer(place), 200
+
 
 @api.route('/<place_id>/reviews')
 class PlaceReviewList(Resource):
@@ -243,5 +531,5 @@ class PlaceReviewList(Resource):
             return {"message": "Place not found"}, 404
         reviews = facade.get_reviews_by_place(place_id)
 
-        return [r.to_dict() for r in reviews], 200
+        return place_review_serializer.many(reviews), 200
 
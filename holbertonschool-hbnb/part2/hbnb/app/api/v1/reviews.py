@@ -1,4 +1,5 @@
 from flask_restx import Namespace, Resource, fields
+from app.api.v1.serializers import review_serializer
 from app.services import facade
 
 api = Namespace('reviews', description='Review operations')
@@ -11,6 +12,7 @@ review_model = api.model('Review', {
     'place_id': fields.String(required=True, description='ID of the place')
 })
 
+
 @api.route('/')
 class ReviewList(Resource):
 
@@ -37,16 +39,12 @@ class ReviewList(Resource):
         """
 
         data = api.payload
-        new_review = facade.create_review(data)
-
-        if not new_review:
-            return {'error': 'Invalid input data'}, 400
+        try:
+            new_review = facade.create_review(data)
+        except ValueError as error:
+            return {'error': str(error)}, 400
 
-        return {'id': new_review.id,
-                'rating': new_review.rating,
-                'text': new_review.text,
-                'place_id': new_review.place_id,
-                'user_id': new_review.user_id}, 201
+        return review_serializer(new_review), 201
 
     @api.response(200, 'List of reviews retrieved successfully')
     def get(self):
@@ -64,11 +62,7 @@ class ReviewList(Resource):
 
         reviews = facade.get_all_reviews()
 
-        return {'id': new_review.id,
-                'rating': new_review.rating,
-                'text': new_review.text,
-                'place_id': new_review.place_id,
-                'user_id': new_review.user_id}, 200
+        return review_serializer.many(reviews), 200
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
@@ -93,8 +87,6 @@ class ReviewResource(Resource):
         If the review does not exist:
             - dict: Error message.
             - int: HTTP code 404.
-
-        Translated with DeepL.com (free version)
         """
 
         review = facade.get_review(review_id)
@@ -102,11 +94,7 @@ class ReviewResource(Resource):
         if not review:
             return {'error': 'Review not found'}, 404
 
-        return {'id': new_review.id,
-                'rating': new_review.rating,
-                'text': new_review.text,
-                'place_id': new_review.place_id,
-                'user_id': new_review.user_id}, 200
+        return review_serializer(review), 200
 
     @api.expect(review_model)
     @api.response(200, 'Review updated successfully')
@@ -142,16 +130,12 @@ class ReviewResource(Resource):
 
         if not review:
             return {'error': 'Review not found'}, 404
-        updated_review = facade.update_review(review_id, data)
-
-        if not updated_review:
-            return {'error': 'Invalid input data'}, 400
+        try:
+            updated_review = facade.update_review(review_id, data)
+        except ValueError as error:
+            return {'error': str(error)}, 400
 
-        return {'id': new_review.id,
-                'rating': new_review.rating,
-                'text': new_review.text,
-                'place_id': new_review.place_id,
-                'user_id': new_review.user_id}, 200
+        return review_serializer(updated_review), 200
 
     @api.response(200, 'Review deleted successfully')
     @api.response(404, 'Review not found')
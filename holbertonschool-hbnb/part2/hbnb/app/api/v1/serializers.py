@@ -0,0 +1,104 @@
+"""
+Response serializers of the v1 namespaces.
+
+Each field spec is compiled once, on first use, and the serializer is
+shared by every endpoint that returns the same shape. The fieldsets
+compile one serializer per selection of ?fields= / ?expand=.
+"""
+
+from flask_restx import fields
+from app.api.fieldsets import FieldSet
+from app.api.serializers import Serializer
+
+user_fields = {
+    'id': fields.String,
+    'first_name': fields.String,
+    'last_name': fields.String,
+    'email': fields.String,
+}
+
+amenity_fields = {
+    'id': fields.String,
+    'name': fields.String,
+}
+
+# Collection rows and search results
+place_summary_fields = {
+    'id': fields.String,
+    'title': fields.String,
+    'latitude': fields.Float,
+    'longitude': fields.Float,
+}
+
+# Create / update responses, the owner by id
+place_fields = {
+    'id': fields.String,
+    'title': fields.String,
+    'description': fields.String,
+    'price': fields.Float,
+    'latitude': fields.Float,
+    'longitude': fields.Float,
+    'owner_id': fields.String(attribute='owner.id'),
+}
+
+# Detail response with the owner and amenities nested
+place_detail_fields = {
+    'id': fields.String,
+    'title': fields.String,
+    'description': fields.String,
+    'price': fields.Float,
+    'latitude': fields.Float,
+    'longitude': fields.Float,
+    'owner': fields.Nested(user_fields),
+    'amenities': fields.List(fields.Nested(amenity_fields)),
+}
+
+# Every key of a place response that ?fields= / ?expand= can select
+place_selectable_fields = {
+    'id': fields.String,
+    'title': fields.String,
+    'description': fields.String,
+    'price': fields.Float,
+    'latitude': fields.Float,
+    'longitude': fields.Float,
+    'owner_id': fields.String(attribute='owner.id'),
+    'amenity_ids': fields.List(fields.String),
+    'owner': fields.Nested(user_fields),
+    'amenities': fields.List(fields.Nested(amenity_fields)),
+}
+
+review_fields = {
+    'id': fields.String,
+    'rating': fields.Integer,
+    'text': fields.String,
+    'place_id': fields.String(attribute='place.id'),
+    'user_id': fields.String(attribute='user.id'),
+}
+
+# Reviews listed under their place
+place_review_fields = {
+    'id': fields.String,
+    'text': fields.String,
+    'rating': fields.Integer,
+    'user_id': fields.String(attribute='user.id'),
+}
+
+user_serializer = Serializer('User', user_fields)
+amenity_serializer = Serializer('Amenity', amenity_fields)
+place_summary_serializer = Serializer('PlaceSummary', place_summary_fields)
+place_serializer = Serializer('Place', place_fields)
+place_detail_serializer = Serializer('PlaceDetail', place_detail_fields)
+review_serializer = Serializer('Review', review_fields)
+place_review_serializer = Serializer('PlaceReview', place_review_fields)
+
+place_relations = {'owner': 'owner_id', 'amenities': 'amenity_ids'}
+# Detail: the detail response, rating computed by the endpoint
+place_detail_fieldset = FieldSet(
+    'PlaceDetailFields', place_selectable_fields,
+    list(place_detail_fields) + ['rating'], place_relations,
+    extras=['rating'])
+# Collection rows: the summary
+place_summary_fieldset = FieldSet(
+    'PlaceSummaryFields', place_selectable_fields,
+    place_summary_fields, place_relations)
+user_fieldset = FieldSet('UserFields', user_fields, user_fields)
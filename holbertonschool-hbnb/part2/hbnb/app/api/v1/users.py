@@ -7,7 +7,10 @@ service layer to handle business logic and data persistence.
 """
 
 
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, inputs
+from app.api.cache import cached_json
+from app.api.streaming import stream_collection, wants_ndjson
+from app.api.v1.serializers import user_fieldset, user_serializer
 from app.services import facade
 
 api = Namespace('users', description='User operations')
@@ -19,6 +22,25 @@ user_model = api.model('User', {
     'email': fields.String(required=True, description='Email of the user')
 })
 
+# Query parameters for keyset pagination of the collection
+page_parser = api.parser()
+page_parser.add_argument('limit', type=int, location='args',
+                         help='Maximum number of users to return')
+page_parser.add_argument('cursor', type=str, location='args',
+                         help='Cursor returned in X-Next-Cursor')
+page_parser.add_argument('stream', type=inputs.boolean, default=False,
+                         location='args',
+                         help='Stream the whole collection in chunks')
+page_parser.add_argument('fields', type=str, location='args',
+                         help='Comma-separated keys to return')
+
+# Query parameters of the user detail
+detail_parser = api.parser()
+detail_parser.add_argument('fields', type=str, location='args',
+                           help='Comma-separated keys to return')
+
+DEFAULT_PAGE_SIZE = 100
+
 @api.route('/')
 class UserList(Resource):
     """
@@ -53,34 +75,97 @@ class UserList(Resource):
         except ValueError as error:
             return {'error': str(error)}, 400
 
-        return {
-            'id': new_user.id,
-            'first_name': new_user.first_name,
-            'last_name': new_user.last_name,
-            'email': new_user.email
-        }, 201
+        return user_serializer(new_user), 201
 
+    @api.expect(page_parser)
     @api.response(200, 'User details retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
     def get(self):
         """
         Retrieve all users.
 
-        Fetches the complete list of users from the service
-        layer and returns them as a JSON array.
+        Fetches the list of users from the service layer and returns
+        them as a JSON array. When `limit` or `cursor` is given, only
+        one page is returned and the cursor of the next page, if any,
+        is sent in the X-Next-Cursor header. The response carries an
+        ETag and is served from the response cache until a user is
+        written. `fields` reduces each user to the listed keys.
+
+        With `stream=true` or `Accept: application/x-ndjson`, the
+        whole collection is instead streamed from the repository in
+        batches, as a chunked JSON array or as NDJSON.
+
+        Returns:
+            Response: List of users, or 304 if If-None-Match matches.
+        """
+        args = page_parser.parse_args()
+        paginated = args['limit'] is not None or bool(args['cursor'])
+        limit = args['limit']
+        if paginated and limit is None:
+            limit = DEFAULT_PAGE_SIZE
+        if paginated and limit < 1:
+            return {'error': 'limit must be a positive integer'}, 400
+        try:
+            keys = user_fieldset.select(args['fields'])
+        except ValueError as error:
+            return {'error': str(error)}, 400
+        serializer = user_fieldset.serializer(keys)
+        if not paginated and (args['stream'] or wants_ndjson()):
+            return stream_collection(facade.iter_users(), serializer,
+                                     ndjson=wants_ndjson())
+
+        def build():
+            headers = {}
+            if not paginated:
+                users = facade.get_all_users()
+            else:
+                users, next_cursor = facade.get_users_page(
+                    limit, args['cursor'])
+                if next_cursor:
+                    headers['X-Next-Cursor'] = next_cursor
+            return serializer.dumps_many(users), headers
+
+        key = ('users', facade.collection_version('User'),
+               limit, args['cursor'], keys)
+        try:
+            return cached_json(key, build)
+        except ValueError as error:
+            return {'error': str(error)}, 400
+
+
+@api.route('/bulk')
+class UserBulk(Resource):
+    """
+    Resource for creating many users in one request.
+    """
+
+    @api.expect([user_model])
+    @api.response(201, 'Batch processed, see per-item status')
+    @api.response(400, 'Payload is not a list')
+    def post(self):
+        """
+        Create several users.
+
+        Each item is validated independently (including email
+        uniqueness); the valid users are stored in a single
+        repository call.
 
         Returns:
-            tuple: List of users and HTTP status code.
+            tuple: One result per item, in order, with its HTTP status
+            and either the created user or an error, and status 201.
         """
-        users = facade.get_all_users()
-        List_user = []
-        for user in users:
-            List_user.append({
-                'id': user.id,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'email': user.email
-            })
-        return List_user, 200
+        users_data = api.payload
+        if not isinstance(users_data, list):
+            return {'error': 'Expected a list of users'}, 400
+
+        results = []
+        for index, (user, error) in enumerate(facade.create_users(users_data)):
+            if error:
+                results.append({'index': index, 'status': 400, 'error': error})
+            else:
+                results.append({'index': index, 'status': 201,
+                                **user_serializer(user)})
+        return results, 201
 
 
 @api.route('/<user_id>')
@@ -91,26 +176,32 @@ class UserResource(Resource):
     Provides endpoints to retrieve and update a user
     identified by their unique ID.
     """
+    @api.expect(detail_parser)
     @api.response(200, 'User details retrieved successfully')
+    @api.response(400, 'Invalid fields parameter')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """
         Retrieve a user by ID.
 
+        `fields` reduces the response to the listed keys.
+
         Args:
             user_id (str): Unique identifier of the user.
 
         Returns:
             tuple: User data if found, otherwise an error message and status code.
         """
+        try:
+            keys = user_fieldset.select(detail_parser.parse_args()['fields'])
+        except ValueError as error:
+            return {'error': str(error)}, 400
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email}, 200
+        serializer = user_fieldset.serializer(keys)
+        return cached_json(('user', keys, user.id, user.version),
+                           lambda: (serializer.dumps(user), {}))
 
     @api.expect(user_model, validate=True)
     @api.response(200, 'User updated successfully')
@@ -130,18 +221,12 @@ class UserResource(Resource):
         """
         data_user = api.payload
 
-        update_user = facade.update_user(user_id, data_user)
-        if not update_user:
-            return {'error': 'User not found'}, 404
-
         try:
             update_user = facade.update_user(user_id, data_user)
         except ValueError as error:
             return {"error": str(error)}, 400
 
-        return {
-            'id': update_user.id,
-            'first_name': update_user.first_name,
-            'last_name': update_user.last_name,
-            'email': update_user.email
-        }, 200
+        if not update_user:
+            return {'error': 'User not found'}, 404
+
+        return user_serializer(update_user), 200
@@ -0,0 +1,213 @@
+"""
+ASGI entry point for the HBnB API.
+
+ASGIApp serves the Flask application (the same routes, handlers and
+facade as create_app()) from an asyncio event loop. The work of the
+connection, where slow clients spend their time, stays on the loop:
+
+    - the request body is received asynchronously before the handler
+      runs;
+    - the response is sent chunk by chunk with `await`, so a client
+      reading slowly only holds a suspended coroutine.
+
+A thread is only taken for the handler itself, and only when the
+facade's repositories wait on I/O (Repository.blocking: SQLite, file
+log). With the in-memory repositories a handler is plain Python code
+with nothing to wait for, so it runs directly on the loop and no
+thread hop is paid per request. The handlers that wait for events
+(WAITING_PATHS: long polls and event streams) always run in threads,
+and an event stream is sent event by event rather than in chunks.
+
+Serve it with an ASGI server, e.g. `python3 run_asgi.py` (uvicorn).
+"""
+
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from app import create_app
+
+# Response body bytes pulled from the WSGI application per step
+CHUNK_SIZE = 64 * 1024
+# Path prefixes of the handlers that may block waiting for events
+WAITING_PATHS = ('/api/v1/changes',)
+
+
+class _WSGICall:
+    """One call of a WSGI application, its body pulled step by step."""
+
+    def __init__(self, wsgi_app, environ):
+        self.status = None
+        self.headers = None
+        # Send each chunk at once (event streams)
+        self.unbuffered = False
+        # Body bytes not sent yet, from write() or from the iterable
+        self._buffer = []
+        self._iterable = wsgi_app(environ, self._start_response)
+        self._iterator = iter(self._iterable)
+
+    def _start_response(self, status, headers, exc_info=None):
+        if exc_info is not None and self.status is not None:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.status = int(status.split(' ', 1)[0])
+        self.headers = [(name.lower().encode('latin-1'),
+                         value.encode('latin-1'))
+                        for name, value in headers]
+        self.unbuffered = any(
+            name == b'content-type' and value.startswith(b'text/event-stream')
+            for name, value in self.headers)
+        return self._buffer.append
+
+    def pull(self):
+        """Return (about CHUNK_SIZE bytes of body, True at the end)."""
+        buffer = self._buffer
+        size = sum(map(len, buffer))
+        done = False
+        while size < CHUNK_SIZE:
+            chunk = next(self._iterator, None)
+            if chunk is None:
+                done = True
+                break
+            buffer.append(chunk)
+            size += len(chunk)
+            if self.unbuffered and size:
+                break
+        data = b''.join(buffer)
+        buffer.clear()
+        return data, done
+
+    def close(self):
+        close = getattr(self._iterable, 'close', None)
+        if close is not None:
+            close()
+
+
+class ASGIApp:
+    """
+    ASGI application running a WSGI application.
+
+    Args:
+        wsgi_app (callable): WSGI application, e.g. create_app().
+        blocking (bool): Run the WSGI application in worker threads,
+            for handlers that wait on I/O, instead of on the loop.
+        max_threads (int): Size of the worker thread pool.
+    """
+    def __init__(self, wsgi_app, blocking=False, max_threads=32):
+        self.wsgi_app = wsgi_app
+        self.blocking = blocking
+        self.max_threads = max_threads
+        self._executor = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        else:
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+    def close(self):
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def _run(self, function, *args, blocking=False):
+        if not (self.blocking or blocking):
+            return function(*args)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.max_threads, thread_name_prefix='hbnb-asgi')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+        waiting = scope['path'].startswith(WAITING_PATHS)
+        call = await self._run(
+            _WSGICall, self.wsgi_app, self._environ(scope, bytes(body)),
+            blocking=waiting)
+        try:
+            data, done = await self._run(call.pull, blocking=waiting)
+            await send({'type': 'http.response.start',
+                        'status': call.status,
+                        'headers': call.headers})
+            while not done:
+                await send({'type': 'http.response.body',
+                            'body': data, 'more_body': True})
+                data, done = await self._run(call.pull, blocking=waiting)
+            await send({'type': 'http.response.body', 'body': data})
+        finally:
+            await self._run(call.close, blocking=waiting)
+
+    @staticmethod
+    def _environ(scope, body):
+        """Build the WSGI environ of an ASGI HTTP request."""
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        root_path = scope.get('root_path', '')
+        path = scope['path']
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+            'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', ()):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            if name == 'CONTENT_LENGTH':
+                continue
+            key = name if name == 'CONTENT_TYPE' else f'HTTP_{name}'
+            value = value.decode('latin-1')
+            if key in environ:
+                environ[key] = f'{environ[key]},{value}'
+            else:
+                environ[key] = value
+        return environ
+
+
+def create_asgi_app():
+    """
+    Create the ASGI application serving the HBnB API.
+
+    Returns:
+        ASGIApp: create_app() behind the event loop, with worker
+        threads if the configured storage waits on I/O.
+    """
+    from app.services import facade, settings
+
+    return ASGIApp(create_app(), blocking=facade.blocking,
+                   max_threads=settings.ASGI_THREADS)
@@ -0,0 +1,113 @@
+"""
+Command line tools of the HBnB application (`flask --app run ...`).
+
+import-report starts a fresh interpreter with `-X importtime`, creates
+the application in it and prints where the import time goes: the
+total, the time spent in each top-level package and the slowest
+modules. With --budget-ms it exits with status 1 when the total goes
+over the budget, so that a start-up regression fails a CI job.
+"""
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+import click
+
+# Statement timed by import-report
+STARTUP = 'from app import create_app; create_app()'
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(text):
+    """
+    Parse the output of `python -X importtime`.
+
+    Args:
+        text (str): stderr of the interpreter.
+
+    Returns:
+        list: (module, self µs, cumulative µs, depth) tuples, in the
+        order they were printed (children before their parent).
+    """
+    entries = []
+    for line in text.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        try:
+            self_us, cumulative_us, name = line[12:].split('|', 2)
+            entry = (name.strip(), int(self_us), int(cumulative_us),
+                     (len(name) - len(name.lstrip()) - 1) // 2)
+        except ValueError:
+            continue  # column header
+        entries.append(entry)
+    return entries
+
+
+def measure_imports(statement=STARTUP, repeat=3):
+    """
+    Time the imports of `statement` in fresh interpreters.
+
+    Args:
+        statement (str): Python code to run.
+        repeat (int): Number of runs; the fastest one is kept to
+            filter out noise.
+
+    Returns:
+        list: Entries of the fastest run, see parse_importtime().
+    """
+    best = None
+    for _ in range(max(1, repeat)):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', statement],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+        entries = parse_importtime(result.stderr)
+        if best is None or total_us(entries) < total_us(best):
+            best = entries
+    return best
+
+
+def total_us(entries):
+    """Return the total import time of the top-level imports, in µs."""
+    return sum(cumulative for _, _, cumulative, depth in entries
+               if depth == 0)
+
+
+def by_package(entries):
+    """Return {top-level package: self µs} of every imported module."""
+    packages = defaultdict(int)
+    for name, self_us, _, _ in entries:
+        packages[name.split('.')[0]] += self_us
+    return dict(packages)
+
+
+@click.command('import-report')
+@click.option('--top', default=15, show_default=True,
+              help='Number of packages and modules listed.')
+@click.option('--repeat', default=3, show_default=True,
+              help='Runs measured; the fastest one is reported.')
+@click.option('--budget-ms', type=float, default=None,
+              help='Exit with status 1 above this total import time.')
+def import_report(top, repeat, budget_ms):
+    """Report the import time of the application start-up."""
+    entries = measure_imports(repeat=repeat)
+    total = total_us(entries)
+    click.echo(f"import time of `{STARTUP}`: {total / 1000:.1f} ms "
+               f"({len(entries)} modules)")
+
+    click.echo("\nby top-level package (self time):")
+    packages = sorted(by_package(entries).items(), key=lambda item: -item[1])
+    for package, self_us in packages[:top]:
+        click.echo(f"  {self_us / 1000:8.1f} ms {100 * self_us / total:5.1f}%"
+                   f"  {package}")
+
+    click.echo("\nslowest modules (self / cumulative):")
+    modules = sorted(entries, key=lambda entry: -entry[1])
+    for name, self_us, cumulative_us, _ in modules[:top]:
+        click.echo(f"  {self_us / 1000:8.1f} ms {cumulative_us / 1000:8.1f} ms"
+                   f"  {name}")
+
+    if budget_ms is not None and total / 1000 > budget_ms:
+        click.echo(f"\nover budget: {total / 1000:.1f} ms > {budget_ms:g} ms",
+                   err=True)
+        sys.exit(1)
@@ -16,6 +16,8 @@ class Amenity(BaseModel):
     It raises a ValueError if validation fails.
     """
 
+    __slots__ = ('name',)
+
     def __init__(self, name):
         """
         This constructor initializes a new Amenity instance.
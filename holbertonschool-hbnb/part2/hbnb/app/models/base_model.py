@@ -5,10 +5,91 @@ Base model.
 This module defines the BaseModel class, which provides common
 attributes and behavior shared by all domain models such as
 unique identification and timestamp management.
+
+Models use __slots__ instead of a per-instance __dict__, and keep
+their timestamps as integer microseconds since the epoch. The
+created_at / updated_at datetimes are only built when accessed.
+
+Ids come from a pluggable generator (see app.models.ids), time-ordered
+UUIDs by default; set_id_generator() swaps it.
 """
 
-import uuid
+import time
 from datetime import datetime
+from app.models.ids import uuid7_id
+
+_id_generator = uuid7_id
+# Class -> fields update() may set, see BaseModel.updatable_fields()
+_updatable_fields = {}
+
+
+def set_id_generator(generator):
+    """
+    Set the generator of the ids of new models.
+
+    Args:
+        generator (callable): Takes the creation time in epoch
+            microseconds and returns a unique string id, e.g. one of
+            app.models.ids.ID_GENERATORS.
+
+    Returns:
+        callable: The previous generator.
+    """
+    global _id_generator
+    previous = _id_generator
+    _id_generator = generator
+    return previous
+
+
+def to_microseconds(value):
+    """Convert a naive local datetime to integer epoch microseconds."""
+    seconds = int(value.replace(microsecond=0).timestamp())
+    return seconds * 1_000_000 + value.microsecond
+
+
+def from_microseconds(value):
+    """Convert integer epoch microseconds to a naive local datetime."""
+    seconds, micro = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=micro)
+
+
+class ChangeRecord:
+    """
+    The fields changed by one update of a model.
+
+    Attributes:
+        obj (BaseModel): The updated object.
+        changes (dict): New value of each changed field.
+        previous (dict): Value of the same fields before the update.
+        version (int): Version of the object after the update,
+            unchanged when `changes` is empty.
+
+    A record without changes is false: the update was a no-op, the
+    object was not touched and its version did not move.
+    """
+    __slots__ = ('obj', 'changes', 'previous', 'version')
+
+    def __init__(self, obj, changes, previous):
+        self.obj = obj
+        self.changes = changes
+        self.previous = previous
+        self.version = obj.version
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def __repr__(self):
+        return (f"ChangeRecord({type(self.obj).__name__} {self.obj.id}, "
+                f"{self.changes!r})")
+
+    @property
+    def obj_id(self):
+        """str: ID of the updated object."""
+        return self.obj.id
+
+    def touches(self, *names):
+        """Return True if any of the fields `names` changed."""
+        return any(name in self.changes for name in names)
 
 
 class BaseModel:
@@ -19,38 +100,130 @@ class BaseModel:
     and last update. Also includes helper methods to update
     and persist state changes.
     """
+    __slots__ = ('id', '_created', '_updated', '__weakref__')
+
     def __init__(self):
         """
         Initialize a new BaseModel instance.
 
-        Generates a unique UUID and sets creation and update
-        timestamps to the current datetime.
+        Reads the clock once, then generates a unique id for that
+        time and sets the creation and update timestamps to it.
         """
-        self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        now = time.time_ns() // 1000
+        self.id = _id_generator(now)
+        self._created = self._updated = now
+
+    @property
+    def created_at(self):
+        """datetime: Creation time, built on access."""
+        return from_microseconds(self._created)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created = to_microseconds(value)
+
+    @property
+    def updated_at(self):
+        """datetime: Last update time, built on access."""
+        return from_microseconds(self._updated)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated = to_microseconds(value)
+
+    @property
+    def sort_key(self):
+        """tuple: (creation microseconds, id), the pagination keyset."""
+        return (self._created, self.id)
+
+    @property
+    def version(self):
+        """int: updated_at in microseconds, changed by every save()."""
+        return self._updated
+
+    @classmethod
+    def field_names(cls):
+        """
+        Return the names of the slots holding the state of the model.
+
+        Returns:
+            tuple: Slot names from BaseModel down to `cls`.
+        """
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name in klass.__dict__.get('__slots__', ()):
+                if name != '__weakref__':
+                    names.append(name)
+        return tuple(names)
+
+    @classmethod
+    def updatable_fields(cls):
+        """
+        Return the fields update() may set.
+
+        They are the public slots of the model: the id, the private
+        timestamp slots and the properties (created_at, version, ...)
+        are never set from update data.
+
+        Returns:
+            frozenset: Field names.
+        """
+        fields = _updatable_fields.get(cls)
+        if fields is None:
+            fields = _updatable_fields[cls] = frozenset(
+                name for name in cls.field_names()
+                if name != 'id' and not name.startswith('_'))
+        return fields
 
     def save(self):
         """
         Update the last modification timestamp.
 
         This method should be called whenever the object state
-        changes to reflect the latest update time.
+        changes to reflect the latest update time. The timestamp
+        always moves forward so that it can serve as a version.
+        """
+        self._updated = max(time.time_ns() // 1000, self._updated + 1)
+
+    def diff(self, data):
+        """
+        Return the part of `data` that would change the object.
+
+        Keys that are not updatable fields (see updatable_fields()),
+        and values equal to the current ones, are left out.
+
+        Args:
+            data (dict): Attribute values, as given to update().
+
+        Returns:
+            dict: {attribute: new value} of the changed attributes.
         """
-        self.updated_at = datetime.now()
+        fields = type(self).updatable_fields()
+        changes = {}
+        for key, value in data.items():
+            if key in fields and getattr(self, key) != value:
+                changes[key] = value
+        return changes
 
     def update(self, data):
         """
         Update model attributes from a dictionary.
 
-        Iterates over the provided key-value pairs and updates
-        existing attributes only, then refreshes the update
-        timestamp.
+        Only the attributes whose value differs are set, and the
+        update timestamp is refreshed only if one of them changed, so
+        a no-op update keeps the version of the object (and the
+        cached responses built from it).
 
         Args:
             data (dict): Dictionary containing attributes to update.
+
+        Returns:
+            ChangeRecord: The changed fields with their old values.
         """
-        for key, value in data.items():
-            if hasattr(self, key):
-                setattr(self, key, value)
-        self.save()
+        changes = self.diff(data)
+        previous = {key: getattr(self, key) for key in changes}
+        for key, value in changes.items():
+            setattr(self, key, value)
+        if changes:
+            self.save()
+        return ChangeRecord(self, changes, previous)
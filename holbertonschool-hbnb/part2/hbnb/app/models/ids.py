@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Identifier generators for BaseModel.
+
+A generator is a callable taking the creation time of the object, in
+integer microseconds since the epoch, and returning its id as a
+string. BaseModel captures that time once and passes it to the
+generator, so the id and the timestamps of an object agree.
+
+    - uuid7_id (default): time-ordered UUIDs (RFC 9562 version 7).
+      The 48 high bits hold the milliseconds and the next 12 bits the
+      fraction of the millisecond, so ids sort in creation order and
+      new keys land at the end of the repository indexes. The 62
+      random bits come from a pool filled with one os.urandom() call
+      per POOL_SIZE ids instead of one call per id.
+    - uuid4_id: random UUIDs from uuid.uuid4(), the previous scheme.
+
+Both are formatted as canonical UUID strings, so ids of either kind
+can live side by side in a repository.
+"""
+
+import os
+import struct
+import uuid
+
+# Random 64-bit words drawn from the OS per refill of the pool
+POOL_SIZE = 4096
+
+
+def uuid4_id(micros):
+    """Return a random (version 4) UUID string; `micros` is unused."""
+    return str(uuid.uuid4())
+
+
+class TimeOrderedIds:
+    """
+    Generator of version 7 UUID strings.
+
+    The random pool is a list consumed with list.pop(), a single
+    atomic operation, so threads never receive the same random bits
+    and no lock is taken. A forked child empties the pool inherited
+    from its parent so that both processes do not draw the same bits.
+    """
+    def __init__(self, pool_size=POOL_SIZE):
+        self.pool_size = pool_size
+        self._format = struct.Struct(f'<{pool_size}Q')
+        self._pool = []
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._pool.clear)
+
+    def _refill(self):
+        words = self._format.unpack(os.urandom(self._format.size))
+        self._pool.extend(words)
+        return self._pool.pop()
+
+    def __call__(self, micros):
+        try:
+            random = self._pool.pop()
+        except IndexError:
+            random = self._refill()
+        millis, fraction = divmod(micros, 1000)
+        # Fields formatted directly, without building the 128-bit int
+        return '%08x-%04x-%04x-%04x-%012x' % (
+            millis >> 16 & 0xffffffff,
+            millis & 0xffff,
+            0x7000 | fraction * 4096 // 1000,
+            0x8000 | random >> 48 & 0x3fff,
+            random & 0xffffffffffff)
+
+
+uuid7_id = TimeOrderedIds()
+
+# Generators selectable by name (HBNB_ID_GENERATOR)
+ID_GENERATORS = {
+    'uuid7': uuid7_id,
+    'uuid4': uuid4_id,
+}
@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 
 from app.models.base_model import BaseModel
+from app.models.user import User
+from app.models.amenity import Amenity
 
 class Place(BaseModel):
     """
@@ -17,7 +19,10 @@ class Place(BaseModel):
         - amenities (list): List of amenities associated with the place.
     """
 
-    def __init__(self, name, description, price, latitude, longitude):
+    __slots__ = ('title', 'description', 'price', 'latitude', 'longitude',
+                 'owner', 'reviews', 'amenities')
+
+    def __init__(self, title, description, price, latitude, longitude, owner):
         """
         Initializes a new instance of Place.
 
@@ -76,6 +81,11 @@ class Place(BaseModel):
         self.reviews = []
         self.amenities = []
 
+    @property
+    def amenity_ids(self):
+        """list: IDs of the amenities of the place."""
+        return [amenity.id for amenity in self.amenities]
+
     def add_review(self, review):
         """
         Adds a review to the location.
@@ -86,6 +96,8 @@ class Place(BaseModel):
         Raises:
             ValueError: if the object is not an instance of Review
         """
+        from app.models.review import Review
+
         if not isinstance(review, Review):
             raise ValueError("review must be a Review instance")
         self.reviews.append(review)
@@ -94,6 +106,11 @@ class Place(BaseModel):
         """
         Adds an amenity to the location.
 
+        Only changes this object: use it on a place being built. The
+        amenities of a stored place are added with
+        HBnBFacade.add_place_amenity(), which persists the change and
+        refreshes the amenity bitmaps of the place filters.
+
         Args:
             amenity (Amenity): instance of Amenity to add
 
@@ -102,4 +119,4 @@ class Place(BaseModel):
         """
         if not isinstance(amenity, Amenity):
             raise ValueError("amenity must be a Amenity instance")
-        self.amenities.append(amenity)
\ No newline at end of file
+        self.amenities.append(amenity)
@@ -15,6 +15,8 @@ class Review(BaseModel):
         user (User): User who wrote the review
     """
 
+    __slots__ = ('text', 'rating', 'place', 'user')
+
     def __init__(self, text, rating, place, user):
         """
         Initializes a new instance of Review.
@@ -20,6 +20,8 @@ class User(BaseModel):
     during initialization to ensure data integrity.
     """
 
+    __slots__ = ('first_name', 'last_name', 'email', 'is_admin')
+
     def __init__(self, first_name, last_name, email, is_admin=False):
         """
         Initialize a new User instance.
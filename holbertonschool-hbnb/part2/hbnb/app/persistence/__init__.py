@@ -0,0 +1,62 @@
+"""
+Persistence layer.
+
+Provides the repository implementations and the selection of the
+storage backend from the application configuration.
+"""
+
+import os
+
+
+def make_repository_factory(config):
+    """
+    Return the repository factory matching `config.STORAGE`.
+
+    Supported backends:
+        - 'memory': InMemoryRepository (default, volatile).
+        - 'file': FileRepository, files stored in STORAGE_PATH.
+        - 'sqlite': SQLiteRepository, database file STORAGE_PATH.
+        - 'shared': SQLiteRepository tracking its changes, for
+          database files shared by several worker processes.
+
+    With `config.THREAD_SAFE`, the 'memory' and 'file' repositories
+    are the locking variants from app.persistence.concurrency;
+    SQLiteRepository is always safe to share between threads.
+
+    Args:
+        config (type): Configuration class (see config.py).
+
+    Raises:
+        ValueError: If the backend name is unknown.
+
+    Returns:
+        callable: factory(name, model, **indexes) for HBnBFacade.
+    """
+    backend = getattr(config, 'STORAGE', 'memory')
+    thread_safe = getattr(config, 'THREAD_SAFE', False)
+    if backend == 'memory':
+        if thread_safe:
+            from app.persistence.concurrency import (
+                thread_safe_repository_factory)
+            return thread_safe_repository_factory
+        from app.persistence.repository import in_memory_repository_factory
+        return in_memory_repository_factory
+    if backend == 'file':
+        from app.persistence.file_repository import file_repository_factory
+        return file_repository_factory(
+            config.STORAGE_PATH,
+            thread_safe=thread_safe,
+            fsync_every=config.FSYNC_EVERY,
+            fsync_interval=config.FSYNC_INTERVAL)
+    if backend in ('sqlite', 'shared'):
+        from app.persistence.sqlite_repository import (
+            sqlite_repository_factory)
+        directory = os.path.dirname(os.path.abspath(config.STORAGE_PATH))
+        os.makedirs(directory, exist_ok=True)
+        if backend == 'shared':
+            return sqlite_repository_factory(
+                config.STORAGE_PATH,
+                track_changes=True,
+                change_log_size=config.CHANGE_LOG_SIZE)
+        return sqlite_repository_factory(config.STORAGE_PATH)
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,127 @@
+"""
+Bitmap indexes over row numbers.
+
+A bitmap is a Python int whose bit n is set when row n matches, so
+the intersection of two filters is one `&` running in C over the
+machine words of the two ints, and counting the matches is a
+population count. Rows are those of a ColumnStore, which keeps them
+dense: a bitmap of 100,000 places takes 12.5 KB.
+
+BitmapIndex keeps one bitmap per value of a multi-valued attribute,
+e.g. the amenity ids of the places, for faceted filtering: "has wifi
+AND has pool AND costs 50 to 150" is the `&` of two amenity bitmaps
+and of the bitmap of a price range scan.
+"""
+
+# Positions of the set bits of every byte value
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1)
+                   for byte in range(256))
+
+
+if hasattr(int, 'bit_count'):
+    def popcount(bitmap):
+        """Return the number of rows set in `bitmap`."""
+        return bitmap.bit_count()
+else:  # pragma: no cover - Python < 3.10
+    def popcount(bitmap):
+        """Return the number of rows set in `bitmap`."""
+        return bin(bitmap).count('1')
+
+
+def bitmap_from_rows(rows):
+    """Return the bitmap of an iterable of row numbers."""
+    data = bytearray()
+    for row in rows:
+        index = row >> 3
+        if index >= len(data):
+            data.extend(bytes(index + 1 - len(data)))
+        data[index] |= 1 << (row & 7)
+    return int.from_bytes(data, 'little')
+
+
+def iter_rows(bitmap):
+    """Yield the rows set in `bitmap`, in increasing order."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for index, byte in enumerate(data):
+        if byte:
+            base = index << 3
+            for bit in _BYTE_BITS[byte]:
+                yield base + bit
+
+
+class BitmapIndex:
+    """
+    One bitmap of rows per value of a multi-valued attribute.
+
+    The owner of the rows (a ColumnStore) tells the index when a row
+    gets values, is emptied, or is moved to fill a hole.
+    """
+    def __init__(self):
+        # value -> bitmap of the rows having it
+        self._bitmaps = {}
+        # row -> values of the row, to unset them
+        self._values = {}
+
+    def __len__(self):
+        return len(self._bitmaps)
+
+    def bitmap(self, value):
+        """Return the bitmap of the rows having `value` (0 if none)."""
+        return self._bitmaps.get(value, 0)
+
+    def set(self, row, values):
+        """Replace the values of `row`."""
+        values = tuple(dict.fromkeys(values))
+        if self._values.get(row, ()) == values:
+            return
+        self.discard(row)
+        bit = 1 << row
+        for value in values:
+            self._bitmaps[value] = self._bitmaps.get(value, 0) | bit
+        if values:
+            self._values[row] = values
+
+    def discard(self, row):
+        """Remove every value of `row`."""
+        values = self._values.pop(row, ())
+        mask = ~(1 << row)
+        for value in values:
+            bitmap = self._bitmaps[value] & mask
+            if bitmap:
+                self._bitmaps[value] = bitmap
+            else:
+                del self._bitmaps[value]
+
+    def move(self, source, target):
+        """Give the values of row `source` to the empty row `target`."""
+        values = self._values.get(source, ())
+        self.discard(source)
+        self.set(target, values)
+
+    def clear(self):
+        """Remove every row."""
+        self._bitmaps.clear()
+        self._values.clear()
+
+    def intersect(self, values, bitmap):
+        """Return `bitmap` restricted to the rows having every value."""
+        for value in values:
+            if not bitmap:
+                break
+            bitmap &= self._bitmaps.get(value, 0)
+        return bitmap
+
+    def counts(self, bitmap):
+        """
+        Count the rows of `bitmap` having each value.
+
+        Returns:
+            dict: value -> number of rows, for the values present in
+            `bitmap`.
+        """
+        counts = {}
+        for value, rows in self._bitmaps.items():
+            count = popcount(rows & bitmap)
+            if count:
+                counts[value] = count
+        return counts
@@ -0,0 +1,216 @@
+"""
+In-process change feed of the repositories.
+
+Repositories attached to a ChangeFeed (see Repository.attach_feed())
+publish one event per write:
+
+    - 'created': an object was added;
+    - 'updated': fields of an object changed (no-op updates publish
+      nothing), listed in `fields`;
+    - 'deleted': an object was removed;
+    - 'cleared': every object of the collection was removed.
+
+Events carry a sequence number increasing by one per event across
+every collection, and the newest `size` events are kept in a ring
+buffer. A consumer remembers the last sequence number it processed
+and asks for the events after it with since(), or blocks in wait()
+until there are some, instead of scanning the collections.
+
+Sequence numbers restart from 1 with the process, while the data of
+the 'file' and 'sqlite' backends persists. Each feed therefore draws
+a random `epoch`, and the cursors handed to consumers
+("EPOCH:SEQ", see cursor()) carry it: parse_cursor() rejects a cursor
+of another epoch, from before a restart or from another worker
+process, instead of mistaking its sequence number for one of this
+feed.
+
+The feed only sees the writes of its own process: with the 'shared'
+storage backend, the writes of the other workers are in the change
+log of the database (see SQLiteRepository.changes_since()).
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from itertools import islice
+
+# Events kept by default
+FEED_SIZE = 10000
+
+
+class ChangeEvent:
+    """
+    One write published to a ChangeFeed.
+
+    Attributes:
+        seq (int): Position of the event in the feed, from 1.
+        type (str): 'created', 'updated', 'deleted' or 'cleared'.
+        collection (str): Name of the repository, e.g. 'places'.
+        obj_id (str): ID of the written object, None for 'cleared'.
+        fields (tuple): Changed fields of an 'updated' event.
+        timestamp (float): Time of the write, in seconds since the
+            epoch.
+    """
+    __slots__ = ('seq', 'type', 'collection', 'obj_id', 'fields',
+                 'timestamp')
+
+    def __init__(self, seq, type, collection, obj_id, fields, timestamp):
+        self.seq = seq
+        self.type = type
+        self.collection = collection
+        self.obj_id = obj_id
+        self.fields = fields
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return (f"ChangeEvent({self.seq}, {self.type!r}, "
+                f"{self.collection!r}, {self.obj_id!r})")
+
+    def to_dict(self):
+        """Return the JSON-compatible form of the event."""
+        data = {
+            'seq': self.seq,
+            'type': self.type,
+            'collection': self.collection,
+            'id': self.obj_id,
+            'timestamp': self.timestamp,
+        }
+        if self.type == 'updated':
+            data['fields'] = list(self.fields)
+        return data
+
+
+class ChangeFeed:
+    """
+    Thread-safe ring buffer of ChangeEvents.
+
+    Args:
+        size (int): Number of events kept; older events are dropped
+            and a consumer behind them must resynchronize.
+    """
+    def __init__(self, size=FEED_SIZE):
+        self.size = max(1, int(size))
+        self._events = deque(maxlen=self.size)
+        self._last_seq = 0
+        self._changed = threading.Condition(threading.Lock())
+        # Identifies this feed in the cursors, see parse_cursor()
+        self.epoch = uuid.uuid4().hex[:12]
+
+    @property
+    def last_seq(self):
+        """int: Sequence number of the newest event, 0 if none."""
+        return self._last_seq
+
+    @property
+    def first_seq(self):
+        """int: Sequence number of the oldest event kept."""
+        with self._changed:
+            if self._events:
+                return self._events[0].seq
+            return self._last_seq + 1
+
+    def cursor(self, seq):
+        """Return the cursor of event `seq` of this feed."""
+        return f'{self.epoch}:{seq}'
+
+    def parse_cursor(self, cursor):
+        """
+        Return the sequence number of a cursor of this feed.
+
+        Args:
+            cursor (str): "EPOCH:SEQ" as returned by cursor(), or a
+                bare sequence number, taken as one of this feed.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+
+        Returns:
+            int: The sequence number, or None if the cursor belongs
+            to another feed (an earlier process or another worker):
+            the consumer must then reload everything.
+        """
+        epoch, separator, seq = cursor.rpartition(':')
+        seq = int(seq)
+        if seq < 0:
+            raise ValueError("Negative sequence number")
+        if separator and epoch != self.epoch:
+            return None
+        return seq
+
+    def publish(self, type, collection, obj_ids, fields=()):
+        """
+        Append one event per id and wake up the waiting consumers.
+
+        Args:
+            type (str): Event type, see ChangeEvent.
+            collection (str): Name of the repository.
+            obj_ids (iterable): IDs of the written objects ([None] for
+                'cleared').
+            fields (iterable): Changed fields of an 'updated' event.
+
+        Returns:
+            int: Sequence number of the last event appended.
+        """
+        fields = tuple(fields)
+        now = time.time()
+        with self._changed:
+            seq = self._last_seq
+            for obj_id in obj_ids:
+                seq += 1
+                self._events.append(ChangeEvent(
+                    seq, type, collection, obj_id, fields, now))
+            if seq != self._last_seq:
+                self._last_seq = seq
+                self._changed.notify_all()
+            return seq
+
+    def since(self, seq, limit=None):
+        """
+        Return the events published after event `seq`.
+
+        Args:
+            seq (int): Last sequence number the consumer processed, 0
+                for the start of the feed.
+            limit (int): Maximum number of events returned.
+
+        Returns:
+            list: Events in sequence order, or None if some of the
+            events after `seq` were already dropped from the buffer,
+            or if `seq` is ahead of the feed (it comes from before a
+            restart): the consumer must then reload everything.
+        """
+        with self._changed:
+            if seq > self._last_seq:
+                return None
+            if seq == self._last_seq:
+                return []
+            first = (self._events[0].seq if self._events
+                     else self._last_seq + 1)
+            if seq + 1 < first:
+                return None
+            start = seq + 1 - first
+            stop = len(self._events)
+            if limit is not None:
+                stop = min(stop, start + max(0, limit))
+            return list(islice(self._events, start, stop))
+
+    def wait(self, seq, timeout=None):
+        """
+        Block until an event newer than `seq` is published.
+
+        Args:
+            seq (int): Last sequence number the consumer processed.
+            timeout (float): Maximum seconds to wait, None for ever.
+
+        Returns:
+            bool: True if there are events after `seq`.
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self._last_seq > seq, timeout)
+
+    def clear(self):
+        """Drop every event; sequence numbers keep increasing."""
+        with self._changed:
+            self._events.clear()
@@ -0,0 +1,176 @@
+"""
+Columnar side-store for numeric attributes.
+
+ColumnStore keeps selected numeric attributes of the objects of a
+repository in contiguous array('d') columns, one row per object, with
+an id <-> row mapping. Range predicates over these columns are
+evaluated as vectorized scans with NumPy when it is installed (the
+arrays are viewed without copying) and as a tight loop over the
+arrays otherwise.
+
+NumPy takes about 0.1 s to import, a quarter of the start time of the
+application, so it is only imported by the first range query.
+
+Rows stay dense (a removed row is filled with the last one), so a
+range query can also return its matches as a bitmap of rows, to be
+combined with the bitmap indexes of app.persistence.bitmaps.
+"""
+
+from array import array
+from app.persistence.bitmaps import bitmap_from_rows
+
+_NOT_LOADED = object()
+# The numpy module once imported, None if it is not installed
+numpy = _NOT_LOADED
+
+
+def _load_numpy():
+    global numpy
+    if numpy is _NOT_LOADED:
+        try:
+            import numpy as module
+        except ImportError:  # pragma: no cover - optional dependency
+            module = None
+        numpy = module
+    return numpy
+
+
+class ColumnStore:
+    """
+    Numeric columns of a set of objects, addressed by object id.
+
+    Args:
+        fields (iterable): Names of the numeric attributes to store.
+    """
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.columns = {field: array('d') for field in self.fields}
+        self.ids = []
+        self.rows = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, obj):
+        """Append a row for `obj`, or overwrite it if already present."""
+        if obj.id in self.rows:
+            self.update(obj)
+            return
+        self.rows[obj.id] = len(self.ids)
+        self.ids.append(obj.id)
+        for field, column in self.columns.items():
+            column.append(float(getattr(obj, field)))
+
+    def update(self, obj):
+        """Refresh the row of `obj` from its current attribute values."""
+        row = self.rows.get(obj.id)
+        if row is None:
+            self.add(obj)
+            return
+        for field, column in self.columns.items():
+            column[row] = float(getattr(obj, field))
+
+    def remove(self, obj_id):
+        """
+        Delete the row of `obj_id` by moving the last row into it.
+
+        Returns:
+            tuple: (freed row, former row of the moved last row, None
+            if the last row was the one removed), or None if `obj_id`
+            has no row.
+        """
+        row = self.rows.pop(obj_id, None)
+        if row is None:
+            return None
+        last_id = self.ids.pop()
+        for column in self.columns.values():
+            last = column.pop()
+            if last_id != obj_id:
+                column[row] = last
+        if last_id == obj_id:
+            return row, None
+        self.ids[row] = last_id
+        self.rows[last_id] = row
+        return row, len(self.ids)
+
+    def clear(self):
+        """Remove every row."""
+        for field in self.fields:
+            self.columns[field] = array('d')
+        self.ids = []
+        self.rows = {}
+
+    def value(self, obj_id, field):
+        """Return the stored value of `field` for `obj_id`."""
+        return self.columns[field][self.rows[obj_id]]
+
+    def range_query(self, **bounds):
+        """
+        Return the ids whose values fall in every given range.
+
+        Each keyword is a field name mapped to a (low, high) tuple;
+        either bound may be None and both are inclusive.
+
+        Example:
+            store.range_query(price=(50, 150), latitude=(40, 50))
+
+        Returns:
+            list: Matching ids, in row order.
+        """
+        bounds = self._bounds(bounds)
+        if not bounds or not self.ids:
+            return list(self.ids)
+        ids = self.ids
+        if _load_numpy() is not None:
+            return [ids[row] for row in numpy.flatnonzero(
+                self._numpy_mask(bounds))]
+        return [ids[row] for row in self._python_rows(bounds)]
+
+    def range_bitmap(self, **bounds):
+        """
+        Return the rows whose values fall in every range, as a bitmap.
+
+        Takes the same bounds as range_query(). Bit n of the result is
+        set when row n matches; ids[n] is its object id.
+
+        Returns:
+            int: Bitmap of the matching rows.
+        """
+        bounds = self._bounds(bounds)
+        if not bounds or not self.ids:
+            return (1 << len(self.ids)) - 1
+        if _load_numpy() is not None:
+            packed = numpy.packbits(self._numpy_mask(bounds),
+                                    bitorder='little')
+            return int.from_bytes(packed.tobytes(), 'little')
+        return bitmap_from_rows(self._python_rows(bounds))
+
+    def _bounds(self, bounds):
+        for field in bounds:
+            if field not in self.columns:
+                raise ValueError(f"Unknown column: {field}")
+        return {field: (low, high) for field, (low, high) in bounds.items()
+                if low is not None or high is not None}
+
+    def _numpy_mask(self, bounds):
+        mask = numpy.ones(len(self.ids), dtype=bool)
+        for field, (low, high) in bounds.items():
+            values = numpy.frombuffer(self.columns[field], dtype=numpy.float64)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        return mask
+
+    def _python_rows(self, bounds):
+        rows = None
+        for field, (low, high) in bounds.items():
+            column = self.columns[field]
+            low = float('-inf') if low is None else low
+            high = float('inf') if high is None else high
+            if rows is None:
+                rows = [row for row, value in enumerate(column)
+                        if low <= value <= high]
+            else:
+                rows = [row for row in rows if low <= column[row] <= high]
+        return rows
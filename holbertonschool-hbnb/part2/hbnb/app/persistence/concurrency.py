@@ -0,0 +1,194 @@
+"""
+Thread-safe repositories.
+
+ThreadSafeMixin makes an in-memory repository safe to share between
+the threads of a threaded WSGI server: writes are serialized by a
+per-repository mutex while reads never block (see the class). Every
+repository has its own lock, so writes to users never wait for
+writes to places.
+
+Since add() checks the unique indexes and stores the object under the
+same lock, it is an atomic compare-and-insert: of two threads
+registering the same email, exactly one succeeds and the other gets
+the usual ValueError.
+
+ReadWriteLock lets any number of readers in at once, or one writer
+alone. The facade uses it for its side indexes, whose reads are
+scans long enough to amortize its cost.
+"""
+
+import threading
+from contextlib import contextmanager
+from app.persistence.repository import InMemoryRepository
+
+
+class ReadWriteLock:
+    """
+    Many-readers / single-writer lock, preferring writers.
+
+    Both sides are reentrant for the thread holding them, and the
+    writer may also take the read side. A reader cannot upgrade to
+    the write side.
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()
+
+    def acquire_read(self):
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if depth or self._writer == threading.get_ident():
+            local.depth = depth + 1
+            return
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        local.registered = True
+        local.depth = 1
+
+    def release_read(self):
+        local = self._local
+        local.depth -= 1
+        if local.depth or not getattr(local, 'registered', False):
+            return
+        local.registered = False
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        if self._writer == me:
+            self._write_depth += 1
+            return
+        if getattr(self._local, 'registered', False):
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write(self):
+        self._write_depth -= 1
+        if self._write_depth:
+            return
+        with self._cond:
+            self._writer = None
+            self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        """Hold the read side for the duration of a `with` block."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """Hold the write side for the duration of a `with` block."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ThreadSafeMixin:
+    """
+    Serialize the writes and validate the reads of a repository.
+
+    Writes hold `self.lock` (a reentrant mutex) and bump `self._seq`
+    before and after touching the state, so the counter is odd while
+    a write is in progress. Reads take no lock: get() and get_all()
+    are single dictionary operations, atomic under the GIL, and the
+    multi-step reads (pages, attribute lookups) run optimistically
+    and are kept only if `_seq` did not move meanwhile (a sequence
+    lock). A read that overlapped a write is redone under the lock.
+
+    Must come before the repository class in the bases, e.g.
+    `class ThreadSafeRepository(ThreadSafeMixin, InMemoryRepository)`,
+    so that the lock also covers what subclasses add to a write
+    (such as the log append of FileRepository).
+    """
+    def __init__(self, *args, **kwargs):
+        self.lock = threading.RLock()
+        self._seq = 0
+        super().__init__(*args, **kwargs)
+
+    @contextmanager
+    def _writing(self):
+        with self.lock:
+            self._seq += 1
+            try:
+                yield
+            finally:
+                self._seq += 1
+
+    def _read(self, method, *args):
+        seq = self._seq
+        if not seq & 1:
+            try:
+                result = method(*args)
+            except (RuntimeError, KeyError):
+                # A set or dict changed size under an iteration
+                pass
+            else:
+                if self._seq == seq:
+                    return result
+        with self.lock:
+            return method(*args)
+
+    def add(self, obj):
+        with self._writing():
+            super().add(obj)
+
+    def add_many(self, objs):
+        with self._writing():
+            super().add_many(objs)
+
+    def update(self, obj_id, data):
+        with self._writing():
+            return super().update(obj_id, data)
+
+    def delete(self, obj_id):
+        with self._writing():
+            super().delete(obj_id)
+
+    def clear(self):
+        with self._writing():
+            super().clear()
+
+    def get_many(self, obj_ids):
+        return self._read(super().get_many, list(obj_ids))
+
+    def get_page(self, limit, cursor=None):
+        return self._read(super().get_page, limit, cursor)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        return self._read(super().get_by_attribute, attr_name, attr_value)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        return self._read(
+            super().get_all_by_attribute, attr_name, attr_value)
+
+
+class ThreadSafeRepository(ThreadSafeMixin, InMemoryRepository):
+    """InMemoryRepository safe to share between threads."""
+
+
+def thread_safe_repository_factory(name, model, **indexes):
+    """Repository factory for HBnBFacade sharing objects across threads."""
+    return ThreadSafeRepository(**indexes)
@@ -0,0 +1,300 @@
+"""
+Durable file-backed repository.
+
+FileRepository keeps the same in-memory state and indexes as
+InMemoryRepository, and appends every add/update/delete to a
+write-ahead log (one JSON object per line). An update is logged as a
+patch holding only the fields it changed, and a no-op update is not
+logged at all. Every `compact_every`
+writes the whole state is written to a snapshot and the log is
+truncated. On startup the snapshot is loaded and the log tail is
+replayed on top of it.
+
+Every write is flushed to the operating system before returning, so
+a crash of the process loses nothing. fsync calls are batched (group
+commit): the log is flushed to disk after `fsync_every` writes or
+`fsync_interval` seconds, whichever comes first; a background timer
+syncs the last writes of a burst when no other write follows.
+fsync_every=1 makes every write durable before returning. The
+repositories still open when the interpreter exits are closed, which
+syncs them.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from app.persistence.concurrency import ThreadSafeMixin
+from app.persistence.records import (
+    decode_value, encode_record, encode_value, link_references,
+    restore_record)
+from app.persistence.repository import InMemoryRepository
+
+# Repositories with an open log, closed at exit
+_open_repositories = weakref.WeakSet()
+
+
+@atexit.register
+def close_all():
+    """Sync and close every open FileRepository."""
+    for repo in list(_open_repositories):
+        repo.close()
+
+
+class FileRepository(InMemoryRepository):
+    """
+    InMemoryRepository persisted to a write-ahead log and a snapshot.
+
+    Args:
+        path (str): Base path; the files `<path>.log` and
+            `<path>.snapshot` are created next to it.
+        model (type): BaseModel subclass stored in this repository.
+        fsync_every (int): Number of writes grouped in one fsync.
+        fsync_interval (float): Maximum seconds between two fsyncs
+            while writes are pending.
+        compact_every (int): Number of logged writes after which the
+            log is compacted into a snapshot (0 disables it).
+        unique_indexes, indexes: See InMemoryRepository.
+
+    Objects mutated directly (without update()) are only persisted
+    on their next logged write.
+    """
+    blocking = True
+
+    def __init__(self, path, model, fsync_every=64, fsync_interval=0.05,
+                 compact_every=10000, unique_indexes=(), indexes=()):
+        super().__init__(unique_indexes=unique_indexes, indexes=indexes)
+        self.model = model
+        self.log_path = f"{path}.log"
+        self.snapshot_path = f"{path}.snapshot"
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._logged = 0
+        # Guards the log file and the sync state against the timer
+        # thread
+        self._sync_lock = threading.Lock()
+        # Timer syncing the pending writes after fsync_interval
+        self._timer = None
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+        self._log = open(self.log_path, 'a', encoding='utf-8')
+        _open_repositories.add(self)
+
+    # -- loading ------------------------------------------------------
+
+    def _restore(self, record):
+        return restore_record(self.model, record)
+
+    def _load(self):
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding='utf-8') as snapshot:
+                for line in snapshot:
+                    if line.strip():
+                        super().add(self._restore(json.loads(line)))
+        if not os.path.exists(self.log_path):
+            return
+        good_offset = 0
+        with open(self.log_path, 'rb') as log:
+            for line in log:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self._replay(entry)
+                self._logged += 1
+                good_offset += len(line)
+        # Drop a torn write left at the end of the log by a crash
+        if good_offset < os.path.getsize(self.log_path):
+            os.truncate(self.log_path, good_offset)
+
+    def _replay(self, entry):
+        if entry['op'] == 'delete':
+            super().delete(entry['id'])
+        elif entry['op'] == 'patch':
+            obj = self._storage.get(entry['id'])
+            if obj is None:
+                return
+            self._unindex(obj)
+            for key, value in entry['data'].items():
+                setattr(obj, key, decode_value(value))
+            self._index(obj)
+        else:
+            super().add(self._restore(entry['data']))
+
+    def link(self, resolver):
+        """
+        Resolve references to related objects after loading.
+
+        Must be called once every repository has been loaded, since
+        references may point to objects of another repository.
+
+        Args:
+            resolver (callable): resolver(cls_name, obj_id) returning
+                the related object or None.
+        """
+        for obj in list(self._storage.values()):
+            self._unindex(obj)
+            link_references(obj, resolver)
+            self._index(obj)
+
+    # -- writing ------------------------------------------------------
+
+    def _encode(self, obj):
+        return encode_record(obj)
+
+    def _append(self, entry):
+        self._append_many([entry])
+
+    def _append_many(self, entries):
+        data = ''.join(json.dumps(entry) + "\n" for entry in entries)
+        self._logged += len(entries)
+        # Under the sync lock: the timer thread flushes the same file
+        with self._sync_lock:
+            self._log.write(data)
+            self._log.flush()
+            self._pending += len(entries)
+            now = time.monotonic()
+            due = (self._pending >= self.fsync_every
+                   or now - self._last_sync >= self.fsync_interval)
+            if not due and self._timer is None:
+                self._timer = threading.Timer(self.fsync_interval,
+                                              self._timed_sync)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.sync()
+        if self.compact_every and self._logged >= self.compact_every:
+            self.compact()
+
+    def _timed_sync(self):
+        """Sync the writes left pending at the end of a burst."""
+        with self._sync_lock:
+            self._timer = None
+        self.sync()
+
+    def sync(self):
+        """Flush pending log entries and fsync them to disk."""
+        with self._sync_lock:
+            if self._log.closed:
+                return
+            self._log.flush()
+            if self._pending:
+                os.fsync(self._log.fileno())
+            self._pending = 0
+            self._last_sync = time.monotonic()
+
+    def compact(self):
+        """
+        Write the current state to a new snapshot and truncate the log.
+
+        The snapshot is written to a temporary file and atomically
+        renamed, so a crash leaves either the old or the new snapshot.
+        Replaying the log over a newer snapshot is harmless: add and
+        update entries carry the full object state, and a patch sets
+        the same values again.
+        """
+        self.sync()
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as snapshot:
+            for obj in self._storage.values():
+                snapshot.write(json.dumps(self._encode(obj)) + "\n")
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        with self._sync_lock:
+            self._log.close()
+            self._log = open(self.log_path, 'w', encoding='utf-8')
+        self._logged = 0
+
+    def close(self):
+        """Sync and close the log file."""
+        if not self._log.closed:
+            self.sync()
+            with self._sync_lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                self._log.close()
+        _open_repositories.discard(self)
+
+    def add(self, obj):
+        super().add(obj)
+        self._append({'op': 'add', 'id': obj.id, 'data': self._encode(obj)})
+
+    def add_many(self, objs):
+        super().add_many(objs)
+        self._append_many([
+            {'op': 'add', 'id': obj.id, 'data': self._encode(obj)}
+            for obj in objs
+        ])
+
+    def update(self, obj_id, data):
+        record = super().update(obj_id, data)
+        if record:
+            self._append(self._patch(record))
+        return record
+
+    def _patch(self, record):
+        """Return the log entry of a ChangeRecord."""
+        obj = record.obj
+        fields = set(type(obj).field_names())
+        if not fields.issuperset(record.changes):
+            # A property (e.g. updated_at) changed: log the full state
+            return {'op': 'update', 'id': obj.id, 'data': self._encode(obj)}
+        data = {key: encode_value(getattr(obj, key))
+                for key in record.changes}
+        data['_updated'] = obj._updated
+        return {'op': 'patch', 'id': obj.id, 'data': data}
+
+    def delete(self, obj_id):
+        if obj_id in self._storage:
+            super().delete(obj_id)
+            self._append({'op': 'delete', 'id': obj_id})
+
+    def clear(self):
+        super().clear()
+        self.compact()
+
+
+class ThreadSafeFileRepository(ThreadSafeMixin, FileRepository):
+    """FileRepository safe to share between threads."""
+
+    def sync(self):
+        with self.lock:
+            super().sync()
+
+    def compact(self):
+        with self.lock:
+            super().compact()
+
+    def close(self):
+        with self.lock:
+            super().close()
+
+
+def file_repository_factory(directory, thread_safe=False, **options):
+    """
+    Build a repository factory for HBnBFacade storing files in `directory`.
+
+    Args:
+        directory (str): Directory holding the log and snapshot files.
+        thread_safe (bool): Build ThreadSafeFileRepository instances.
+        **options: FileRepository tuning options (fsync_every, ...).
+
+    Returns:
+        callable: factory(name, model, **indexes) -> FileRepository.
+    """
+    cls = ThreadSafeFileRepository if thread_safe else FileRepository
+
+    def factory(name, model, **indexes):
+        return cls(os.path.join(directory, name), model, **options, **indexes)
+    return factory
@@ -0,0 +1,112 @@
+"""
+Geospatial grid index.
+
+GridIndex buckets points into cells of a fixed size in degrees. A
+radius query only visits the cells overlapping the bounding box of
+the search circle, computes great-circle distances for the points
+found there and keeps the k nearest.
+"""
+
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Return the great-circle distance between two points in km."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    """
+    Uniform latitude/longitude grid of point ids.
+
+    Args:
+        cell_deg (float): Cell size in degrees.
+    """
+    def __init__(self, cell_deg=0.25):
+        self.cell_deg = cell_deg
+        self.columns = int(math.ceil(360 / cell_deg))
+        self.cells = {}
+        self.points = {}
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cell(self, lat, lon):
+        row = int(math.floor((lat + 90) / self.cell_deg))
+        col = int(math.floor((lon + 180) / self.cell_deg)) % self.columns
+        return row, col
+
+    def add(self, obj_id, lat, lon):
+        """Insert or move the point `obj_id`."""
+        if obj_id in self.points:
+            self.remove(obj_id)
+        cell = self._cell(lat, lon)
+        self.points[obj_id] = (lat, lon, cell)
+        self.cells.setdefault(cell, set()).add(obj_id)
+
+    def remove(self, obj_id):
+        """Delete the point `obj_id` if present."""
+        point = self.points.pop(obj_id, None)
+        if point is None:
+            return
+        ids = self.cells[point[2]]
+        ids.discard(obj_id)
+        if not ids:
+            del self.cells[point[2]]
+
+    def clear(self):
+        """Remove every point."""
+        self.cells.clear()
+        self.points.clear()
+
+    def _candidate_cells(self, lat, lon, radius_km):
+        dlat = radius_km / KM_PER_DEGREE
+        min_row, _ = self._cell(max(-90.0, lat - dlat), lon)
+        max_row, _ = self._cell(min(90.0, lat + dlat), lon)
+
+        # Widest longitude span is reached at the latitude closest to a pole
+        edge = min(90.0, abs(lat) + dlat)
+        cos_edge = math.cos(math.radians(edge))
+        if edge >= 90.0 or radius_km / (KM_PER_DEGREE * cos_edge) >= 180:
+            cols = range(self.columns)
+        else:
+            dlon = radius_km / (KM_PER_DEGREE * cos_edge)
+            _, first = self._cell(lat, lon - dlon)
+            count = int(math.ceil(2 * dlon / self.cell_deg)) + 1
+            cols = [(first + i) % self.columns
+                    for i in range(min(count, self.columns))]
+
+        for row in range(min_row, max_row + 1):
+            for col in cols:
+                yield row, col
+
+    def nearest(self, lat, lon, radius_km, limit):
+        """
+        Return the points closest to (lat, lon) within `radius_km`.
+
+        Args:
+            lat (float): Latitude of the center.
+            lon (float): Longitude of the center.
+            radius_km (float): Search radius in kilometers.
+            limit (int): Maximum number of points returned.
+
+        Returns:
+            list: (distance_km, obj_id) tuples sorted by distance.
+        """
+        matches = []
+        cells = self.cells
+        points = self.points
+        for cell in self._candidate_cells(lat, lon, radius_km):
+            for obj_id in cells.get(cell, ()):
+                p_lat, p_lon, _ = points[obj_id]
+                distance = haversine_km(lat, lon, p_lat, p_lon)
+                if distance <= radius_km:
+                    matches.append((distance, obj_id))
+        return heapq.nsmallest(limit, matches)
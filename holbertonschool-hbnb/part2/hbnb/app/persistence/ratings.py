@@ -0,0 +1,80 @@
+"""
+Per-place rating aggregates.
+
+RatingAggregates keeps, for every place that has reviews, the number
+of reviews, the sum of their ratings and a histogram of the ratings
+1 to 5. The facade updates it on every review create, update and
+delete so that the average rating of a place is read in O(1) instead
+of being recomputed from all of its reviews.
+"""
+
+MIN_RATING = 1
+MAX_RATING = 5
+
+
+class RatingAggregates:
+    """Running count, sum and histogram of review ratings per place."""
+
+    def __init__(self):
+        # place_id -> [count, sum, histogram list of 5 counts]
+        self._stats = {}
+
+    def __len__(self):
+        return len(self._stats)
+
+    def add(self, place_id, rating):
+        """Account for a new review of `place_id` rated `rating`."""
+        stats = self._stats.get(place_id)
+        if stats is None:
+            stats = self._stats[place_id] = [0, 0, [0] * MAX_RATING]
+        stats[0] += 1
+        stats[1] += rating
+        stats[2][rating - MIN_RATING] += 1
+
+    def remove(self, place_id, rating):
+        """Forget a review of `place_id` rated `rating`."""
+        stats = self._stats.get(place_id)
+        if stats is None:
+            return
+        stats[0] -= 1
+        stats[1] -= rating
+        stats[2][rating - MIN_RATING] -= 1
+        if not stats[0]:
+            del self._stats[place_id]
+
+    def change(self, place_id, old_rating, new_rating):
+        """Move a review of `place_id` from `old_rating` to `new_rating`."""
+        if old_rating != new_rating:
+            self.remove(place_id, old_rating)
+            self.add(place_id, new_rating)
+
+    def reset(self, place_id, ratings):
+        """Recompute the aggregates of `place_id` from all its ratings."""
+        self._stats.pop(place_id, None)
+        for rating in ratings:
+            self.add(place_id, rating)
+
+    def clear(self):
+        """Forget every place."""
+        self._stats.clear()
+
+    def summary(self, place_id):
+        """
+        Return the rating summary of a place.
+
+        Args:
+            place_id (str): ID of the place.
+
+        Returns:
+            dict: count, sum, average (None without reviews) and
+            histogram mapping each rating "1".."5" to its count.
+        """
+        count, total, histogram = self._stats.get(
+            place_id, (0, 0, [0] * MAX_RATING))
+        return {
+            'count': count,
+            'sum': total,
+            'average': round(total / count, 2) if count else None,
+            'histogram': {str(rating): histogram[rating - MIN_RATING]
+                          for rating in range(MIN_RATING, MAX_RATING + 1)},
+        }
@@ -0,0 +1,97 @@
+"""
+Record encoding shared by the durable repositories.
+
+Model attributes are converted to JSON-compatible values. Related
+models are stored as references to their class name and id, so each
+object is written once, in its own repository, and is resolved
+again when it is read back.
+"""
+
+from datetime import datetime
+from app.models.base_model import BaseModel
+
+
+class Reference:
+    """Placeholder for a related object that has not been resolved yet."""
+    __slots__ = ('cls_name', 'obj_id')
+
+    def __init__(self, cls_name, obj_id):
+        self.cls_name = cls_name
+        self.obj_id = obj_id
+
+
+def encode_value(value):
+    """
+    Convert an attribute value to a JSON-compatible value.
+
+    Related models are stored as references to their id, so each
+    object is written once, in its own repository.
+    """
+    if isinstance(value, BaseModel):
+        return {'$ref': [type(value).__name__, value.id]}
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def decode_value(value):
+    """Inverse of encode_value(); references become Reference objects."""
+    if isinstance(value, dict):
+        if '$ref' in value:
+            return Reference(*value['$ref'])
+        if '$dt' in value:
+            return datetime.fromisoformat(value['$dt'])
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    return value
+
+
+def resolve_value(value, resolver):
+    """Replace Reference placeholders using resolver(cls_name, obj_id)."""
+    if isinstance(value, Reference):
+        return resolver(value.cls_name, value.obj_id)
+    if isinstance(value, list):
+        return [resolve_value(item, resolver) for item in value]
+    return value
+
+
+def encode_record(obj):
+    """Return the JSON-compatible attribute dict of a model instance."""
+    return {name: encode_value(getattr(obj, name))
+            for name in type(obj).field_names()}
+
+
+def restore_record(model, record):
+    """
+    Rebuild a model instance from a record without calling __init__.
+
+    References to related objects are left as Reference placeholders;
+    see link_references().
+    """
+    obj = model.__new__(model)
+    for key, value in record.items():
+        setattr(obj, key, decode_value(value))
+    return obj
+
+
+def link_references(obj, resolver):
+    """
+    Replace the Reference placeholders held by `obj` in place.
+
+    Args:
+        obj (BaseModel): Instance returned by restore_record().
+        resolver (callable): resolver(cls_name, obj_id) returning the
+            related object or None.
+
+    Returns:
+        bool: True if the object held any reference.
+    """
+    fields = {name: getattr(obj, name) for name in type(obj).field_names()}
+    if not any(isinstance(value, (Reference, list))
+               for value in fields.values()):
+        return False
+    for key, value in fields.items():
+        setattr(obj, key, resolve_value(value, resolver))
+    return True
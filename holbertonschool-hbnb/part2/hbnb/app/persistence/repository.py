@@ -1,22 +1,141 @@
+import base64
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+
+
+def encode_cursor(obj):
+    """
+    Build an opaque pagination cursor pointing just after `obj`.
+
+    The cursor encodes the keyset (creation microseconds, id) of the
+    object, see BaseModel.sort_key.
+    """
+    created, obj_id = obj.sort_key
+    raw = f"{created}|{obj_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor built by encode_cursor().
+
+    Returns:
+        tuple: The (creation microseconds, id) keyset.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created, obj_id = raw.split("|", 1)
+        return int(created), obj_id
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
 
 class Repository(ABC):
+    # True when calls wait on I/O (disk, database) rather than only
+    # running Python code; the ASGI server runs the requests of such
+    # repositories in worker threads instead of on its event loop.
+    blocking = False
+    # ChangeFeed receiving the writes, and the collection name of its
+    # events; see attach_feed()
+    feed = None
+    feed_name = None
+    # Incremented by clear(), so that the facade rebuilds the side
+    # indexes of a collection emptied without going through it
+    generation = 0
+
+    def attach_feed(self, feed, name):
+        """
+        Publish the writes of the repository to a change feed.
+
+        Args:
+            feed (ChangeFeed): Feed receiving the events.
+            name (str): Collection name of the events, e.g. 'places'.
+        """
+        self.feed = feed
+        self.feed_name = name
+
+    def _publish(self, type, obj_ids, fields=()):
+        """Publish events of `type` for `obj_ids`, if a feed is attached."""
+        if self.feed is not None:
+            self.feed.publish(type, self.feed_name, obj_ids, fields)
+
     @abstractmethod
     def add(self, obj):
         pass
 
+    @abstractmethod
+    def add_many(self, objs):
+        pass
+
     @abstractmethod
     def get(self, obj_id):
         pass
 
+    def get_many(self, obj_ids):
+        """
+        Look up several objects at once.
+
+        This default calls get() once per id; backends override it
+        with a single batched lookup.
+
+        Args:
+            obj_ids (iterable): IDs to look up.
+
+        Returns:
+            dict: {id: object} for the ids that exist; missing ids
+            are left out.
+        """
+        found = {}
+        for obj_id in obj_ids:
+            obj = self.get(obj_id)
+            if obj is not None:
+                found[obj_id] = obj
+        return found
+
     @abstractmethod
     def get_all(self):
         pass
 
     @abstractmethod
-    def update(self, obj_id, data):
+    def get_page(self, limit, cursor=None):
         pass
 
+    def iter_pages(self, batch_size=500):
+        """
+        Iterate over every object in (created_at, id) order, one page
+        at a time.
+
+        Pages are fetched lazily with get_page(), so at most one batch
+        is held at once whatever the size of the collection.
+
+        Args:
+            batch_size (int): Number of objects per page.
+
+        Yields:
+            list: The objects of the next non-empty page.
+        """
+        cursor = None
+        while True:
+            items, cursor = self.get_page(batch_size, cursor)
+            if items:
+                yield items
+            if not cursor:
+                return
+
+    @abstractmethod
+    def update(self, obj_id, data):
+        """
+        Update an object with the attribute values of `data`.
+
+        Returns:
+            ChangeRecord: The changed fields (false when nothing
+            changed and nothing was written), or None if there is no
+            such object.
+        """
+
     @abstractmethod
     def delete(self, obj_id):
         pass
@@ -25,28 +144,249 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def get_all_by_attribute(self, attr_name, attr_value):
+        pass
+
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """
+    Repository storing objects in a Python dictionary keyed by id.
+
+    Secondary hash indexes can be declared per repository so that
+    get_by_attribute() is a dictionary lookup instead of a scan:
+
+        - unique_indexes: at most one object per value
+          (e.g. 'email' on the user repository).
+        - indexes: any number of objects per value
+          (e.g. 'owner' on the place repository).
+
+    Indexes are kept up to date by add(), update() and delete().
+    A sorted list of (created, id) keys is kept as well so that
+    get_page() can seek straight to a cursor.
+
+    `version` is incremented by every write, so callers can tell
+    whether the collection changed since they last looked.
+    """
+    def __init__(self, unique_indexes=(), indexes=()):
+        self.version = 0
         self._storage = {}
+        self._order = []
+        self._unique = {attr: {} for attr in unique_indexes}
+        self._multi = {attr: {} for attr in indexes}
+
+    def _check_unique(self, obj_id, values):
+        """
+        Raise ValueError if a unique value already belongs to another object.
+
+        Args:
+            obj_id (str): ID of the object being written.
+            values (dict): Attribute values to check.
+        """
+        for attr, index in self._unique.items():
+            if attr not in values:
+                continue
+            owner_id = index.get(values[attr])
+            if owner_id is not None and owner_id != obj_id:
+                raise ValueError(f"{attr} already exists")
+
+    def _index(self, obj):
+        for attr, index in self._unique.items():
+            index[getattr(obj, attr)] = obj.id
+        for attr, index in self._multi.items():
+            index.setdefault(getattr(obj, attr), set()).add(obj.id)
+
+    def _unindex(self, obj):
+        for attr, index in self._unique.items():
+            index.pop(getattr(obj, attr), None)
+        for attr, index in self._multi.items():
+            value = getattr(obj, attr)
+            ids = index.get(value)
+            if ids is not None:
+                ids.discard(obj.id)
+                if not ids:
+                    del index[value]
 
     def add(self, obj):
+        self._check_unique(
+            obj.id, {attr: getattr(obj, attr) for attr in self._unique})
+        self._store(obj)
+        self._publish('created', (obj.id,))
+
+    def _store(self, obj):
+        old = self._storage.get(obj.id)
+        if old is not None:
+            self._unindex(old)
+            self._remove_key(old)
         self._storage[obj.id] = obj
+        self._index(obj)
+        self.version += 1
+        key = obj.sort_key
+        if not self._order or self._order[-1] < key:
+            self._order.append(key)
+        else:
+            insort(self._order, key)
+
+    def add_many(self, objs):
+        """
+        Add several objects at once.
+
+        Unique indexes are checked for the whole batch first, so either
+        every object is added or none is.
+
+        Args:
+            objs (list): Objects to add.
+
+        Raises:
+            ValueError: If a unique value is duplicated.
+        """
+        for attr, index in self._unique.items():
+            seen = set()
+            for obj in objs:
+                value = getattr(obj, attr)
+                owner_id = index.get(value)
+                if value in seen or (owner_id is not None
+                                     and owner_id != obj.id):
+                    raise ValueError(f"{attr} already exists")
+                seen.add(value)
+        for obj in objs:
+            self._store(obj)
+        self._publish('created', [obj.id for obj in objs])
+
+    def _remove_key(self, obj):
+        key = obj.sort_key
+        pos = bisect_left(self._order, key)
+        if pos < len(self._order) and self._order[pos] == key:
+            del self._order[pos]
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
+    def get_many(self, obj_ids):
+        storage = self._storage
+        return {obj_id: storage[obj_id] for obj_id in obj_ids
+                if obj_id in storage}
+
     def get_all(self):
         return list(self._storage.values())
 
+    def get_page(self, limit, cursor=None):
+        """
+        Return one page of objects ordered by (created_at, id).
+
+        Only the requested slice of the key list is visited.
+
+        Args:
+            limit (int): Maximum number of objects to return.
+            cursor (str, optional): Cursor returned by a previous call.
+
+        Returns:
+            tuple: (list of objects, next cursor or None).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        start = 0
+        if cursor:
+            start = bisect_right(self._order, decode_cursor(cursor))
+        keys = self._order[start:start + limit]
+        items = [self._storage[obj_id] for _, obj_id in keys]
+        next_cursor = None
+        if items and start + limit < len(self._order):
+            next_cursor = encode_cursor(items[-1])
+        return items, next_cursor
+
     def update(self, obj_id, data):
+        """
+        Apply the changed fields of `data` to an object.
+
+        A no-op update writes nothing and leaves the version alone;
+        the indexes are only rebuilt when an indexed field changed.
+
+        Args:
+            obj_id (str): ID of the object to update.
+            data (dict): Attribute values.
+
+        Returns:
+            ChangeRecord: The changes (false for a no-op), or None if
+            there is no such object.
+
+        Raises:
+            ValueError: If a unique value already belongs to another
+                object.
+        """
         obj = self.get(obj_id)
-        if obj:
-            obj.update(data)
+        if not obj:
+            return None
+        changes = obj.diff(data)
+        if not changes:
+            return obj.update(changes)
+        self._check_unique(obj_id, changes)
+        reindex = any(attr in changes
+                      for attr in (*self._unique, *self._multi))
+        if reindex:
+            self._unindex(obj)
+        try:
+            record = obj.update(changes)
+        finally:
+            if reindex:
+                self._index(obj)
+            self.version += 1
+        self._publish('updated', (obj_id,), sorted(record.changes))
+        return record
 
     def delete(self, obj_id):
         if obj_id in self._storage:
-            del self._storage[obj_id]
+            obj = self._storage.pop(obj_id)
+            self._unindex(obj)
+            self._remove_key(obj)
+            self.version += 1
+            self._publish('deleted', (obj_id,))
+
+    def clear(self):
+        """Remove every stored object and reset all indexes."""
+        self.version += 1
+        self.generation += 1
+        self._storage.clear()
+        self._order.clear()
+        for index in self._unique.values():
+            index.clear()
+        for index in self._multi.values():
+            index.clear()
+        self._publish('cleared', (None,))
 
     def get_by_attribute(self, attr_name, attr_value):
+        if attr_name in self._unique:
+            obj_id = self._unique[attr_name].get(attr_value)
+            return self._storage.get(obj_id) if obj_id is not None else None
+        if attr_name in self._multi:
+            ids = self._multi[attr_name].get(attr_value)
+            return self._storage[next(iter(ids))] if ids else None
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """
+        Return every object whose attribute equals the given value.
+
+        Uses the index when one is declared for the attribute and
+        falls back to a full scan otherwise.
+
+        Args:
+            attr_name (str): Name of the attribute to match.
+            attr_value: Value to look for.
+
+        Returns:
+            list: Matching objects, possibly empty.
+        """
+        if attr_name in self._unique:
+            obj = self.get_by_attribute(attr_name, attr_value)
+            return [obj] if obj is not None else []
+        if attr_name in self._multi:
+            ids = self._multi[attr_name].get(attr_value, ())
+            return [self._storage[obj_id] for obj_id in ids]
+        return [obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value]
+
+
+def in_memory_repository_factory(name, model, **indexes):
+    """Default repository factory for HBnBFacade: volatile storage."""
+    return InMemoryRepository(**indexes)
@@ -0,0 +1,495 @@
+"""
+SQLite-backed repository.
+
+Each repository owns one table holding the encoded object (JSON),
+its creation time and one real column per declared index. Lookups on
+indexed attributes and keyset pagination are served by SQLite
+indexes. Connections are kept per thread, the database runs in WAL
+mode, and writes can be grouped in one transaction with batch().
+An update only rewrites the changed fields of the record (json_set)
+and the index columns they feed; a no-op update is not written.
+Change feed events (see Repository.attach_feed()) are published once
+the write is committed, so a rolled back batch publishes nothing.
+
+Several processes can share one database file (the 'shared' storage
+backend). With `track_changes`, triggers record every write in two
+tables of the database itself, so that each process learns about the
+writes of the others:
+
+    - hbnb_versions: one write counter per table, the `version` of
+      the repository in every process;
+    - hbnb_changes: a log of the ids written (seq, table, id), cut to
+      its last `change_log_size` entries, read with changes_since().
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from app.models.base_model import BaseModel
+from app.persistence.records import (
+    encode_record, encode_value, link_references, restore_record)
+from app.persistence.repository import (
+    Repository, decode_cursor, encode_cursor)
+
+# Entries kept in the change log of a shared database
+CHANGE_LOG_SIZE = 100_000
+
+# Every repository, to drop their connections in forked children
+_repositories = weakref.WeakSet()
+
+
+def _reset_after_fork():
+    """Forget the connections inherited from the parent process."""
+    for repo in list(_repositories):
+        repo._reset_connections()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class SQLiteRepository(Repository):
+    """
+    Repository storing one model class in an SQLite table.
+
+    Args:
+        path (str): Path of the database file (shared by repositories).
+        table (str): Table name for this repository.
+        model (type): BaseModel subclass stored in the table.
+        unique_indexes (iterable): Attributes with a UNIQUE index.
+        indexes (iterable): Attributes with a regular index.
+        track_changes (bool): Record the writes of every process in
+            the database (see the module docstring).
+        change_log_size (int): Entries kept in the change log, fixed
+            by the first repository creating the log in the database.
+    """
+    # Objects being materialized by the current thread, keyed by
+    # (class name, id), so reference cycles resolve to one instance.
+    _loading = threading.local()
+    blocking = True
+
+    def __init__(self, path, table, model, unique_indexes=(), indexes=(),
+                 track_changes=False, change_log_size=CHANGE_LOG_SIZE):
+        if not table.isidentifier():
+            raise ValueError("Invalid table name")
+        self.path = path
+        self.table = table
+        self.model = model
+        self.unique_indexes = list(unique_indexes)
+        self.indexes = list(indexes)
+        self.columns = self.unique_indexes + self.indexes
+        self.track_changes = track_changes
+        self.change_log_size = int(change_log_size)
+        self._resolver = None
+        # Writes made through this instance, see version
+        self._writes = 0
+        self._reset_connections()
+        _repositories.add(self)
+
+        columns = ''.join(f', "{col}"' for col in self.columns)
+        marks = ', ?' * len(self.columns)
+        assignments = ''.join(f', "{col}" = ?' for col in self.columns)
+        self._sql_insert = (
+            f'INSERT INTO "{table}" (id, created_at, data{columns}) '
+            f'VALUES (?, ?, ?{marks})')
+        self._sql_update = (
+            f'UPDATE "{table}" SET data = ?{assignments} WHERE id = ?')
+        # Partial updates, by tuple of changed fields
+        self._sql_patches = {}
+        self._sql_get = f'SELECT data FROM "{table}" WHERE id = ?'
+        # Every id in one JSON array parameter: no limit on their number
+        self._sql_get_many = (
+            f'SELECT id, data FROM "{table}" '
+            f'WHERE id IN (SELECT value FROM json_each(?))')
+        self._sql_all = (
+            f'SELECT data FROM "{table}" ORDER BY created_at, id')
+        self._sql_first_page = (
+            f'SELECT data FROM "{table}" ORDER BY created_at, id LIMIT ?')
+        self._sql_page = (
+            f'SELECT data FROM "{table}" WHERE (created_at, id) > (?, ?) '
+            f'ORDER BY created_at, id LIMIT ?')
+        self._sql_delete = f'DELETE FROM "{table}" WHERE id = ?'
+        self._create_schema()
+
+    @property
+    def version(self):
+        """
+        Counter changing with every write to the table.
+
+        Counts the writes made through this instance or, when changes
+        are tracked, the writes made by every process.
+        """
+        if not self.track_changes:
+            return self._writes
+        row = self._connection().execute(
+            'SELECT version FROM hbnb_versions WHERE tbl = ?',
+            (self.table,)).fetchone()
+        return row[0] if row else 0
+
+    # -- connections --------------------------------------------------
+
+    def _reset_connections(self):
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.batch_depth = 0
+            # Change feed events of the open batch, see _publish()
+            self._local.events = []
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _commit(self, conn):
+        if not self._local.batch_depth:
+            conn.commit()
+            events, self._local.events = self._local.events, []
+            for event in events:
+                super()._publish(*event)
+
+    def _publish(self, type, obj_ids, fields=()):
+        """Queue events until the transaction of the write commits."""
+        if self.feed is not None:
+            self._local.events.append((type, obj_ids, fields))
+
+    @contextmanager
+    def batch(self):
+        """
+        Group every write done in the block in a single transaction.
+
+        The transaction is committed when the outermost block exits
+        and rolled back if it raises.
+        """
+        conn = self._connection()
+        self._local.batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._local.batch_depth -= 1
+            if not self._local.batch_depth:
+                conn.rollback()
+                self._local.events = []
+            raise
+        self._local.batch_depth -= 1
+        self._commit(conn)
+
+    def close(self):
+        """Close every connection opened by this repository."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _create_change_log(self, conn):
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS hbnb_changes ('
+            'seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'tbl TEXT NOT NULL, obj_id TEXT NOT NULL)')
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS hbnb_changes_tbl '
+            'ON hbnb_changes (tbl, seq)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS hbnb_versions ('
+            'tbl TEXT PRIMARY KEY, version INTEGER NOT NULL)')
+        conn.execute('INSERT OR IGNORE INTO hbnb_versions VALUES (?, 0)',
+                     (self.table,))
+        for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'),
+                           ('DELETE', 'OLD')):
+            conn.execute(
+                f'CREATE TRIGGER IF NOT EXISTS '
+                f'"{self.table}_{event.lower()}_log" '
+                f'AFTER {event} ON "{self.table}" BEGIN '
+                f"INSERT INTO hbnb_changes (tbl, obj_id) "
+                f"VALUES ('{self.table}', {row}.id); "
+                f"UPDATE hbnb_versions SET version = version + 1 "
+                f"WHERE tbl = '{self.table}'; "
+                f'DELETE FROM hbnb_changes WHERE seq <= '
+                f'(SELECT max(seq) FROM hbnb_changes) '
+                f'- {self.change_log_size}; '
+                f'END')
+
+    def _create_schema(self):
+        conn = self._connection()
+        columns = ''.join(f', "{col}"' for col in self.columns)
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{self.table}" ('
+            f'id TEXT PRIMARY KEY, created_at INTEGER NOT NULL, '
+            f'data TEXT NOT NULL{columns})')
+        conn.execute(
+            f'CREATE INDEX IF NOT EXISTS "{self.table}_keyset" '
+            f'ON "{self.table}" (created_at, id)')
+        for col in self.unique_indexes:
+            conn.execute(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS "{self.table}_{col}" '
+                f'ON "{self.table}" ("{col}")')
+        for col in self.indexes:
+            conn.execute(
+                f'CREATE INDEX IF NOT EXISTS "{self.table}_{col}" '
+                f'ON "{self.table}" ("{col}")')
+        if self.track_changes:
+            self._create_change_log(conn)
+        conn.commit()
+
+    # -- encoding -----------------------------------------------------
+
+    @staticmethod
+    def _column_value(value):
+        if isinstance(value, BaseModel):
+            return value.id
+        return value
+
+    def _index_values(self, obj):
+        return [self._column_value(getattr(obj, col)) for col in self.columns]
+
+    def link(self, resolver):
+        """
+        Set the resolver used to rebuild references to related objects.
+
+        Args:
+            resolver (callable): resolver(cls_name, obj_id).
+        """
+        self._resolver = resolver
+
+    def _resolve(self, cls_name, obj_id):
+        loading = self._loading.objects
+        if (cls_name, obj_id) in loading:
+            return loading[(cls_name, obj_id)]
+        if self._resolver is None:
+            return None
+        return self._resolver(cls_name, obj_id)
+
+    def _materialize(self, data):
+        obj = restore_record(self.model, json.loads(data))
+        outermost = not hasattr(self._loading, 'objects')
+        if outermost:
+            self._loading.objects = {}
+        try:
+            self._loading.objects[(type(obj).__name__, obj.id)] = obj
+            link_references(obj, self._resolve)
+        finally:
+            if outermost:
+                del self._loading.objects
+        return obj
+
+    def _write_error(self, error):
+        for col in self.unique_indexes:
+            if f'{self.table}.{col}' in str(error):
+                return ValueError(f"{col} already exists")
+        return ValueError(str(error))
+
+    # -- Repository API -----------------------------------------------
+
+    def add(self, obj):
+        conn = self._connection()
+        try:
+            conn.execute(self._sql_insert, [
+                obj.id,
+                obj.sort_key[0],
+                json.dumps(encode_record(obj)),
+                *self._index_values(obj)
+            ])
+        except sqlite3.IntegrityError as error:
+            if not self._local.batch_depth:
+                conn.rollback()
+            raise self._write_error(error)
+        self._publish('created', (obj.id,))
+        self._commit(conn)
+        self._writes += 1
+
+    def add_many(self, objs):
+        """Insert every object with one executemany() in one transaction."""
+        rows = [[
+            obj.id,
+            obj.sort_key[0],
+            json.dumps(encode_record(obj)),
+            *self._index_values(obj)
+        ] for obj in objs]
+        try:
+            with self.batch() as repo:
+                repo._connection().executemany(self._sql_insert, rows)
+                self._publish('created', [row[0] for row in rows])
+        except sqlite3.IntegrityError as error:
+            raise self._write_error(error)
+        self._writes += 1
+
+    def get(self, obj_id):
+        row = self._connection().execute(self._sql_get, (obj_id,)).fetchone()
+        return self._materialize(row[0]) if row else None
+
+    def get_many(self, obj_ids):
+        """Look up every id with a single `IN (...)` query."""
+        obj_ids = list(obj_ids)
+        if not obj_ids:
+            return {}
+        rows = self._connection().execute(
+            self._sql_get_many, (json.dumps(obj_ids),))
+        return {obj_id: self._materialize(data) for obj_id, data in rows}
+
+    def get_all(self):
+        rows = self._connection().execute(self._sql_all)
+        return [self._materialize(data) for data, in rows]
+
+    def get_page(self, limit, cursor=None):
+        conn = self._connection()
+        if cursor:
+            created, obj_id = decode_cursor(cursor)
+            rows = conn.execute(
+                self._sql_page, (created, obj_id, limit + 1)).fetchall()
+        else:
+            rows = conn.execute(self._sql_first_page, (limit + 1,)).fetchall()
+        items = [self._materialize(data) for data, in rows[:limit]]
+        next_cursor = encode_cursor(items[-1]) if len(rows) > limit else None
+        return items, next_cursor
+
+    def _sql_patch(self, keys):
+        """Return the UPDATE setting the fields `keys` of the record."""
+        sql = self._sql_patches.get(keys)
+        if sql is None:
+            paths = ''.join(f", '$.{key}', json(?)" for key in keys)
+            assignments = ''.join(f', "{key}" = ?' for key in keys
+                                  if key in self.columns)
+            sql = self._sql_patches[keys] = (
+                f'UPDATE "{self.table}" SET data = json_set(data{paths})'
+                f'{assignments} WHERE id = ?')
+        return sql
+
+    def update(self, obj_id, data):
+        """
+        Write the changed fields of an object.
+
+        Returns:
+            ChangeRecord: See Repository.update(); nothing is written
+            when it has no changes.
+        """
+        obj = self.get(obj_id)
+        if not obj:
+            return None
+        record = obj.update(data)
+        if not record:
+            return record
+        keys = tuple(sorted(record.changes))
+        if set(keys).issubset(type(obj).field_names()):
+            keys += ('_updated',)
+            sql = self._sql_patch(keys)
+            params = [json.dumps(encode_value(getattr(obj, key)))
+                      for key in keys]
+            params += [self._column_value(getattr(obj, key))
+                       for key in keys if key in self.columns]
+        else:
+            # A property (e.g. updated_at) changed: rewrite the record
+            sql = self._sql_update
+            params = [json.dumps(encode_record(obj)),
+                      *self._index_values(obj)]
+        conn = self._connection()
+        try:
+            conn.execute(sql, [*params, obj_id])
+        except sqlite3.IntegrityError as error:
+            if not self._local.batch_depth:
+                conn.rollback()
+            raise self._write_error(error)
+        self._publish('updated', (obj_id,), sorted(record.changes))
+        self._commit(conn)
+        self._writes += 1
+        return record
+
+    def delete(self, obj_id):
+        conn = self._connection()
+        if conn.execute(self._sql_delete, (obj_id,)).rowcount:
+            self._publish('deleted', (obj_id,))
+        self._commit(conn)
+        self._writes += 1
+
+    def clear(self):
+        """Delete every row of the table."""
+        conn = self._connection()
+        conn.execute(f'DELETE FROM "{self.table}"')
+        self._publish('cleared', (None,))
+        self._commit(conn)
+        self._writes += 1
+        self.generation += 1
+
+    def change_cursor(self):
+        """Return the sequence number of the latest tracked change."""
+        row = self._connection().execute(
+            'SELECT max(seq) FROM hbnb_changes').fetchone()
+        return row[0] or 0
+
+    def changes_since(self, seq):
+        """
+        Return the ids of the objects written after change `seq`.
+
+        Args:
+            seq (int): Value of change_cursor() or of a previous call.
+
+        Returns:
+            tuple: (new seq, set of ids) to pass the new seq to the next
+            call, or None if part of the changes after `seq` were
+            already cut from the log: the caller must then reload
+            everything.
+        """
+        conn = self._connection()
+        last = conn.execute('SELECT max(seq) FROM hbnb_changes').fetchone()[0]
+        if not last or last <= seq:
+            return seq, set()
+        rows = conn.execute(
+            'SELECT obj_id FROM hbnb_changes '
+            'WHERE tbl = ? AND seq > ? AND seq <= ?',
+            (self.table, seq, last))
+        ids = {obj_id for obj_id, in rows}
+        # Checked after the read: a cut racing with it is caught too
+        first = conn.execute('SELECT min(seq) FROM hbnb_changes').fetchone()[0]
+        if first is not None and first > seq + 1:
+            return None
+        return last, ids
+
+    def get_by_attribute(self, attr_name, attr_value):
+        matches = self._query_attribute(attr_name, attr_value, limit=1)
+        return matches[0] if matches else None
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """Return every object whose attribute equals the given value."""
+        return self._query_attribute(attr_name, attr_value)
+
+    def _query_attribute(self, attr_name, attr_value, limit=-1):
+        if not attr_name.isidentifier():
+            raise ValueError("Invalid attribute name")
+        if attr_name in self.columns:
+            where = f'"{attr_name}" = ?'
+        elif isinstance(attr_value, BaseModel):
+            # Unindexed reference: match the id stored in the JSON record
+            where = f"json_extract(data, '$.{attr_name}.\"$ref\"[1]') = ?"
+        else:
+            where = f"json_extract(data, '$.{attr_name}') = ?"
+        rows = self._connection().execute(
+            f'SELECT data FROM "{self.table}" WHERE {where} '
+            f'ORDER BY created_at, id LIMIT ?',
+            (self._column_value(attr_value), limit))
+        return [self._materialize(data) for data, in rows]
+
+
+def sqlite_repository_factory(path, **options):
+    """
+    Build a repository factory for HBnBFacade using one database file.
+
+    Args:
+        path (str): Path of the SQLite database file.
+        **options: track_changes and change_log_size of the
+            repositories.
+
+    Returns:
+        callable: factory(name, model, **indexes) -> SQLiteRepository.
+    """
+    def factory(name, model, **indexes):
+        return SQLiteRepository(path, name, model, **indexes, **options)
+    return factory
@@ -0,0 +1,207 @@
+"""
+Full-text inverted index.
+
+TextIndex maps every term to a posting list {doc_id: weighted term
+frequency}. A document is made of named fields ('title',
+'description', ...), each with a weight multiplying the frequency of
+its terms, so that a match in a title counts more than one in a
+description (a simplified BM25F).
+
+A query matches the documents containing every one of its terms; the
+last term also matches as a prefix ("cos" finds "cosy"), for
+autocomplete. The candidates are the intersection of the posting
+lists, smallest first, and only they are scored with BM25 and ranked
+with a heap: the cost depends on the posting lists of the query, not
+on the number of documents.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import repeat
+
+# BM25 term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+# Terms a prefix is expanded to, at most
+MAX_PREFIX_TERMS = 64
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """
+    Split `text` into lowercase terms without accents.
+
+    Args:
+        text (str): Text to split; None gives no term.
+
+    Returns:
+        list: The terms, in order.
+    """
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text.casefold())
+    if not text.isascii():
+        text = ''.join(char for char in text
+                       if not unicodedata.combining(char))
+    return _WORD.findall(text)
+
+
+class TextIndex:
+    """
+    Inverted index of documents made of weighted text fields.
+
+    Args:
+        weights (dict): Field name -> weight; fields not listed
+            weigh 1.
+    """
+    def __init__(self, weights=None):
+        self.weights = dict(weights or {})
+        # term -> {doc_id: weighted frequency}
+        self._postings = {}
+        # Sorted terms, for the prefix lookups
+        self._terms = []
+        # doc_id -> terms of the document, and its weighted length
+        self._docs = {}
+        self._lengths = {}
+        self._total_length = 0.0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._docs
+
+    def add(self, doc_id, fields):
+        """
+        Index a document, replacing its previous version.
+
+        Args:
+            doc_id (str): ID of the document.
+            fields (dict): Field name -> text.
+        """
+        self.remove(doc_id)
+        frequencies = {}
+        length = 0.0
+        for field, text in fields.items():
+            weight = self.weights.get(field, 1.0)
+            for term in tokenize(text):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+                length += weight
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[doc_id] = frequency
+        self._docs[doc_id] = tuple(frequencies)
+        self._lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id):
+        """Forget a document; unknown ids are ignored."""
+        terms = self._docs.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+
+    def clear(self):
+        """Forget every document."""
+        self._postings.clear()
+        self._terms.clear()
+        self._docs.clear()
+        self._lengths.clear()
+        self._total_length = 0.0
+
+    def expand(self, prefix, limit=MAX_PREFIX_TERMS):
+        """
+        Return the indexed terms starting with `prefix`.
+
+        Args:
+            prefix (str): Beginning of the terms, already tokenized.
+            limit (int): Maximum number of terms returned.
+
+        Returns:
+            list: Terms in alphabetical order.
+        """
+        terms = self._terms
+        start = bisect_left(terms, prefix)
+        matches = []
+        for term in terms[start:start + limit]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def _idf(self, postings):
+        count = len(self._docs)
+        return math.log(1 + (count - len(postings) + 0.5)
+                        / (len(postings) + 0.5))
+
+    def search(self, query, limit=10, prefix=True):
+        """
+        Return the best documents containing every term of `query`.
+
+        Args:
+            query (str): Text typed by the user.
+            limit (int): Number of results.
+            prefix (bool): Let the last term match as a prefix.
+
+        Returns:
+            list: (score, doc_id) tuples, best first.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._docs or limit < 1:
+            return []
+        # One group of posting lists per query term: a document must
+        # appear in one list of every group
+        groups = [[self._postings[term]] if term in self._postings else []
+                  for term in terms]
+        if prefix:
+            groups[-1] = [self._postings[term]
+                          for term in self.expand(terms[-1])]
+        if not all(groups):
+            return []
+
+        groups.sort(key=lambda group: sum(map(len, group)))
+        candidates = set().union(*groups[0])
+        for group in groups[1:]:
+            if len(group) == 1:
+                candidates &= group[0].keys()
+            else:
+                # Probe the prefix lists with the few candidates left
+                candidates = {doc_id for doc_id in candidates
+                              if any(doc_id in postings
+                                     for postings in group)}
+            if not candidates:
+                return []
+
+        # Scored one query term at a time over aligned lists, which
+        # runs much faster than one call per document
+        base = K1 * (1 - B)
+        scale = K1 * B * len(self._docs) / self._total_length
+        ids = list(candidates)
+        norms = [base + scale * length
+                 for length in map(self._lengths.__getitem__, ids)]
+        scores = [0.0] * len(ids)
+        for group in groups:
+            parts = []
+            for postings in group:
+                weight = self._idf(postings) * (K1 + 1)
+                get = postings.get
+                parts.append([weight * frequency / (frequency + norm)
+                              for frequency, norm
+                              in zip(map(get, ids, repeat(0.0)), norms)])
+            # A prefix counts as its best matching term
+            best = parts[0] if len(parts) == 1 else map(max, *parts)
+            scores = [score + part for score, part in zip(scores, best)]
+        return heapq.nlargest(limit, zip(scores, ids))
@@ -1,3 +1,20 @@
+import os
+from config import config
+from app.models.base_model import set_id_generator
+from app.models.ids import ID_GENERATORS
+from app.persistence import make_repository_factory
+from app.services.cache import ResponseCache
 from app.services.facade import HBnBFacade
+from app.services.metrics import Metrics
 
-facade = HBnBFacade()
+settings = config[os.getenv('HBNB_ENV', 'default')]
+
+set_id_generator(ID_GENERATORS[settings.ID_GENERATOR])
+
+facade = HBnBFacade(make_repository_factory(settings),
+                    lazy_indexes=settings.LAZY_INDEXES,
+                    change_feed_size=settings.CHANGE_FEED_SIZE)
+response_cache = ResponseCache(max_bytes=settings.RESPONSE_CACHE_BYTES,
+                               max_entries=settings.RESPONSE_CACHE_ENTRIES)
+# Request and span histograms, recorded when HBNB_METRICS=1
+app_metrics = Metrics()
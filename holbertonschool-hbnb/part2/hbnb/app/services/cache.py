@@ -0,0 +1,107 @@
+"""
+Response cache.
+
+ResponseCache keeps serialized response bodies keyed by a tuple that
+names the resource and the versions it was built from (the
+updated_at of the objects, the write counter of the repositories).
+A write changes the versions and therefore the key, so entries never
+need to be invalidated explicitly: stale ones simply stop being asked
+for and fall off the end of the LRU list.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of serialized responses with a memory cap.
+
+    Args:
+        max_bytes (int): Upper bound on the total size of cached bodies.
+        max_entries (int): Upper bound on the number of entries.
+    """
+    def __init__(self, max_bytes=16 * 1024 * 1024, max_entries=10000):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Versions restart with the process, so tags from an earlier run
+        # must not match the tags of this one.
+        self._salt = os.urandom(8)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def etag(self, key):
+        """Return the strong entity tag (unquoted) of `key`."""
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16,
+                                 key=self._salt)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        Return the (body, headers) entry of `key` and mark it recently used.
+
+        Returns:
+            tuple: (bytes, dict) or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def count_not_modified(self):
+        """Record a request answered with 304 Not Modified."""
+        with self._lock:
+            self.not_modified += 1
+
+    def put(self, key, body, headers=None):
+        """
+        Store `body` under `key`, evicting least recently used entries.
+
+        Bodies larger than max_bytes are not stored.
+        """
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[0])
+            self._entries[key] = (body, dict(headers or {}))
+            self.size += len(body)
+            while (self.size > self.max_bytes
+                   or len(self._entries) > self.max_entries):
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Return the counters and current size of the cache."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'evictions': self.evictions,
+            }
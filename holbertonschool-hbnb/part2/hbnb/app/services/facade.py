@@ -1,9 +1,25 @@
 """Facade is an intermediary between the API layer and
 the persistance layer.
 """
-from app.persistence.repository import InMemoryRepository
+import time
+from itertools import islice
+from app.persistence.bitmaps import BitmapIndex, iter_rows, popcount
+from app.persistence.change_feed import FEED_SIZE, ChangeFeed
+from app.persistence.columns import ColumnStore
+from app.persistence.concurrency import ReadWriteLock
+from app.persistence.geo_index import GridIndex
+from app.persistence.ratings import RatingAggregates
+from app.persistence.text_index import TextIndex
+from app.persistence.repository import in_memory_repository_factory
 from app.models.user import User
 from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+
+# Weight of a term found in each field of the place search documents
+PLACE_SEARCH_WEIGHTS = {'title': 3.0, 'description': 1.0, 'amenities': 2.0}
+# Place attributes feeding the search documents
+PLACE_SEARCH_FIELDS = ('title', 'description')
 
 
 class HBnBFacade:
@@ -11,11 +27,269 @@ class HBnBFacade:
         persistence layer. It centralizes business logic and abstracts
         direct access to the repositories.
     """
-    def __init__(self):
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+    def __init__(self, repository_factory=in_memory_repository_factory,
+                 lazy_indexes=False, change_feed_size=FEED_SIZE):
+        """
+        Creates the four repositories through `repository_factory`.
+
+        Args:
+        repository_factory (callable): factory(name, model, **indexes)
+            returning a Repository. Defaults to in-memory storage.
+        lazy_indexes (bool): Build the place indexes and the rating
+            aggregates on the first query using them rather than now,
+            for a fast start with large stored collections.
+        change_feed_size (int): Events kept by the change feed of the
+            four repositories (self.changes).
+        """
+        self.user_repo = repository_factory(
+            'users', User, unique_indexes=['email'])
+        self.amenity_repo = repository_factory('amenities', Amenity)
+        self.place_repo = repository_factory(
+            'places', Place, indexes=['owner'])
+        self.review_repo = repository_factory(
+            'reviews', Review, indexes=['place'])
+
+        # Durable backends store related objects by id; resolve them
+        # once every repository has been loaded.
+        repos = self._repositories()
+        for repo in repos.values():
+            if hasattr(repo, 'link'):
+                repo.link(lambda cls_name, obj_id: repos[cls_name].get(obj_id))
+
+        # Created / updated / deleted events of every repository, for
+        # consumers syncing incrementally (GET /api/v1/changes)
+        self.changes = ChangeFeed(change_feed_size)
+        for name, repo in (('users', self.user_repo),
+                           ('amenities', self.amenity_repo),
+                           ('places', self.place_repo),
+                           ('reviews', self.review_repo)):
+            repo.attach_feed(self.changes, name)
+
+        # Guards the side indexes below, and makes a write to places or
+        # reviews atomic with the matching side index update.
+        self._lock = ReadWriteLock()
+        # Columnar copy of the numeric place attributes for range scans
+        self.place_columns = ColumnStore(('latitude', 'longitude', 'price'))
+        # Spatial grid over place coordinates for "near me" queries
+        self.place_geo = GridIndex()
+        # Running count / sum / histogram of the ratings of each place
+        self.place_ratings = RatingAggregates()
+        # Full-text index of the titles, descriptions and amenity names
+        # of the places
+        self.place_search = TextIndex(PLACE_SEARCH_WEIGHTS)
+        # Amenity id -> bitmap of the place_columns rows having it, for
+        # the faceted filters and to reindex the places of a renamed
+        # amenity
+        self.place_amenities = BitmapIndex()
+
+        # Repositories shared with other processes log the ids they
+        # write; the side indexes replay the log from these positions
+        # (see _sync()).
+        self._shared = {name for name, repo in (('places', self.place_repo),
+                                                ('reviews', self.review_repo))
+                        if getattr(repo, 'track_changes', False)}
+        self._change_cursors = {}
+        # generation of the repositories when their side indexes were
+        # built; a clear() of the repository makes _sync() rebuild them
+        self._generations = {}
+        # Place of each review, to know which aggregates a review
+        # deleted by another process belonged to
+        self._review_places = {} if 'reviews' in self._shared else None
+
+        # Side indexes built so far, by the repository feeding them
+        self._loaded = set()
+        if not lazy_indexes:
+            self._load('places')
+            self._load('reviews')
+
+    def _load(self, name):
+        """
+        Rebuild the side indexes fed by repository `name`.
+
+        Callers hold the write side of self._lock (or are __init__).
+
+        Args:
+        name (str): 'places' (columns, amenity bitmaps, grid and
+            search) or 'reviews' (ratings).
+        """
+        repo = self.place_repo if name == 'places' else self.review_repo
+        self._generations[name] = repo.generation
+        if name in self._shared:
+            # Taken before loading, so that no write is missed in between
+            self._change_cursors[name] = repo.change_cursor()
+        if name == 'places':
+            self.place_columns.clear()
+            self.place_geo.clear()
+            self.place_search.clear()
+            self.place_amenities.clear()
+            for place in self.place_repo.get_all():
+                self._index_place(place)
+        else:
+            self.place_ratings.clear()
+            if self._review_places is not None:
+                self._review_places.clear()
+            for review in self.review_repo.get_all():
+                self.place_ratings.add(review.place.id, review.rating)
+                if self._review_places is not None:
+                    self._review_places[review.id] = review.place.id
+        self._loaded.add(name)
+
+    def _sync(self, name):
+        """
+        Bring the side indexes fed by repository `name` up to date.
+
+        Builds them if they were left to the first query, or if the
+        repository was cleared since, then, if the repository is shared
+        with other processes, replays the writes of those. Changed
+        objects are re-read from the repository, so replaying a write
+        of this process is harmless. Callers must not hold self._lock.
+
+        Args:
+        name (str): 'places' or 'reviews'.
+        """
+        repo = self.place_repo if name == 'places' else self.review_repo
+        if (name not in self._loaded
+                or repo.generation != self._generations[name]):
+            with self._lock.write():
+                if (name not in self._loaded
+                        or repo.generation != self._generations[name]):
+                    self._load(name)
+            return
+        if name not in self._shared:
+            return
+        changes = repo.changes_since(self._change_cursors[name])
+        if changes is not None and not changes[1]:
+            return
+        with self._lock.write():
+            if changes is None:
+                self._load(name)
+                return
+            seq, ids = changes
+            if name == 'places':
+                self._replay_places(ids)
+            else:
+                self._replay_reviews(ids)
+            self._change_cursors[name] = max(seq, self._change_cursors[name])
+
+    def _replay_places(self, place_ids):
+        for place_id in place_ids:
+            place = self.place_repo.get(place_id)
+            if place is None:
+                self._unindex_place(place_id)
+            else:
+                self._index_place(place)
+
+    def _replay_reviews(self, review_ids):
+        place_ids = set()
+        for review_id in review_ids:
+            old_place_id = self._review_places.pop(review_id, None)
+            if old_place_id is not None:
+                place_ids.add(old_place_id)
+            review = self.review_repo.get(review_id)
+            if review is not None:
+                self._review_places[review.id] = review.place.id
+                place_ids.add(review.place.id)
+        for place_id in place_ids:
+            reviews = self.review_repo.get_all_by_attribute('place', place_id)
+            self.place_ratings.reset(
+                place_id, [review.rating for review in reviews])
+
+    def _index_place(self, place):
+        """
+        Add or refresh `place` in the facade's place side indexes.
+
+        Callers hold the write side of self._lock.
+        """
+        self.place_columns.add(place)
+        self.place_amenities.set(self.place_columns.rows[place.id],
+                                 place.amenity_ids)
+        self.place_geo.add(place.id, place.latitude, place.longitude)
+        self._index_text(place)
+
+    def _index_text(self, place):
+        """Add or refresh the search document of `place`."""
+        self.place_search.add(place.id, {
+            'title': place.title,
+            'description': place.description,
+            'amenities': ' '.join(amenity.name
+                                  for amenity in place.amenities),
+        })
+
+    def _unindex_place(self, place_id):
+        """Remove a deleted place from the place side indexes."""
+        rows = self.place_columns.remove(place_id)
+        if rows is not None:
+            # The last row was moved into the hole, take its bits along
+            row, moved = rows
+            self.place_amenities.discard(row)
+            if moved is not None:
+                self.place_amenities.move(moved, row)
+        self.place_geo.remove(place_id)
+        self.place_search.remove(place_id)
+
+    def _repositories(self):
+        """Map model class names to the repository storing them."""
+        return {
+            'User': self.user_repo,
+            'Amenity': self.amenity_repo,
+            'Place': self.place_repo,
+            'Review': self.review_repo,
+        }
+
+    @property
+    def blocking(self):
+        """True when one of the repositories waits on I/O."""
+        return any(repo.blocking for repo in self._repositories().values())
+
+    def collection_version(self, class_name):
+        """
+        Return the write counter of the repository storing `class_name`.
+
+        Args:
+        class_name (str): Model class name, e.g. 'User' or 'Place'.
+
+        Returns:
+        int: Value that changes whenever the collection changes.
+        """
+        return self._repositories()[class_name].version
+
+    def get_changes(self, since, limit=None, collections=None, timeout=0):
+        """
+        Return the writes made after change `since`.
+
+        Reads the change feed, so only the events after `since` are
+        visited, never the collections themselves.
+
+        Args:
+        since (int): Sequence number of the last event already seen.
+        limit (int): Maximum number of events read from the feed.
+        collections (set): Only return the events of these
+            collections ('users', 'places', ...); None for all.
+        timeout (float): Seconds to wait for a matching event when
+            there is none yet (long polling); 0 returns at once.
+
+        Returns:
+        tuple: (list of ChangeEvent, sequence number to pass as
+        `since` next time), or None if events after `since` were
+        already dropped from the feed: the caller must reload the
+        collections.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            events = self.changes.since(since, limit)
+            if events is None:
+                return None
+            if events:
+                since = events[-1].seq
+                if collections is not None:
+                    events = [event for event in events
+                              if event.collection in collections]
+                if events:
+                    return events, since
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.changes.wait(since, remaining):
+                return [], since
 
     def create_user(self, user_data):
         """
@@ -31,6 +305,48 @@ class HBnBFacade:
         self.user_repo.add(user)
         return user
 
+    def create_users(self, users_data):
+        """
+        Creates several users in one pass.
+
+        Every item is validated independently, including email
+        uniqueness against stored users and earlier items of the batch.
+        The valid users are stored with a single add_many() call.
+
+        Args:
+        users_data (list): List of user dictionaries.
+
+        Returns:
+        list: One (user, None) or (None, error message) tuple per item.
+        """
+        results = []
+        emails = set()
+        for user_data in users_data:
+            try:
+                if not isinstance(user_data, dict):
+                    raise ValueError("Invalid user data")
+                user = User(**user_data)
+                if user.email in emails or self.get_user_by_email(user.email):
+                    raise ValueError("Email already registered")
+                emails.add(user.email)
+                results.append((user, None))
+            except (ValueError, TypeError) as error:
+                results.append((None, str(error)))
+        try:
+            self.user_repo.add_many(
+                [user for user, error in results if user is not None])
+        except ValueError:
+            # Another thread registered one of the emails since the
+            # check above: store the users one by one to isolate it.
+            for index, (user, error) in enumerate(results):
+                if user is None:
+                    continue
+                try:
+                    self.user_repo.add(user)
+                except ValueError as add_error:
+                    results[index] = (None, str(add_error))
+        return results
+
     def get_user(self, user_id):
         """
         Retrieves a user by their ID.
@@ -52,6 +368,35 @@ class HBnBFacade:
         """
         return self.user_repo.get_all()
 
+    def get_users_page(self, limit, cursor=None):
+        """
+        Retrieves one page of users ordered by creation time.
+
+        Args:
+        limit (int): Maximum number of users to return.
+        cursor (str, optional): Cursor returned by the previous page.
+
+        Raises:
+        ValueError: If the cursor is invalid.
+
+        Returns:
+        tuple: List of user objects and the cursor of the next page
+        (None on the last page).
+        """
+        return self.user_repo.get_page(limit, cursor)
+
+    def iter_users(self, batch_size=500):
+        """
+        Iterates over all users in batches, oldest first.
+
+        Args:
+        batch_size (int): Number of users per batch.
+
+        Returns:
+        iterator: Lists of user objects, fetched lazily.
+        """
+        return self.user_repo.iter_pages(batch_size)
+
     def update_user(self, user_id, user_data):
         """
         Updates the information for an existing user.
@@ -62,12 +407,12 @@ class HBnBFacade:
 
         Returns:
         User: The updated user object, or None if the user does not exist.
+
+        Raises:
+        ValueError: If the new email already belongs to another user.
         """
-        user = self.get_user(user_id)
-        if not user:
-            return None
-        self.user_repo.update(user_id, user_data)
-        return self.get_user(user_id)
+        record = self.user_repo.update(user_id, user_data)
+        return record.obj if record is not None else None
 
     def get_user_by_email(self, email):
         """
@@ -94,6 +439,33 @@ class HBnBFacade:
         Returns:
         Place: The created place object.
         """
+        place = self._build_place(
+            place_data, self.get_user, self.amenity_repo.get_many)
+        with self._lock.write():
+            self.place_repo.add(place)
+            if 'places' in self._loaded:
+                self._index_place(place)
+        return place
+
+    def _build_place(self, place_data, get_owner, get_amenities):
+        """
+        Validates place data and builds a Place without storing it.
+
+        Args:
+        place_data (dict): Dictionary containing the place information.
+        get_owner (callable): Returns the User for an id, or None.
+        get_amenities (callable): Returns {id: Amenity} for a list of
+            ids, leaving out the missing ones (Repository.get_many).
+
+        Raises:
+        ValueError: If a required field is missing or invalid, or if
+            amenities are not found (all missing ids are listed).
+
+        Returns:
+        Place: The new place object.
+        """
+        if not isinstance(place_data, dict):
+            raise ValueError("Invalid place data")
         try:
             owner_id = place_data["owner_id"]
             title = place_data["title"]
@@ -105,7 +477,7 @@ class HBnBFacade:
         except KeyError as e:
             raise ValueError(f"Missing field: {str(e)}")
 
-        owner = self.get_user(owner_id)
+        owner = get_owner(owner_id)
         if not owner:
             raise ValueError("Owner not found")
 
@@ -118,15 +490,69 @@ class HBnBFacade:
             owner
         )
 
+        amenities = get_amenities(amenities_ids) if amenities_ids else {}
+        missing = [amenity_id for amenity_id in dict.fromkeys(amenities_ids)
+                   if amenity_id not in amenities]
+        if missing:
+            raise ValueError(
+                f"Amenity not found: {', '.join(map(str, missing))}")
         for amenity_id in amenities_ids:
-            amenity = self.amenity_repo.get(amenity_id)
-            if not amenity:
-                raise ValueError("Amenity not found")
-            place.add_amenity(amenity)
+            place.add_amenity(amenities[amenity_id])
 
-        self.place_repo.add(place)
         return place
 
+    def create_places(self, places_data):
+        """
+        Creates several places in one pass.
+
+        Every item is validated independently; owners are looked up
+        once per distinct id, the amenities of every item with a single
+        get_many() call, and the valid places are stored with a single
+        add_many() call.
+
+        Args:
+        places_data (list): List of place dictionaries.
+
+        Returns:
+        list: One (place, None) or (None, error message) tuple per item.
+        """
+        owners = {}
+
+        def get_owner(owner_id):
+            if owner_id not in owners:
+                owners[owner_id] = self.get_user(owner_id)
+            return owners[owner_id]
+
+        amenity_ids = set()
+        for place_data in places_data:
+            if isinstance(place_data, dict):
+                ids = place_data.get("amenities")
+                if isinstance(ids, list):
+                    amenity_ids.update(
+                        amenity_id for amenity_id in ids
+                        if isinstance(amenity_id, str))
+        amenities = self.amenity_repo.get_many(amenity_ids)
+
+        def get_amenities(ids):
+            return {amenity_id: amenities[amenity_id] for amenity_id in ids
+                    if isinstance(amenity_id, str) and amenity_id in amenities}
+
+        results = []
+        for place_data in places_data:
+            try:
+                results.append(
+                    (self._build_place(place_data, get_owner, get_amenities),
+                     None))
+            except (ValueError, TypeError) as error:
+                results.append((None, str(error)))
+        places = [place for place, error in results if place is not None]
+        with self._lock.write():
+            self.place_repo.add_many(places)
+            if 'places' in self._loaded:
+                for place in places:
+                    self._index_place(place)
+        return results
+
     def get_place(self, place_id):
         """
             Retrieves a place by its identifier.
@@ -148,6 +574,171 @@ class HBnBFacade:
         """
         return self.place_repo.get_all()
 
+    def get_places_page(self, limit, cursor=None):
+        """
+        Retrieves one page of places ordered by creation time.
+
+        Args:
+        limit (int): Maximum number of places to return.
+        cursor (str, optional): Cursor returned by the previous page.
+
+        Raises:
+        ValueError: If the cursor is invalid.
+
+        Returns:
+        tuple: List of place objects and the cursor of the next page
+        (None on the last page).
+        """
+        return self.place_repo.get_page(limit, cursor)
+
+    def iter_places(self, batch_size=500):
+        """
+        Iterates over all places in batches, oldest first.
+
+        Args:
+        batch_size (int): Number of places per batch.
+
+        Returns:
+        iterator: Lists of place objects, fetched lazily.
+        """
+        return self.place_repo.iter_pages(batch_size)
+
+    def get_places_in_range(self, min_price=None, max_price=None,
+                            min_latitude=None, max_latitude=None,
+                            min_longitude=None, max_longitude=None):
+        """
+        Retrieves the places matching price and bounding-box ranges.
+
+        The predicates run as a scan over the place columns instead of
+        a loop over every Place object. All bounds are optional and
+        inclusive.
+
+        Returns:
+        list: Matching place objects.
+        """
+        self._sync('places')
+        with self._lock.read():
+            ids = self.place_columns.range_query(
+                price=(min_price, max_price),
+                latitude=(min_latitude, max_latitude),
+                longitude=(min_longitude, max_longitude)
+            )
+        places = (self.place_repo.get(place_id) for place_id in ids)
+        return [place for place in places if place is not None]
+
+    def get_places_near(self, latitude, longitude, radius_km, limit):
+        """
+        Retrieves the places nearest to a point.
+
+        Only the grid cells overlapping the search circle are visited.
+
+        Args:
+        latitude (float): Latitude of the center (-90 to 90).
+        longitude (float): Longitude of the center (-180 to 180).
+        radius_km (float): Search radius in kilometers, > 0.
+        limit (int): Maximum number of places, > 0.
+
+        Raises:
+        ValueError: If a parameter is out of bounds.
+
+        Returns:
+        list: (place, distance in km) tuples, nearest first.
+        """
+        if latitude < -90 or latitude > 90:
+            raise ValueError("Latitude must be between -90 and 90")
+        if longitude < -180 or longitude > 180:
+            raise ValueError("Longitude must be between -180 and 180")
+        if radius_km <= 0:
+            raise ValueError("radius_km must be greater than 0")
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+
+        self._sync('places')
+        with self._lock.read():
+            nearest = self.place_geo.nearest(
+                latitude, longitude, radius_km, limit)
+        results = []
+        for distance, place_id in nearest:
+            place = self.place_repo.get(place_id)
+            if place is not None:
+                results.append((place, distance))
+        return results
+
+    def search_places(self, query, limit=10):
+        """
+        Full-text search of the places.
+
+        Matches the title, the description and the amenity names of
+        the places containing every word of `query`, the last word
+        also as a prefix (autocomplete). Only the posting lists of the
+        query words are read, never every place.
+
+        Args:
+        query (str): Words to search.
+        limit (int): Maximum number of places, > 0.
+
+        Raises:
+        ValueError: If the limit is not positive.
+
+        Returns:
+        list: (place, BM25 score) tuples, best first.
+        """
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        self._sync('places')
+        with self._lock.read():
+            hits = self.place_search.search(query, limit)
+        places = self.place_repo.get_many([place_id for _, place_id in hits])
+        return [(places[place_id], score) for score, place_id in hits
+                if place_id in places]
+
+    def filter_places(self, amenity_ids=(), min_price=None, max_price=None,
+                      limit=100, offset=0):
+        """
+        Faceted filter of the places by amenities and price.
+
+        The price range scan of the place columns returns a bitmap of
+        rows, which is intersected with the bitmap of every requested
+        amenity: "wifi AND pool AND 50 to 150" is a few `&` over
+        integers, whatever the number of places. The facet counts are
+        the population counts of each amenity bitmap within the
+        matches.
+
+        Args:
+        amenity_ids (iterable): IDs of the amenities a place must all
+            have.
+        min_price (float, optional): Inclusive lower bound of the price.
+        max_price (float, optional): Inclusive upper bound of the price.
+        limit (int): Maximum number of places returned, > 0.
+        offset (int): Number of matches to skip, >= 0.
+
+        Raises:
+        ValueError: If the limit or the offset is out of bounds.
+
+        Returns:
+        tuple: The matching places in index order (not a stable
+        order: a deletion moves the last place into the freed row),
+        the number of matches, and a dict amenity id -> number of
+        matches having it.
+        """
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        if offset < 0:
+            raise ValueError("offset must be a non-negative integer")
+        self._sync('places')
+        with self._lock.read():
+            bitmap = self.place_columns.range_bitmap(
+                price=(min_price, max_price))
+            bitmap = self.place_amenities.intersect(amenity_ids, bitmap)
+            count = popcount(bitmap)
+            facets = self.place_amenities.counts(bitmap)
+            ids = self.place_columns.ids
+            place_ids = [ids[row] for row in
+                         islice(iter_rows(bitmap), offset, offset + limit)]
+        places = self.place_repo.get_many(place_ids)
+        return ([places[place_id] for place_id in place_ids
+                 if place_id in places], count, facets)
+
     def update_place(self, place_id, place_data):
         """
         Updates an existing place with validation of modified fields.
@@ -156,6 +747,11 @@ class HBnBFacade:
         place_id (str): ID of the place to be updated.
         place_data (dict): Dictionary containing the fields to be updated.
 
+        The data is validated before the place is looked up, and the
+        place is read once, by the repository update. The side indexes
+        are only refreshed when the location, the price or the text
+        changed.
+
         Raises:
         ValueError: If a value is invalid (price <= 0, 
         latitude/longitude out of bounds, invalid title).
@@ -163,12 +759,10 @@ class HBnBFacade:
         Returns:
         Place: The updated place object or None if the place does not exist.
         """
-        place = self.get_place(place_id)
-        if not place:
-            return None
-
-        place_data.pop("owner_id", None)
-        place_data.pop("amenities", None)
+        # Relations are not updated here; a PUT echoing a GET body
+        # carries them as nested dicts
+        for key in ("owner_id", "owner", "amenities", "reviews"):
+            place_data.pop(key, None)
 
         if "price" in place_data and place_data["price"] <= 0:
             raise ValueError("Price must be greater than 0")
@@ -185,8 +779,79 @@ class HBnBFacade:
             if not place_data["title"] or len(place_data["title"]) > 100:
                 raise ValueError("Invalid title")
 
-        self.place_repo.update(place_id, place_data)
-        return self.get_place(place_id)
+        with self._lock.write():
+            record = self.place_repo.update(place_id, place_data)
+            if record is None:
+                return None
+            if 'places' in self._loaded:
+                if record.touches(*self.place_columns.columns):
+                    self._index_place(record.obj)
+                elif record.touches(*PLACE_SEARCH_FIELDS):
+                    self._index_text(record.obj)
+        return record.obj
+
+    def add_place_amenity(self, place_id, amenity_id):
+        """
+        Add an amenity to a place and refresh its amenity bitmaps.
+
+        Args:
+        place_id (str): ID of the place.
+        amenity_id (str): ID of the amenity to add.
+
+        Raises:
+        ValueError: If the amenity does not exist.
+
+        Returns:
+        Place: The updated place, unchanged if it already had the
+        amenity, or None if the place does not exist.
+        """
+        amenity = self.amenity_repo.get(amenity_id)
+        if amenity is None:
+            raise ValueError("Amenity not found")
+
+        with self._lock.write():
+            place = self.place_repo.get(place_id)
+            if place is None:
+                return None
+            if amenity_id in place.amenity_ids:
+                return place
+            # A new list rather than place.add_amenity(), so that the
+            # repository sees and persists the change
+            record = self.place_repo.update(
+                place_id, {'amenities': [*place.amenities, amenity]})
+            if record is None:
+                return None
+            if 'places' in self._loaded:
+                self._index_place(record.obj)
+        return record.obj
+
+    def delete_place(self, place_id):
+        """
+        Delete a place and its reviews.
+
+        Args:
+        place_id (str): ID of the place.
+
+        Returns:
+        bool: True if the place was deleted, False if it does not
+        exist.
+        """
+        with self._lock.write():
+            place = self.place_repo.get(place_id)
+            if place is None:
+                return False
+            reviews = self.review_repo.get_all_by_attribute('place', place)
+            for review in reviews:
+                self.review_repo.delete(review.id)
+            self.place_repo.delete(place_id)
+            if 'places' in self._loaded:
+                self._unindex_place(place_id)
+            if 'reviews' in self._loaded:
+                self.place_ratings.reset(place_id, [])
+                if self._review_places is not None:
+                    for review in reviews:
+                        self._review_places.pop(review.id, None)
+        return True
 
     def create_amenity(self, amenity_data):
         """
@@ -211,51 +876,84 @@ class HBnBFacade:
             raise ValueError("Amenity name is required")
             
         amenity = Amenity(**amenity_data)
-        self.amenities[amenity.id] = amenity
+        self.amenity_repo.add(amenity)
         return amenity
 
+    def create_amenities(self, amenities_data):
+        """
+        Creates several amenities in one pass.
+
+        Args:
+        amenities_data (list): List of amenity dictionaries.
+
+        Returns:
+        list: One (amenity, None) or (None, error message) tuple per item.
+        """
+        results = []
+        for amenity_data in amenities_data:
+            try:
+                if not isinstance(amenity_data, dict):
+                    raise ValueError("Invalid amenity data")
+                results.append((Amenity(**amenity_data), None))
+            except (ValueError, TypeError) as error:
+                results.append((None, str(error)))
+        self.amenity_repo.add_many(
+            [amenity for amenity, error in results if amenity is not None])
+        return results
+
     def get_amenity(self, amenity_id):
 
         """
         Retrieves a commodity from its identifier.
 
-        Verifies that the identifier is valid and exists in
-        memory storage before returning the corresponding object.
+        Args:
+        amenity_id (str): Amenity ID.
+
+        Returns:
+        Amenity: The corresponding amenity or None if not found.
         """
 
-        if not amenity_id or not isinstance(amenity_id, int):
-            raise ValueError("Invalid amenity id")
-        if amenity_id not in self.amenities:
-            raise ValueError("Amenity not found")
-        return self.amenities[amenity_id]
+        return self.amenity_repo.get(amenity_id)
 
     def get_all_amenities(self):
         """
-        Retrieves all amenities stored in the database.
+        Retrieves all amenities stored in the repository.
 
-        Performs a query to return all
-        Amenity objects present in the database.
+        Returns:
+        list: List of all amenity objects.
         """
-        return Amenity.query.all()
+        return self.amenity_repo.get_all()
 
     def update_amenity(self, amenity_id, amenity_data):
         """
         Updates an existing convenience.
 
-        Searches for the convenience by its identifier, updates its
-        attributes with the provided data, then saves the
-        changes to the database.
-        """
-        amenity = Amenity.query.get(amenity_id)
-    
-        if not amenity:
-            raise ValueError("Amenity not found")
+        Searches for the convenience by its identifier and updates its
+        attributes with the provided data.
 
-        for key, value in amenity_data.items():
-            setattr(amenity, key, value)
+        Raises:
+        ValueError: If the name is invalid.
 
-        db.session.commit()
-        return amenity
+        Returns:
+        Amenity: The updated amenity or None if it does not exist.
+        """
+        if "name" in amenity_data:
+            name = amenity_data["name"]
+            if not name or len(name) > 50:
+                raise ValueError("Invalid amenity name")
+
+        with self._lock.write():
+            record = self.amenity_repo.update(amenity_id, amenity_data)
+            if record is None:
+                return None
+            if 'places' in self._loaded and record.touches('name'):
+                # The name is part of the search documents of the places
+                ids = self.place_columns.ids
+                place_ids = [ids[row] for row in iter_rows(
+                    self.place_amenities.bitmap(amenity_id))]
+                for place in self.place_repo.get_many(place_ids).values():
+                    self._index_text(place)
+        return record.obj
 
     def create_review(self, review_data):
         """
@@ -263,7 +961,8 @@ class HBnBFacade:
 
         This method validates the data provided, verifies
         the existence of the associated user and location,
-        then creates and saves a new review.
+        then creates and saves a new review and adds its rating
+        to the aggregates of the place.
 
         Args:
         review_data (dict): Review data containing
@@ -285,28 +984,29 @@ class HBnBFacade:
             if field not in review_data:
                 raise ValueError(f"{field} is required")
 
-        if not review_data["text"].strip():
+        if not isinstance(review_data["text"], str) \
+                or not review_data["text"].strip():
             raise ValueError("Review text cannot be empty")
 
         rating = review_data["rating"]
         if not isinstance(rating, int) or rating < 1 or rating > 5:
             raise ValueError("Rating must be an integer between 1 and 5")
 
-        user_id = review_data["user_id"]
-        if user_id not in self.users:
+        user = self.user_repo.get(review_data["user_id"])
+        if not user:
             raise ValueError("User not found")
 
-        place_id = review_data["place_id"]
-        if place_id not in self.places:
+        place = self.place_repo.get(review_data["place_id"])
+        if not place:
             raise ValueError("Place not found")
 
-        review = Review(**review_data)
-
-        self.reviews[review.id] = review
-
-        place = self.places[place_id]
-        place.reviews.append(review)
-
+        review = Review(review_data["text"], rating, place, user)
+        with self._lock.write():
+            self.review_repo.add(review)
+            if 'reviews' in self._loaded:
+                self.place_ratings.add(place.id, review.rating)
+                if self._review_places is not None:
+                    self._review_places[review.id] = place.id
         return review
 
     def get_review(self, review_id):
@@ -314,20 +1014,13 @@ class HBnBFacade:
         Retrieve a review by its ID.
 
         Args:
-        review_id (int): Unique ID of the review.
+        review_id (str): Unique ID of the review.
 
         Returns:
-        Review: Instance corresponding to the ID provided.
-
-        Raises:
-        ValueError: If the ID is invalid or if the
-        review does not exist.
+        Review: Instance corresponding to the ID provided,
+        or None if not found.
         """
-        if not review_id or not isinstance(review_id, int):
-            raise ValueError("Invalid review id")
-        if review_id not in self.reviews:
-            raise ValueError("Review not found")
-        return self.reviews[review_id]
+        return self.review_repo.get(review_id)
 
     def get_all_reviews(self):
         """
@@ -336,63 +1029,81 @@ class HBnBFacade:
         Returns:
         list: List of all Review instances.
         """
-        return Review.query.all()
+        return self.review_repo.get_all()
 
     def get_reviews_by_place(self, place_id):
         """
         Retrieve all reviews associated with a given location.
 
+        Served by the review repository's index on `place`, so the
+        cost depends on the number of reviews of the place only.
+
         Args:
         place_id (str): Unique identifier for the location.
 
         Returns:
-        list: List of reviews associated with the location.
+        list: Reviews of the location, oldest first.
 
         Raises:
-        ValueError: If the location identifier is invalid
-        or if the location does not exist.
+        ValueError: If the location does not exist.
         """
-        if not place_id or not isinstance(place_id, str):
-            raise ValueError("Invalid place id")
-        if place_id not in self.places:
+        place = self.place_repo.get(place_id)
+        if not place:
             raise ValueError("Place not found")
-        filter_review = []
-        for review in self.reviews.values():
-            if review.place_id == place_id:
-                filet_review.append(review)
-        return filter_review
+        reviews = self.review_repo.get_all_by_attribute('place', place)
+        return sorted(reviews, key=lambda review: review.sort_key)
+
+    def get_place_rating(self, place_id):
+        """
+        Retrieve the precomputed rating summary of a place.
+
+        Args:
+        place_id (str): Unique identifier for the location.
+
+        Returns:
+        dict: count, sum, average and histogram of the ratings.
+        """
+        self._sync('reviews')
+        with self._lock.read():
+            return self.place_ratings.summary(place_id)
 
     def update_review(self, review_id, review_data):
         """
         Update an existing review.
 
-        This method updates only the authorized fields
-        of a review, then saves the changes to the database.
-    
+        Only the text and the rating can be modified; a rating
+        change is carried over to the aggregates of the place.
 
         Args:
-        review_id (int): Unique identifier of the review.
+        review_id (str): Unique identifier of the review.
         review_data (dict): Data to be modified.
 
         Returns:
-        Review: Updated instance.
+        Review: Updated instance, or None if the review does not exist.
 
         Raises:
-        ValueError: If the review does not exist.
+        ValueError: If the new text or rating is invalid.
         """
-        review = Review.query.get(review_id)
-    
-        if not review:
-            raise ValueError("Review not found")
-
-        allowed_modif = ['text']
+        allowed_modif = ['text', 'rating']
+        changes = {key: value for key, value in review_data.items()
+                   if key in allowed_modif}
 
-        for key, value in review_data.items():
-            if key in allowed_modif:
-                setattr(review, key, value)
-            
-        review.updated_at = datetime.utcnow()
-        db.session.commit()
+        if "text" in changes and (not isinstance(changes["text"], str)
+                                  or not changes["text"].strip()):
+            raise ValueError("Review text cannot be empty")
+        if "rating" in changes:
+            rating = changes["rating"]
+            if not isinstance(rating, int) or rating < 1 or rating > 5:
+                raise ValueError("Rating must be an integer between 1 and 5")
+
+        with self._lock.write():
+            record = self.review_repo.update(review_id, changes)
+            if record is None:
+                return None
+            review = record.obj
+            if 'reviews' in self._loaded and record.touches('rating'):
+                self.place_ratings.change(
+                    review.place.id, record.previous['rating'], review.rating)
         return review
 
     def delete_review(self, review_id):
@@ -400,19 +1111,19 @@ class HBnBFacade:
         Delete an existing review.
 
         Args:
-        review_id (int): Unique identifier of the review.
+        review_id (str): Unique identifier of the review.
 
         Returns:
-        bool: True if the deletion is successful.
-
-        Raises:
-        ValueError: If the review does not exist.
+        bool: True if the deletion is successful, False if the
+        review does not exist.
         """
-        review = Review.query.get(review_id)
-        if not review:
-            raise ValueError("Review not found")
-            
-        db.session.delete(review)
-        db.session.commit()
-
+        with self._lock.write():
+            review = self.review_repo.get(review_id)
+            if not review:
+                return False
+            self.review_repo.delete(review_id)
+            if 'reviews' in self._loaded:
+                self.place_ratings.remove(review.place.id, review.rating)
+                if self._review_places is not None:
+                    self._review_places.pop(review_id, None)
         return True
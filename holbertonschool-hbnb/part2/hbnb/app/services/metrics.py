@@ -0,0 +1,247 @@
+"""
+Request and span metrics.
+
+Metrics keeps latency histograms with fixed buckets, in the
+Prometheus model:
+
+    - one per (method, endpoint) for the requests, with a counter per
+      status code;
+    - one per span: a named part of a request, such as a facade call
+      ("facade.get_place") or a repository operation
+      ("repository.places.get").
+
+instrument() wraps the public methods of an object (the facade, a
+repository) so that each call is timed as a span. Nested calls are
+timed each, so a facade span includes the repository spans it made.
+
+render() writes everything in the Prometheus text format, with the
+p50 / p95 / p99 of each request histogram estimated from its buckets.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """
+    Counts of observations per bucket, with their sum.
+
+    Args:
+        buckets (tuple): Increasing upper bounds; a last +Inf bucket
+            is added.
+    """
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """
+        Estimate the q-quantile, interpolating inside its bucket.
+
+        Args:
+            q (float): Between 0 and 1.
+
+        Returns:
+            float: The estimate, or None without observations. Values
+            in the +Inf bucket are reported as the largest bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+def _labels(**labels):
+    text = ','.join(f'{name}="{_escape(value)}"'
+                    for name, value in labels.items())
+    return '{' + text + '}'
+
+
+def _escape(value):
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+class Metrics:
+    """
+    Thread-safe registry of the request and span histograms.
+
+    Args:
+        buckets (tuple): Latency bucket bounds, in seconds.
+    """
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._statuses = {}
+        self._spans = {}
+
+    def observe_request(self, method, endpoint, status, seconds):
+        """Record one request to `endpoint` (its URL rule)."""
+        with self._lock:
+            histogram = self._requests.get((method, endpoint))
+            if histogram is None:
+                histogram = self._requests[(method, endpoint)] = Histogram(
+                    self.buckets)
+            histogram.observe(seconds)
+            key = (method, endpoint, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+
+    def observe_span(self, name, seconds):
+        """Record one span."""
+        with self._lock:
+            histogram = self._spans.get(name)
+            if histogram is None:
+                histogram = self._spans[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, name):
+        """Time the body of a `with` block as span `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_span(name, time.perf_counter() - start)
+
+    def timed(self, name, function):
+        """Return `function` wrapped to be timed as span `name`."""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.observe_span(name, time.perf_counter() - start)
+        wrapper.__metrics_span__ = name
+        return wrapper
+
+    def instrument(self, obj, prefix):
+        """
+        Time every public method call of `obj` as a span.
+
+        The bound methods are replaced on the instance by timed
+        wrappers named `<prefix>.<method>`. Instrumenting an object
+        twice has no further effect.
+
+        Args:
+            obj: Object whose public methods are timed.
+            prefix (str): Span name prefix, e.g. 'facade'.
+        """
+        for name, member in inspect.getmembers(type(obj)):
+            if name.startswith('_') or not inspect.isfunction(member):
+                continue
+            method = getattr(obj, name)
+            if hasattr(method, '__metrics_span__'):
+                continue
+            setattr(obj, name, self.timed(f'{prefix}.{name}', method))
+
+    def request_quantiles(self, method, endpoint):
+        """Return {quantile: seconds} estimated for one endpoint."""
+        with self._lock:
+            histogram = self._requests.get((method, endpoint))
+            if histogram is None:
+                return {}
+            return {q: histogram.quantile(q) for q in QUANTILES}
+
+    def reset(self):
+        """Forget every observation."""
+        with self._lock:
+            self._requests.clear()
+            self._statuses.clear()
+            self._spans.clear()
+
+    def _histogram_lines(self, name, labels, histogram):
+        cumulative = 0
+        bounds = [repr(float(bound)) for bound in histogram.buckets]
+        for bound, count in zip(bounds + ['+Inf'], histogram.counts):
+            cumulative += count
+            yield f'{name}_bucket{_labels(**labels, le=bound)} {cumulative}'
+        yield f'{name}_sum{_labels(**labels)} {histogram.sum!r}'
+        yield f'{name}_count{_labels(**labels)} {histogram.count}'
+
+    def render(self, gauges=None):
+        """
+        Return every metric in the Prometheus text exposition format.
+
+        Args:
+            gauges (dict): Extra {name: value} gauges, e.g. the
+                counters of the response cache.
+
+        Returns:
+            str: The text served on /metrics.
+        """
+        with self._lock:
+            lines = [
+                '# HELP hbnb_requests_total Requests by endpoint and status.',
+                '# TYPE hbnb_requests_total counter',
+            ]
+            for (method, endpoint, status), count in sorted(
+                    self._statuses.items()):
+                labels = _labels(method=method, endpoint=endpoint,
+                                 status=status)
+                lines.append(f'hbnb_requests_total{labels} {count}')
+
+            lines += [
+                '# HELP hbnb_request_duration_seconds Request latency.',
+                '# TYPE hbnb_request_duration_seconds histogram',
+            ]
+            for (method, endpoint), histogram in sorted(
+                    self._requests.items()):
+                lines.extend(self._histogram_lines(
+                    'hbnb_request_duration_seconds',
+                    {'method': method, 'endpoint': endpoint}, histogram))
+
+            lines += [
+                '# HELP hbnb_request_latency_quantile_seconds Request '
+                'latency quantiles estimated from the histogram buckets.',
+                '# TYPE hbnb_request_latency_quantile_seconds gauge',
+            ]
+            for (method, endpoint), histogram in sorted(
+                    self._requests.items()):
+                for q in QUANTILES:
+                    labels = _labels(method=method, endpoint=endpoint,
+                                     quantile=q)
+                    lines.append(f'hbnb_request_latency_quantile_seconds'
+                                 f'{labels} {histogram.quantile(q)!r}')
+
+            lines += [
+                '# HELP hbnb_span_duration_seconds Time spent in facade '
+                'and repository calls.',
+                '# TYPE hbnb_span_duration_seconds histogram',
+            ]
+            for span, histogram in sorted(self._spans.items()):
+                lines.extend(self._histogram_lines(
+                    'hbnb_span_duration_seconds', {'span': span}, histogram))
+
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,212 @@
+#!/usr/bin/python3
+"""
+Slow client load test: threaded WSGI servers against the ASGI app.
+
+CLIENTS concurrent clients each send REQUESTS requests, pausing
+THINK_SECONDS between two requests as a browser or a mobile app does.
+Clients are slow: each request is sent in two halves SLOW_SECONDS
+apart. Connections are kept alive when the server allows it.
+Servers:
+
+    - werkzeug: the threaded development server of run.py, one new
+      thread per connection;
+    - wsgi-pool: the same server with a pool of POOL_THREADS threads,
+      the model of production threaded servers;
+    - asgi: run_asgi.py, uvicorn in front of app.asgi.
+
+A threaded server holds a thread while it waits for the rest of a
+request; the event loop of the ASGI server only holds a suspended
+coroutine. The throughput and the latencies (from the first byte of
+a request to the end of its response) are printed.
+
+The servers run in a child process with in-memory storage seeded
+with SEED_PLACES places. uvicorn is required
+(pip install -r requirements-asgi.txt).
+
+Usage:
+    python3 -m benchmarks.bench_asgi [CLIENTS]
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HOST = '127.0.0.1'
+PORT = 5077
+REQUESTS = 3
+THINK_SECONDS = 0.2
+SLOW_SECONDS = 0.05
+POOL_THREADS = 32
+SEED_PLACES = 1_000
+SERVERS = ('werkzeug', 'wsgi-pool', 'asgi')
+PATH = '/api/v1/places/?limit=20'
+TIMEOUT = 120
+
+
+def seed():
+    from app.services import facade
+
+    owner = facade.create_user({"first_name": "John", "last_name": "Doe",
+                                "email": "owner@example.com"})
+    facade.create_places([{
+        "title": f"Place {i}", "price": 100, "latitude": 45.0,
+        "longitude": 3.0, "owner_id": owner.id
+    } for i in range(SEED_PLACES)])
+
+
+def serve(kind):
+    """Run server `kind` in this process until it is killed."""
+    seed()
+    if kind == 'asgi':
+        import uvicorn
+        from app.asgi import create_asgi_app
+
+        uvicorn.run(create_asgi_app(), host=HOST, port=PORT,
+                    log_level='error', backlog=2048)
+        return
+
+    from werkzeug.serving import BaseWSGIServer, ThreadedWSGIServer
+    from app import create_app
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app = create_app()
+
+    class PooledWSGIServer(BaseWSGIServer):
+        # Threaded: HTTP/1.1 with keep-alive, as ThreadedWSGIServer
+        multithread = True
+        request_queue_size = 2048
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = ThreadPoolExecutor(POOL_THREADS)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self.process_request_thread,
+                             request, client_address)
+
+        def process_request_thread(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    server_class = (ThreadedWSGIServer if kind == 'werkzeug'
+                    else PooledWSGIServer)
+    server_class.request_queue_size = 2048
+    server_class(HOST, PORT, app).serve_forever()
+
+
+def start_server(kind):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.bench_asgi', '--serve', kind],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, PORT), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+async def read_response(reader):
+    """Read one response; return True if the server keeps the connection."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    if not head.startswith(b'HTTP/1.1 200'):
+        raise RuntimeError(head[:80])
+    length = 0
+    keep_alive = True
+    for line in head.split(b'\r\n'):
+        name, _, value = line.partition(b':')
+        name = name.lower()
+        if name == b'content-length':
+            length = int(value)
+        elif name == b'connection' and value.strip().lower() == b'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return keep_alive
+
+
+async def client():
+    """Run one slow client; return its request latencies."""
+    request = (f'GET {PATH} HTTP/1.1\r\nHost: {HOST}\r\n\r\n').encode()
+    half = len(request) // 2
+    latencies = []
+    writer = None
+    try:
+        for i in range(REQUESTS):
+            if i:
+                await asyncio.sleep(THINK_SECONDS)
+            start = time.perf_counter()
+            if writer is None:
+                reader, writer = await asyncio.open_connection(HOST, PORT)
+            writer.write(request[:half])
+            await asyncio.sleep(SLOW_SECONDS)
+            writer.write(request[half:])
+            if not await read_response(reader):
+                writer.close()
+                writer = None
+            latencies.append(time.perf_counter() - start)
+    finally:
+        if writer is not None:
+            writer.close()
+    return latencies
+
+
+async def load(clients):
+    async def run_client():
+        try:
+            return await asyncio.wait_for(client(), timeout=TIMEOUT)
+        except (OSError, RuntimeError, asyncio.TimeoutError,
+                asyncio.IncompleteReadError):
+            return None
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    failed = sum(result is None for result in results)
+    latencies = sorted(latency for result in results if result
+                       for latency in result)
+    return elapsed, latencies, failed
+
+
+def main(clients):
+    try:
+        import uvicorn  # noqa: F401 (needed by the asgi server)
+    except ImportError:
+        sys.exit("bench_asgi needs uvicorn: "
+                 "pip install -r requirements-asgi.txt")
+    print(f"{clients} concurrent clients x {REQUESTS} requests, "
+          f"{SLOW_SECONDS * 1000:.0f} ms pause inside and "
+          f"{THINK_SECONDS * 1000:.0f} ms between requests")
+    print(f"{'server':<10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'failed clients':>15}")
+    for kind in SERVERS:
+        process = start_server(kind)
+        try:
+            elapsed, latencies, failed = asyncio.run(load(clients))
+        finally:
+            process.kill()
+            process.wait()
+        quantiles = (statistics.quantiles(latencies, n=100)
+                     if len(latencies) > 1 else [0] * 99)
+        print(f"{kind:<10} {len(latencies) / elapsed:>8,.0f} "
+              f"{quantiles[49] * 1000:>8.0f} {quantiles[98] * 1000:>8.0f} "
+              f"{failed:>15}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == '--serve':
+        serve(sys.argv[2])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Bulk create benchmark.
+
+Creates N places through the Flask test client, first one POST per
+place on /api/v1/places/, then in batches on /api/v1/places/bulk,
+and prints the rows/second of both paths.
+
+Usage:
+    python3 -m benchmarks.bench_bulk [N] [BATCH]
+"""
+
+import sys
+import time
+from app import create_app
+from app.services import facade
+
+
+def payload(owner_id, amenity_ids, i):
+    """Return the JSON body of the i-th place."""
+    return {
+        "title": f"Place {i}",
+        "description": "Benchmark place",
+        "price": 100,
+        "latitude": 45,
+        "longitude": 3,
+        "owner_id": owner_id,
+        "amenities": amenity_ids
+    }
+
+
+def main(size, batch):
+    client = create_app().test_client()
+    owner_id = facade.create_user({
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "bench@example.com"
+    }).id
+    amenity_ids = [
+        facade.create_amenity({"name": f"Amenity {i}"}).id for i in range(5)
+    ]
+
+    start = time.perf_counter()
+    for i in range(size):
+        client.post('/api/v1/places/', json=payload(owner_id, amenity_ids, i))
+    single = size / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for offset in range(0, size, batch):
+        client.post('/api/v1/places/bulk', json=[
+            payload(owner_id, amenity_ids, i)
+            for i in range(offset, min(offset + batch, size))
+        ])
+    bulk = size / (time.perf_counter() - start)
+
+    print(f"single: {single:>10,.0f} rows/s")
+    print(f"bulk:   {bulk:>10,.0f} rows/s  (batch={batch}, x{bulk / single:.1f})")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""
+Repository lock contention benchmark.
+
+Runs a read-heavy mix (95% reads: lookups by id and by email, 5%
+inserts) from 1 to 8 threads against:
+
+    - mutex: every call serialized by one lock,
+    - rwlock: reads under the read side of a ReadWriteLock, writes
+      under its write side,
+    - optimistic: ThreadSafeRepository (writes under a mutex, reads
+      lock-free and validated by a sequence counter),
+    - sqlite: SQLiteRepository (one connection per thread).
+
+and prints the total throughput. The pure Python repositories run
+under the GIL, so their reads never overlap in time and no lock can
+make them scale; what matters is how little a read pays for its
+safety.
+
+Usage:
+    python3 -m benchmarks.bench_contention [OPS_PER_THREAD]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from app.models.user import User
+from app.persistence.concurrency import ReadWriteLock, ThreadSafeRepository
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlite_repository import SQLiteRepository
+
+SEED_USERS = 10_000
+THREADS = (1, 2, 4, 8)
+
+
+class MutexLock:
+    """One reentrant mutex standing in for both sides of the lock."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def read(self):
+        return self._lock
+
+    def write(self):
+        return self._lock
+
+
+class LockedRepository(InMemoryRepository):
+    """InMemoryRepository with every call wrapped in `lock`."""
+
+    def __init__(self, lock, **indexes):
+        super().__init__(**indexes)
+        self.lock = lock
+
+    def add(self, obj):
+        with self.lock.write():
+            super().add(obj)
+
+    def add_many(self, objs):
+        with self.lock.write():
+            super().add_many(objs)
+
+    def get(self, obj_id):
+        with self.lock.read():
+            return super().get(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        with self.lock.read():
+            return super().get_by_attribute(attr_name, attr_value)
+
+
+def workload(repo, users, ops, seed):
+    rng = random.Random(seed)
+    for i in range(ops):
+        roll = rng.random()
+        if roll < 0.05:
+            repo.add(User("New", "User", f"t{seed}-{i}@example.com"))
+        elif roll < 0.5:
+            repo.get(rng.choice(users).id)
+        else:
+            repo.get_by_attribute('email', rng.choice(users).email)
+
+
+def run(repo, users, threads, ops):
+    """Return the total operations per second of `threads` workers."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed):
+        barrier.wait()
+        workload(repo, users, ops, seed)
+
+    pool = [threading.Thread(target=worker, args=(threads * 1000 + n,))
+            for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def main(ops):
+    users = [User("John", "Doe", f"user{i}@example.com")
+             for i in range(SEED_USERS)]
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {
+            "mutex": lambda: LockedRepository(
+                MutexLock(), unique_indexes=['email']),
+            "rwlock": lambda: LockedRepository(
+                ReadWriteLock(), unique_indexes=['email']),
+            "optimistic": lambda: ThreadSafeRepository(
+                unique_indexes=['email']),
+            "sqlite": lambda: SQLiteRepository(
+                os.path.join(directory, f"{time.monotonic_ns()}.db"),
+                'users', User, unique_indexes=['email']),
+        }
+        print(f"{ops} ops per thread, 95% reads")
+        print("threads " + "".join(f"{name:>14}" for name in backends))
+        for threads in THREADS:
+            row = []
+            for make in backends.values():
+                repo = make()
+                repo.add_many(users)
+                row.append(run(repo, users, threads, ops))
+                if hasattr(repo, 'close'):
+                    repo.close()
+            print(f"{threads:>7} " + "".join(
+                f"{value:>10,.0f} op/s"[-14:] for value in row))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
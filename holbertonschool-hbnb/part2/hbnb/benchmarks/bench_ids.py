@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Model construction benchmark.
+
+Prints the objects/second of:
+
+    - the id generators alone (uuid.uuid4() against the pooled
+      time-ordered generator);
+    - User and Place construction with each generator, uuid4 being
+      the scheme models used before the generators;
+    - inserting N users into an indexed SQLite table, where the
+      time-ordered ids append to the end of the primary key index
+      instead of landing at random pages of it.
+
+Usage:
+    python3 -m benchmarks.bench_ids [N]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from app.models.base_model import set_id_generator
+from app.models.ids import ID_GENERATORS
+from app.models.place import Place
+from app.models.user import User
+from app.persistence.sqlite_repository import SQLiteRepository
+
+
+def rate(function, count):
+    """Return the calls/second of function(i) for i in range(count)."""
+    start = time.perf_counter()
+    for i in range(count):
+        function(i)
+    return count / (time.perf_counter() - start)
+
+
+def insert_rate(count):
+    """Return the users/second of SQLite add_many() batches of 1000."""
+    directory = tempfile.mkdtemp()
+    repo = SQLiteRepository(os.path.join(directory, 'bench.db'), 'users',
+                            User, unique_indexes=['email'])
+    users = [User("John", "Doe", f"john{i}@example.com")
+             for i in range(count)]
+    start = time.perf_counter()
+    for i in range(0, count, 1000):
+        repo.add_many(users[i:i + 1000])
+    elapsed = time.perf_counter() - start
+    repo.close()
+    os.remove(os.path.join(directory, 'bench.db'))
+    os.rmdir(directory)
+    return count / elapsed
+
+
+def main(count):
+    owner = User("John", "Doe", "owner@example.com")
+    print(f"{count:,} objects per run")
+    print(f"{'':<22} {'uuid4':>12} {'uuid7':>12}")
+
+    rows = {'id only': {}, 'User()': {}, 'Place()': {}, 'SQLite insert': {}}
+    for name, generator in ID_GENERATORS.items():
+        previous = set_id_generator(generator)
+        try:
+            rows['id only'][name] = rate(
+                lambda i: generator(time.time_ns() // 1000), count)
+            rows['User()'][name] = rate(
+                lambda i: User("John", "Doe", "john@example.com"), count)
+            rows['Place()'][name] = rate(
+                lambda i: Place("Flat", None, 100, 45.0, 3.0, owner), count)
+            rows['SQLite insert'][name] = insert_rate(count)
+        finally:
+            set_id_generator(previous)
+    for label, rates in rows.items():
+        print(f"{label:<22} {rates['uuid4']:>12,.0f} {rates['uuid7']:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Model memory footprint benchmark.
+
+Uses tracemalloc to measure the bytes allocated per resident User
+and Place, comparing the slotted models with a replica of the
+previous layout (per-instance __dict__, UUID string and two
+datetime objects).
+
+Usage:
+    python3 -m benchmarks.bench_model_memory [N]
+"""
+
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+from app.models.place import Place
+from app.models.user import User
+
+
+class DictModel:
+    """Previous BaseModel layout, kept here for comparison only."""
+
+    def __init__(self):
+        self.id = str(uuid.uuid4())
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+
+class DictUser(DictModel):
+    def __init__(self, first_name, last_name, email, is_admin=False):
+        super().__init__()
+        self.first_name = first_name
+        self.last_name = last_name
+        self.email = email
+        self.is_admin = is_admin
+
+
+class DictPlace(DictModel):
+    def __init__(self, title, description, price, latitude, longitude, owner):
+        super().__init__()
+        self.title = title
+        self.description = description
+        self.price = price
+        self.latitude = latitude
+        self.longitude = longitude
+        self.owner = owner
+        self.reviews = []
+        self.amenities = []
+
+
+def bytes_per_object(factory, count):
+    """Return the average number of bytes allocated per object."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def main(count):
+    owner = User("John", "Doe", "owner@example.com")
+    cases = [
+        ("User (dict)", lambda i: DictUser("John", "Doe", "a@b.com")),
+        ("User (slots)", lambda i: User("John", "Doe", "a@b.com")),
+        ("Place (dict)",
+         lambda i: DictPlace("Title", "Desc", 100.5, 45.5, 3.5, owner)),
+        ("Place (slots)",
+         lambda i: Place("Title", "Desc", 100.5, 45.5, 3.5, owner)),
+    ]
+    for name, factory in cases:
+        print(f"{name:<14} {bytes_per_object(factory, count):>8.0f} bytes/object")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Place range-scan benchmark.
+
+Compares a price range + bounding box filter written as a Python
+loop over place_repo.get_all() with the same filter run on the
+place ColumnStore (NumPy when installed, array loop otherwise).
+
+Usage:
+    python3 -m benchmarks.bench_place_columns [N]
+"""
+
+import random
+import sys
+import time
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import columns
+from app.persistence.columns import ColumnStore
+from app.persistence.repository import InMemoryRepository
+
+
+def main(size):
+    owner = User("John", "Doe", "owner@example.com")
+    repo = InMemoryRepository()
+    store = ColumnStore(('latitude', 'longitude', 'price'))
+    rng = random.Random(42)
+    for _ in range(size):
+        place = Place("Place", "", rng.uniform(10, 500),
+                      rng.uniform(-90, 90), rng.uniform(-180, 180), owner)
+        repo.add(place)
+        store.add(place)
+
+    start = time.perf_counter()
+    loop = [
+        place.id for place in repo.get_all()
+        if 50 <= place.price <= 150
+        and 40 <= place.latitude <= 50 and -5 <= place.longitude <= 10
+    ]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scan = store.range_query(price=(50, 150), latitude=(40, 50),
+                             longitude=(-5, 10))
+    scan_time = time.perf_counter() - start
+    assert sorted(loop) == sorted(scan)
+
+    engine = "numpy" if columns.numpy is not None else "array"
+    print(f"{size} places, {len(scan)} matches")
+    print(f"python loop:        {loop_time * 1000:>8.1f} ms")
+    print(f"column scan ({engine}): {scan_time * 1000:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
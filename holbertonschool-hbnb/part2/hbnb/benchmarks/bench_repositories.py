@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Repository backend benchmark.
+
+Compares InMemoryRepository and SQLiteRepository on writes (one
+transaction per write and batched), reads by id and lookups on the
+indexed 'email' attribute.
+
+Usage:
+    python3 -m benchmarks.bench_repositories [N]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlite_repository import SQLiteRepository
+
+
+def rate(count, seconds):
+    """Format an operations-per-second figure."""
+    return f"{count / seconds:>12,.0f} ops/s"
+
+
+def run(name, repo, users, batch=None):
+    """Time writes, reads by id and email lookups on one repository."""
+    start = time.perf_counter()
+    if batch is None:
+        for user in users:
+            repo.add(user)
+    else:
+        with batch():
+            for user in users:
+                repo.add(user)
+    write = time.perf_counter() - start
+
+    sample = random.sample(users, min(len(users), 2000))
+    start = time.perf_counter()
+    for user in sample:
+        repo.get(user.id)
+    read = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for user in sample:
+        repo.get_by_attribute('email', user.email)
+    lookup = time.perf_counter() - start
+
+    print(f"{name:<22} write {rate(len(users), write)}"
+          f"  get {rate(len(sample), read)}"
+          f"  email {rate(len(sample), lookup)}")
+
+
+def main(size):
+    users = [User("John", "Doe", f"user{i}@example.com") for i in range(size)]
+    print(f"{size} users")
+    run("memory", InMemoryRepository(unique_indexes=['email']), users)
+
+    with tempfile.TemporaryDirectory() as directory:
+        repo = SQLiteRepository(os.path.join(directory, 'a.db'), 'users',
+                                User, unique_indexes=['email'])
+        run("sqlite (autocommit)", repo, users[:min(size, 5000)])
+        repo.close()
+
+        repo = SQLiteRepository(os.path.join(directory, 'b.db'), 'users',
+                                User, unique_indexes=['email'])
+        run("sqlite (batched)", repo, users, batch=repo.batch)
+        repo.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
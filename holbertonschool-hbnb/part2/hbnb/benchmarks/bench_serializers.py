@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+Response serialization benchmark.
+
+Compares the hand-built response dicts the v1 handlers used to
+construct in a for/append loop with the compiled serializers, for
+the user list, the place list and the nested place detail shape.
+Each path is timed up to the JSON text: hand-built dicts and
+compiled dicts are passed to json.dumps(), the compiled JSON writer
+produces the text itself.
+
+Usage:
+    python3 -m benchmarks.bench_serializers [N]
+"""
+
+import gc
+import json
+import sys
+import time
+from app.api.v1.serializers import (
+    place_detail_serializer, place_summary_serializer, user_serializer)
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+
+
+def users_by_hand(users):
+    List_user = []
+    for user in users:
+        List_user.append({
+            'id': user.id,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'email': user.email
+        })
+    return List_user
+
+
+def places_by_hand(places):
+    List_places = []
+    for place in places:
+        List_places.append({
+            'id': place.id,
+            'title': place.title,
+            'latitude': place.latitude,
+            'longitude': place.longitude
+        })
+    return List_places
+
+
+def place_details_by_hand(places):
+    List_places = []
+    for place in places:
+        List_places.append({
+            'id': place.id,
+            'title': place.title,
+            'description': place.description,
+            'price': place.price,
+            'latitude': place.latitude,
+            'longitude': place.longitude,
+            'owner': {
+                'id': place.owner.id,
+                'first_name': place.owner.first_name,
+                'last_name': place.owner.last_name,
+                'email': place.owner.email
+            },
+            'amenities': [
+                {
+                    'id': amenity.id,
+                    'name': amenity.name
+                }
+                for amenity in place.amenities
+            ]
+        })
+    return List_places
+
+
+def best_of(function, rows, repeat=9):
+    """Return the best wall time of `repeat` runs, in seconds."""
+    best = float('inf')
+    # Like timeit, keep the collector from running in the middle of
+    # 100k allocations and dominating the measure.
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(rows)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def main(size):
+    users = [User("John", "Doe", f"user{i}@example.com")
+             for i in range(size)]
+    amenities = [Amenity("Wifi"), Amenity("Pool")]
+    places = []
+    for i in range(size):
+        place = Place("Place", "Desc", 100.0, 45.0, 3.0, users[i])
+        for amenity in amenities:
+            place.add_amenity(amenity)
+        places.append(place)
+
+    cases = [
+        ("user list", users_by_hand, user_serializer, users),
+        ("place list", places_by_hand, place_summary_serializer, places),
+        ("place detail", place_details_by_hand,
+         place_detail_serializer, places),
+    ]
+    print(f"{size} rows, time to JSON text (ms)")
+    print(f"{'':<13} {'hand-built':>10} {'compiled':>10} {'dumps':>10}")
+    for name, by_hand, serializer, rows in cases:
+        assert by_hand(rows[:10]) == serializer.many(rows[:10])
+        hand_time = best_of(lambda r: json.dumps(by_hand(r)), rows)
+        dict_time = best_of(lambda r: json.dumps(serializer.many(r)), rows)
+        dumps_time = best_of(serializer.dumps_many, rows)
+        print(f"{name:<13} {hand_time * 1000:>10.1f} {dict_time * 1000:>10.1f} "
+              f"{dumps_time * 1000:>10.1f}   x{hand_time / dumps_time:.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Signup latency benchmark.
+
+Measures the cost of the signup path used by UserList.post
+(get_user_by_email followed by create_user) against a user
+repository pre-filled with N users, with and without the
+secondary 'email' index.
+
+Usage:
+    python3 -m benchmarks.bench_signup [N ...]
+"""
+
+import sys
+import time
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+from app.services.facade import HBnBFacade
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+SAMPLES = 20
+
+
+def fill(repo, size):
+    """Add `size` users to the repository."""
+    for i in range(size):
+        repo.add(User("John", "Doe", f"user{i}@example.com"))
+
+
+def signup_latency(facade, samples=SAMPLES):
+    """
+    Run `samples` signups and return the mean latency in microseconds.
+    """
+    start = time.perf_counter()
+    for i in range(samples):
+        email = f"new{i}@example.com"
+        if facade.get_user_by_email(email) is None:
+            facade.create_user({
+                "first_name": "Jane",
+                "last_name": "Doe",
+                "email": email
+            })
+    return (time.perf_counter() - start) / samples * 1e6
+
+
+def main(sizes):
+    print(f"{'users':>10} {'scan (us)':>12} {'indexed (us)':>14}")
+    for size in sizes:
+        facade = HBnBFacade()
+        facade.user_repo = InMemoryRepository()
+        fill(facade.user_repo, size)
+        scan = signup_latency(facade, samples=min(SAMPLES, 5))
+
+        facade.user_repo = InMemoryRepository(unique_indexes=['email'])
+        fill(facade.user_repo, size)
+        indexed = signup_latency(facade)
+
+        print(f"{size:>10} {scan:>12.1f} {indexed:>14.1f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,58 @@
+#!/usr/bin/python3
+"""
+Collection streaming benchmark.
+
+Measures the peak memory allocated (tracemalloc) while sending the
+whole place collection through GET /api/v1/places/ as one JSON body
+and as a stream (chunked JSON array, NDJSON). The response cache is
+disabled so that every variant serializes the collection.
+
+Usage:
+    python3 -m benchmarks.bench_streaming [N]
+"""
+
+import sys
+import time
+import tracemalloc
+from app import create_app
+from app.models.place import Place
+from app.services import facade, response_cache
+
+
+def measure(client, path, headers=None):
+    """Return (peak bytes, seconds, body bytes) for one request."""
+    response_cache.max_bytes = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(path, headers=headers or {}, buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    response.close()
+    return peak, elapsed, size
+
+
+def main(size):
+    owner = facade.create_user({"first_name": "John", "last_name": "Doe",
+                                "email": "owner@example.com"})
+    facade.place_repo.add_many([
+        Place("Place", "Desc", 100.0, 45.0, 3.0, owner)
+        for _ in range(size)])
+    client = create_app().test_client()
+
+    cases = [
+        ("json body", '/api/v1/places/', None),
+        ("json stream", '/api/v1/places/?stream=true', None),
+        ("ndjson stream", '/api/v1/places/',
+         {"Accept": "application/x-ndjson"}),
+    ]
+    print(f"{size} places")
+    for name, path, headers in cases:
+        peak, elapsed, body = measure(client, path, headers)
+        print(f"{name:<14} peak {peak / 2**20:>8.1f} MiB   "
+              f"{elapsed * 1000:>7.0f} ms   body {body / 2**20:.1f} MiB")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
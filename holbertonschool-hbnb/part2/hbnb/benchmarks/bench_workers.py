@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Multi-process throughput benchmark.
+
+Forks 1, 2 and 4 worker processes sharing one database through the
+'shared' storage backend, as `gunicorn -w N` would, and drives the
+API of each one through the Flask test client for a fixed time:
+80% place details, 15% "places near me" searches, 5% signups. Prints
+the total throughput, then checks that every signup made by any
+worker is visible to the parent process.
+
+Throughput can only grow with the number of workers up to the number
+of CPU cores available.
+
+Usage:
+    python3 -m benchmarks.bench_workers [SECONDS]
+"""
+
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+SEED_PLACES = 2_000
+WORKERS = (1, 2, 4)
+
+
+def worker(place_ids, seconds, barrier, results):
+    from app import create_app
+
+    client = create_app().test_client()
+    rng = random.Random()
+    requests = signups = 0
+    barrier.wait()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        draw = rng.random()
+        if draw < 0.80:
+            response = client.get(
+                f'/api/v1/places/{rng.choice(place_ids)}')
+        elif draw < 0.95:
+            response = client.get(
+                f'/api/v1/places/near?lat={rng.uniform(44, 46)}'
+                f'&lon={rng.uniform(2, 4)}&radius_km=25&limit=10')
+        else:
+            response = client.post('/api/v1/users/', json={
+                "first_name": "Bench",
+                "last_name": "Worker",
+                "email": f"{uuid.uuid4().hex}@example.com"
+            })
+            signups += 1
+        assert response.status_code < 300, response.status_code
+        requests += 1
+    results.put((requests, signups))
+
+
+def run(context, workers, place_ids, seconds):
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker,
+                        args=(place_ids, seconds, barrier, results))
+        for _ in range(workers)]
+    for process in processes:
+        process.start()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return (sum(requests for requests, _ in totals),
+            sum(signups for _, signups in totals))
+
+
+def main(seconds):
+    directory = tempfile.mkdtemp()
+    # Must be set before the app (and its facade) is imported
+    os.environ['HBNB_STORAGE'] = 'shared'
+    os.environ['HBNB_STORAGE_PATH'] = os.path.join(directory, 'hbnb.db')
+    try:
+        from app.services import facade
+
+        owner = facade.create_user({"first_name": "John", "last_name": "Doe",
+                                    "email": "owner@example.com"})
+        rng = random.Random(42)
+        results = facade.create_places([{
+            "title": f"Place {i}",
+            "price": 100,
+            "latitude": rng.uniform(44, 46),
+            "longitude": rng.uniform(2, 4),
+            "owner_id": owner.id
+        } for i in range(SEED_PLACES)])
+        place_ids = [place.id for place, _ in results]
+
+        context = multiprocessing.get_context('fork')
+        print(f"{os.cpu_count()} CPU(s), {seconds:g} s per run")
+        print(f"{'workers':>7} {'requests/s':>12}")
+        signups = 0
+        for workers in WORKERS:
+            requests, created = run(context, workers, place_ids, seconds)
+            signups += created
+            print(f"{workers:>7} {requests / seconds:>12,.0f}")
+
+        users = len(facade.get_all_users())
+        assert users == 1 + signups, (users, signups)
+        print(f"parent sees all {signups} signups made by the workers")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
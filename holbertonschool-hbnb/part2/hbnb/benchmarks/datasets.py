@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Synthetic data for the benchmarks.
+
+The generators yield the JSON payloads the API accepts, drawn from a
+seeded random.Random so that two runs with the same seed build the
+same collections. seed_facade() stores a whole dataset through the
+bulk facade methods:
+
+    - `scale` users and `scale` places, each place owned by a random
+      user and holding AMENITIES_PER_PLACE random amenities;
+    - one amenity per 100 places (at least 10);
+    - `scale` reviews of random places by random users.
+"""
+
+from collections import namedtuple
+
+AMENITIES_PER_PLACE = 3
+# Items per bulk facade call
+BATCH_SIZE = 5000
+
+Dataset = namedtuple('Dataset', 'user_ids emails amenity_ids place_ids')
+
+# Full-text queries over the generated places; the last word of some
+# is a prefix
+SEARCH_QUERIES = ('cosy', 'quiet loft', 'mod', 'rustic villa', 'central ca',
+                  'amenity 4')
+
+_WORDS = ('cosy', 'bright', 'quiet', 'central', 'rustic', 'modern',
+          'studio', 'loft', 'cabin', 'villa', 'flat', 'house')
+
+
+def user_payloads(count, rng, start=0):
+    """Yield `count` user payloads with unique emails."""
+    for i in range(start, start + count):
+        yield {
+            "first_name": rng.choice(('John', 'Jane', 'Alex', 'Sam')),
+            "last_name": rng.choice(('Doe', 'Smith', 'Martin', 'Lee')),
+            "email": f"user{i}@example.com",
+        }
+
+
+def amenity_payloads(count):
+    """Yield `count` amenity payloads."""
+    for i in range(count):
+        yield {"name": f"Amenity {i}"}
+
+
+def place_payloads(count, rng, owner_ids, amenity_ids):
+    """Yield `count` place payloads owned by random users."""
+    for _ in range(count):
+        yield {
+            "title": f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS)}",
+            "description": ' '.join(rng.choices(_WORDS, k=12)),
+            "price": round(rng.uniform(20, 500), 2),
+            "latitude": rng.uniform(-60, 70),
+            "longitude": rng.uniform(-180, 180),
+            "owner_id": rng.choice(owner_ids),
+            "amenities": rng.sample(
+                amenity_ids, min(AMENITIES_PER_PLACE, len(amenity_ids))),
+        }
+
+
+def review_payloads(count, rng, user_ids, place_ids):
+    """Yield `count` reviews of random places by random users."""
+    for _ in range(count):
+        yield {
+            "text": ' '.join(rng.choices(_WORDS, k=8)),
+            "rating": rng.randint(1, 5),
+            "user_id": rng.choice(user_ids),
+            "place_id": rng.choice(place_ids),
+        }
+
+
+def _batches(items):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _created_ids(results):
+    ids = []
+    for obj, error in results:
+        if error:
+            raise RuntimeError(f"Invalid generated data: {error}")
+        ids.append(obj.id)
+    return ids
+
+
+def seed_facade(facade, scale, rng):
+    """
+    Store a dataset of size `scale` through `facade`.
+
+    Args:
+        facade (HBnBFacade): Facade to fill, expected to be empty.
+        scale (int): Number of users, places and reviews.
+        rng (random.Random): Source of the random choices.
+
+    Returns:
+        Dataset: Ids (and emails) of the stored objects.
+    """
+    user_ids, emails = [], []
+    for batch in _batches(user_payloads(scale, rng)):
+        user_ids += _created_ids(facade.create_users(batch))
+        emails += [user["email"] for user in batch]
+
+    amenity_ids = _created_ids(facade.create_amenities(
+        list(amenity_payloads(max(10, scale // 100)))))
+
+    place_ids = []
+    for batch in _batches(place_payloads(scale, rng, user_ids, amenity_ids)):
+        place_ids += _created_ids(facade.create_places(batch))
+
+    for review in review_payloads(scale, rng, user_ids, place_ids):
+        facade.create_review(review)
+    return Dataset(user_ids, emails, amenity_ids, place_ids)
@@ -0,0 +1,346 @@
+#!/usr/bin/python3
+"""
+Benchmark suite of the facade and the API.
+
+Seeds the application facade with a synthetic dataset (see
+benchmarks.datasets) of SCALE users, places and reviews, then runs
+each scenario OPS times and reports its throughput and latency
+percentiles. Every scenario exists twice: on HBnBFacade directly
+(facade.*) and through the Flask test client (api.*):
+
+    - create_user, get_user, list_places (pages of 100, following
+      the cursor), update_place, email_lookup, reviews_by_place,
+      search_places (top 10 of a full-text query) and filter_places
+      (places having two random amenities in a price range, with
+      their facet counts);
+    - api.email_lookup registers an existing email, which the
+      endpoint rejects after looking it up. There is no lookup
+      endpoint.
+
+Each scenario is measured --repeat times and its fastest run is
+kept, which filters out most of the noise of a shared machine.
+
+The API read scenarios go through the response cache, as in
+production.
+
+--output writes the results as JSON (with the Python version, the
+platform, the storage backend and the git commit) so that runs can
+be compared. --baseline compares the run to such a file and exits
+with status 1 when a scenario lost more than --threshold of its
+throughput.
+
+The storage backend is the one of the application (HBNB_STORAGE). It
+must be empty, since the suite fills it.
+
+Usage:
+    python3 -m benchmarks.suite [--scale N] [--ops N] [--repeat N]
+        [--only TEXT] [--output FILE] [--baseline FILE] [--threshold 0.15]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from benchmarks.datasets import SEARCH_QUERIES, seed_facade, user_payloads
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """Register function(context) as one operation of scenario `name`."""
+    def register(function):
+        SCENARIOS[name] = function
+        return function
+    return register
+
+
+class Context:
+    """State shared by the operations of a run."""
+
+    def __init__(self, facade, client, dataset, rng, scale):
+        self.facade = facade
+        self.client = client
+        self.dataset = dataset
+        self.rng = rng
+        self.new_users = user_payloads(10 ** 9, rng, start=scale)
+        self.cursors = {}
+
+    def next_page(self, name, fetch):
+        """Fetch the page after the last one of `name`, wrapping around."""
+        cursor = self.cursors.get(name)
+        self.cursors[name] = fetch(cursor)
+
+
+@scenario('facade.create_user')
+def facade_create_user(ctx):
+    ctx.facade.create_user(next(ctx.new_users))
+
+
+@scenario('facade.get_user')
+def facade_get_user(ctx):
+    ctx.facade.get_user(ctx.rng.choice(ctx.dataset.user_ids))
+
+
+@scenario('facade.list_places')
+def facade_list_places(ctx):
+    ctx.next_page('facade', lambda cursor: ctx.facade.get_places_page(
+        100, cursor)[1])
+
+
+@scenario('facade.update_place')
+def facade_update_place(ctx):
+    ctx.facade.update_place(ctx.rng.choice(ctx.dataset.place_ids),
+                            {"price": round(ctx.rng.uniform(20, 500), 2)})
+
+
+@scenario('facade.email_lookup')
+def facade_email_lookup(ctx):
+    ctx.facade.get_user_by_email(ctx.rng.choice(ctx.dataset.emails))
+
+
+@scenario('facade.reviews_by_place')
+def facade_reviews_by_place(ctx):
+    ctx.facade.get_reviews_by_place(ctx.rng.choice(ctx.dataset.place_ids))
+
+
+@scenario('facade.search_places')
+def facade_search_places(ctx):
+    ctx.facade.search_places(ctx.rng.choice(SEARCH_QUERIES))
+
+
+def _filter(ctx):
+    """Return random amenity ids and price bounds of a filter."""
+    amenity_ids = ctx.rng.sample(ctx.dataset.amenity_ids, 2)
+    min_price = ctx.rng.randrange(20, 400)
+    return amenity_ids, min_price, min_price + 100
+
+
+@scenario('facade.filter_places')
+def facade_filter_places(ctx):
+    amenity_ids, min_price, max_price = _filter(ctx)
+    ctx.facade.filter_places(amenity_ids, min_price, max_price)
+
+
+def _check(response, status=200):
+    if response.status_code != status:
+        raise RuntimeError(
+            f"{response.request.path}: {response.status_code} "
+            f"{response.get_data(as_text=True)[:200]}")
+    return response
+
+
+@scenario('api.create_user')
+def api_create_user(ctx):
+    _check(ctx.client.post('/api/v1/users/', json=next(ctx.new_users)), 201)
+
+
+@scenario('api.get_user')
+def api_get_user(ctx):
+    _check(ctx.client.get(
+        f'/api/v1/users/{ctx.rng.choice(ctx.dataset.user_ids)}'))
+
+
+@scenario('api.list_places')
+def api_list_places(ctx):
+    def fetch(cursor):
+        query = f'&cursor={cursor}' if cursor else ''
+        response = _check(ctx.client.get(f'/api/v1/places/?limit=100{query}'))
+        return response.headers.get('X-Next-Cursor')
+    ctx.next_page('api', fetch)
+
+
+@scenario('api.update_place')
+def api_update_place(ctx):
+    _check(ctx.client.put(
+        f'/api/v1/places/{ctx.rng.choice(ctx.dataset.place_ids)}',
+        json={"price": round(ctx.rng.uniform(20, 500), 2)}))
+
+
+@scenario('api.email_lookup')
+def api_email_lookup(ctx):
+    _check(ctx.client.post('/api/v1/users/', json={
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": ctx.rng.choice(ctx.dataset.emails),
+    }), 400)
+
+
+@scenario('api.reviews_by_place')
+def api_reviews_by_place(ctx):
+    _check(ctx.client.get(
+        f'/api/v1/places/{ctx.rng.choice(ctx.dataset.place_ids)}/reviews'))
+
+
+@scenario('api.search_places')
+def api_search_places(ctx):
+    _check(ctx.client.get('/api/v1/places/search',
+                          query_string={'q': ctx.rng.choice(SEARCH_QUERIES)}))
+
+
+@scenario('api.filter_places')
+def api_filter_places(ctx):
+    amenity_ids, min_price, max_price = _filter(ctx)
+    _check(ctx.client.get('/api/v1/places/', query_string={
+        'amenities': ','.join(amenity_ids),
+        'min_price': min_price, 'max_price': max_price}))
+
+
+def measure(operation, ctx, ops, warmup=20):
+    """
+    Run `operation` `ops` times after `warmup` untimed runs.
+
+    Returns:
+        dict: Throughput and latency percentiles, in microseconds.
+    """
+    for _ in range(warmup):
+        operation(ctx)
+    latencies = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(ops):
+        begin = clock()
+        operation(ctx)
+        latencies.append(clock() - begin)
+    elapsed = (clock() - start) / 1e9
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'ops': ops,
+        'seconds': round(elapsed, 6),
+        'ops_per_sec': round(ops / elapsed, 1),
+        'mean_us': round(statistics.fmean(latencies) / 1000, 2),
+        'p50_us': round(percentiles[49] / 1000, 2),
+        'p95_us': round(percentiles[94] / 1000, 2),
+        'p99_us': round(percentiles[98] / 1000, 2),
+    }
+
+
+def git_commit():
+    """Return the commit being measured, or None outside a git tree."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare the throughput of each scenario with a baseline run.
+
+    Args:
+        results (dict): Scenario name -> measure() result.
+        baseline (dict): The same, from an earlier run.
+        threshold (float): Allowed loss of throughput, e.g. 0.1.
+
+    Returns:
+        tuple: ({name: relative change}, list of regressed names).
+    """
+    changes = {}
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before or not before.get('ops_per_sec'):
+            continue
+        change = result['ops_per_sec'] / before['ops_per_sec'] - 1
+        changes[name] = change
+        if change < -threshold:
+            regressions.append(name)
+    return changes, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python3 -m benchmarks.suite',
+        description='Benchmark the HBnB facade and API.')
+    parser.add_argument('--scale', type=int, default=1000,
+                        help='users, places and reviews seeded (1000)')
+    parser.add_argument('--ops', type=int, default=2000,
+                        help='operations per scenario (2000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per scenario, the fastest is kept (3)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', default='',
+                        help='run the scenarios whose name contains TEXT')
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='throughput loss counted as a regression (0.15)')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from app.services import facade, settings
+
+    if facade.get_users_page(1)[0] or facade.get_places_page(1)[0]:
+        sys.exit("The storage is not empty; point HBNB_STORAGE_PATH to a "
+                 "new location or use the memory backend.")
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    dataset = seed_facade(facade, args.scale, rng)
+    print(f"seeded {args.scale:,} users, places and reviews in "
+          f"{time.perf_counter() - start:.1f} s ({settings.STORAGE} storage)")
+
+    ctx = Context(facade, create_app().test_client(), dataset, rng,
+                  args.scale)
+    results = {}
+    for name, operation in SCENARIOS.items():
+        if args.only in name:
+            runs = [measure(operation, ctx, args.ops)
+                    for _ in range(max(1, args.repeat))]
+            results[name] = max(runs, key=lambda run: run['ops_per_sec'])
+
+    changes = {}
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        changes, regressions = compare(
+            results, baseline['results'], args.threshold)
+
+    print(f"{'scenario':<26} {'ops/s':>10} {'p50 us':>9} {'p95 us':>9} "
+          f"{'p99 us':>9} {'vs base':>8}")
+    for name, result in results.items():
+        change = (f"{changes[name]:+8.1%}" if name in changes
+                  else f"{'':>8}")
+        flag = '  REGRESSION' if name in regressions else ''
+        print(f"{name:<26} {result['ops_per_sec']:>10,.0f} "
+              f"{result['p50_us']:>9,.1f} {result['p95_us']:>9,.1f} "
+              f"{result['p99_us']:>9,.1f} {change}{flag}")
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'storage': settings.STORAGE,
+                'scale': args.scale,
+                'ops': args.ops,
+                'repeat': args.repeat,
+                'seed': args.seed,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+            file.write('\n')
+
+    if regressions:
+        print(f"{len(regressions)} scenario(s) lost more than "
+              f"{args.threshold:.0%} of their throughput", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
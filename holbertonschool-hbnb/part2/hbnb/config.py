@@ -5,12 +5,57 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
 
+    # Storage backend used by the facade: 'memory', 'file', 'sqlite' or
+    # 'shared' (SQLite shared by several worker processes)
+    STORAGE = os.getenv('HBNB_STORAGE', 'memory')
+    # Directory for 'file', database file for 'sqlite' and 'shared'
+    STORAGE_PATH = os.getenv('HBNB_STORAGE_PATH', 'instance/hbnb.db')
+    # Group commit settings of the 'file' backend
+    FSYNC_EVERY = int(os.getenv('HBNB_FSYNC_EVERY', '64'))
+    FSYNC_INTERVAL = float(os.getenv('HBNB_FSYNC_INTERVAL', '0.05'))
+    # Writes remembered by a 'shared' database for the other workers
+    CHANGE_LOG_SIZE = int(os.getenv('HBNB_CHANGE_LOG_SIZE', '100000'))
+    # Lock the repositories so that a threaded server can share them.
+    # On by default because run.py starts the threaded Flask server;
+    # it costs about 10% per read and 2 us per write (memory backend)
+    THREAD_SAFE = os.getenv('HBNB_THREAD_SAFE', '1') == '1'
+
+    # Ids of new objects: 'uuid7' (time-ordered) or 'uuid4' (random)
+    ID_GENERATOR = os.getenv('HBNB_ID_GENERATOR', 'uuid7')
+
+    # Build the place indexes and rating aggregates on first use
+    LAZY_INDEXES = os.getenv('HBNB_LAZY_INDEXES', '0') == '1'
+    # Worker threads of the ASGI server for I/O-backed repositories
+    ASGI_THREADS = int(os.getenv('HBNB_ASGI_THREADS', '32'))
+
+    # Request metrics on /metrics, and profiles of slow requests for a
+    # sample of them (PROFILE_SAMPLE_RATE 0 disables profiling)
+    METRICS = os.getenv('HBNB_METRICS', '0') == '1'
+    PROFILE_SAMPLE_RATE = float(os.getenv('HBNB_PROFILE_SAMPLE_RATE', '0'))
+    PROFILE_SLOW_MS = float(os.getenv('HBNB_PROFILE_SLOW_MS', '500'))
+    PROFILE_DIR = os.getenv('HBNB_PROFILE_DIR', 'instance/profiles')
+
+    # Events kept by the in-process change feed (GET /api/v1/changes)
+    CHANGE_FEED_SIZE = int(os.getenv('HBNB_CHANGE_FEED_SIZE', '10000'))
+
+    # Memory cap and entry limit of the read endpoint response cache
+    RESPONSE_CACHE_BYTES = int(
+        os.getenv('HBNB_RESPONSE_CACHE_BYTES', str(16 * 1024 * 1024)))
+    RESPONSE_CACHE_ENTRIES = int(
+        os.getenv('HBNB_RESPONSE_CACHE_ENTRIES', '10000'))
+
 
 class DevelopmentConfig(Config):
     DEBUG = True
 
 
+class ProductionConfig(Config):
+    # New instances start serving before the side indexes are built
+    LAZY_INDEXES = True
+
+
 config = {
     'development': DevelopmentConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
@@ -0,0 +1,12 @@
+import sys
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("run_asgi.py needs uvicorn: "
+                 "pip install -r requirements-asgi.txt")
+    uvicorn.run(app, host='127.0.0.1', port=5000)
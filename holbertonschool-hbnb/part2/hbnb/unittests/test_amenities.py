@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+
+import unittest
+from app import create_app
+from app.services import facade
+
+
+class TestAmenityEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.client = self.app.test_client()
+        self.app.testing = True
+
+        facade.user_repo.clear()
+        facade.place_repo.clear()
+        facade.review_repo.clear()
+        facade.amenity_repo.clear()
+
+    def test_create_amenity_valid(self):
+        response = self.client.post(
+            '/api/v1/amenities/', json={"name": "Wi-Fi"})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()["name"], "Wi-Fi")
+
+    def test_create_amenity_empty_name(self):
+        response = self.client.post('/api/v1/amenities/', json={"name": ""})
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_amenity(self):
+        amenity_id = self.client.post(
+            '/api/v1/amenities/', json={"name": "Pool"}).get_json()["id"]
+
+        response = self.client.get(f'/api/v1/amenities/{amenity_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Pool")
+
+    def test_get_amenity_not_found(self):
+        response = self.client.get('/api/v1/amenities/nonexistent-id')
+        self.assertEqual(response.status_code, 404)
+
+    def test_update_amenity(self):
+        amenity_id = self.client.post(
+            '/api/v1/amenities/', json={"name": "Pool"}).get_json()["id"]
+
+        response = self.client.put(
+            f'/api/v1/amenities/{amenity_id}', json={"name": "Spa"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Spa")
+
+    def test_bulk_create_amenities(self):
+        response = self.client.post('/api/v1/amenities/bulk', json=[
+            {"name": "Wi-Fi"},
+            {"name": ""},
+            {"name": "Parking"}
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        results = response.get_json()
+        self.assertEqual(
+            [result["status"] for result in results], [201, 400, 201])
+        self.assertEqual(len(self.client.get('/api/v1/amenities/').get_json()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
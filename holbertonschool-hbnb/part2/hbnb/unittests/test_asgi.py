@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+
+import asyncio
+import json
+import threading
+import unittest
+from app import create_app
+from app.asgi import CHUNK_SIZE, ASGIApp
+from app.models.user import User
+from app.services import facade
+
+
+def http_scope(method, path, query_string=b'', headers=()):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'query_string': query_string,
+        'headers': list(headers),
+        'server': ('127.0.0.1', 5000),
+        'client': ('127.0.0.1', 40000),
+    }
+
+
+def run_asgi(app, scope, body_parts=(b'',)):
+    """Run one request through `app` and return the messages it sent."""
+    messages = [{'type': 'http.request', 'body': part, 'more_body': True}
+                for part in body_parts]
+    messages[-1]['more_body'] = False
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def response_of(sent):
+    """Return (status, headers dict, body) from the sent messages."""
+    headers = {name.decode(): value.decode()
+               for name, value in sent[0]['headers']}
+    body = b''.join(message['body'] for message in sent[1:])
+    return sent[0]['status'], headers, body
+
+
+class TestASGIApp(unittest.TestCase):
+
+    def setUp(self):
+        self.flask_app = create_app()
+        self.app = ASGIApp(self.flask_app)
+        facade.user_repo.clear()
+
+    def test_same_response_as_wsgi(self):
+        facade.create_user({"first_name": "John", "last_name": "Doe",
+                            "email": "john@example.com"})
+        status, headers, body = response_of(
+            run_asgi(self.app, http_scope('GET', '/api/v1/users/')))
+        expected = self.flask_app.test_client().get('/api/v1/users/')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['etag'], expected.headers['ETag'])
+        self.assertEqual(json.loads(body), expected.get_json())
+
+    def test_body_received_in_parts(self):
+        payload = json.dumps({"first_name": "Jane", "last_name": "Doe",
+                              "email": "jane@example.com"}).encode()
+        scope = http_scope('POST', '/api/v1/users/', headers=[
+            (b'content-type', b'application/json')])
+        status, _, body = response_of(
+            run_asgi(self.app, scope, [payload[:10], payload[10:]]))
+        self.assertEqual(status, 201)
+        self.assertEqual(json.loads(body)['email'], "jane@example.com")
+
+    def test_streamed_body_sent_in_chunks(self):
+        facade.user_repo.add_many([
+            User("John", "Doe", f"john{i}@example.com")
+            for i in range(2000)])
+        scope = http_scope('GET', '/api/v1/users/', headers=[
+            (b'accept', b'application/x-ndjson')])
+        sent = run_asgi(self.app, scope)
+        self.assertGreater(len(sent), 2)
+        self.assertTrue(all(message['more_body'] for message in sent[1:-1]))
+        self.assertTrue(all(len(message['body']) >= CHUNK_SIZE
+                            for message in sent[1:-1]))
+        _, _, body = response_of(sent)
+        self.assertEqual(len(body.splitlines()), 2000)
+
+    def test_blocking_runs_in_worker_threads(self):
+        threads = []
+
+        def wsgi_app(environ, start_response):
+            threads.append(threading.current_thread().name)
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return [environ['PATH_INFO'].encode()]
+
+        for blocking in (False, True):
+            app = ASGIApp(wsgi_app, blocking=blocking, max_threads=2)
+            _, _, body = response_of(run_asgi(app, http_scope('GET', '/x')))
+            app.close()
+            self.assertEqual(body, b'/x')
+        self.assertEqual(threads[0], threading.current_thread().name)
+        self.assertTrue(threads[1].startswith('hbnb-asgi'))
+
+    def test_event_stream_sent_per_event_from_a_thread(self):
+        threads = []
+
+        def wsgi_app(environ, start_response):
+            threads.append(threading.current_thread().name)
+            start_response('200 OK', [('Content-Type', 'text/event-stream')])
+            return iter([b'data: 1\n\n', b'data: 2\n\n'])
+
+        app = ASGIApp(wsgi_app, max_threads=2)
+        sent = run_asgi(app, http_scope('GET', '/api/v1/changes/'))
+        app.close()
+        self.assertEqual([message['body'] for message in sent[1:]],
+                         [b'data: 1\n\n', b'data: 2\n\n', b''])
+        self.assertTrue(threads[0].startswith('hbnb-asgi'))
+
+    def test_client_gone_before_body(self):
+        sent = []
+
+        async def receive():
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(self.app(http_scope('GET', '/api/v1/users/'),
+                             receive, send))
+        self.assertEqual(sent, [])
+
+    def test_lifespan(self):
+        messages = [{'type': 'lifespan.startup'},
+                    {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(self.app({'type': 'lifespan'}, receive, send))
+        self.assertEqual(sent, ['lifespan.startup.complete',
+                                'lifespan.shutdown.complete'])
+
+
+if __name__ == '__main__':
+    unittest.main()
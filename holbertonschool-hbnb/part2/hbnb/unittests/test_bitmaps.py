@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+
+import unittest
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import columns
+from app.persistence.bitmaps import (
+    BitmapIndex, bitmap_from_rows, iter_rows, popcount)
+from app.persistence.columns import ColumnStore
+
+
+class TestBitmaps(unittest.TestCase):
+
+    def test_rows_round_trip(self):
+        rows = [0, 3, 7, 8, 64, 1000]
+        bitmap = bitmap_from_rows(rows)
+        self.assertEqual(bitmap, sum(1 << row for row in rows))
+        self.assertEqual(list(iter_rows(bitmap)), rows)
+        self.assertEqual(popcount(bitmap), len(rows))
+        self.assertEqual(list(iter_rows(0)), [])
+        self.assertEqual(bitmap_from_rows([]), 0)
+
+
+class TestBitmapIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = BitmapIndex()
+        self.index.set(0, ['wifi', 'pool'])
+        self.index.set(1, ['wifi'])
+        self.index.set(2, ['pool', 'parking'])
+
+    def rows(self, *values, bitmap=0b111):
+        return list(iter_rows(self.index.intersect(values, bitmap)))
+
+    def test_intersect(self):
+        self.assertEqual(self.rows('wifi'), [0, 1])
+        self.assertEqual(self.rows('wifi', 'pool'), [0])
+        self.assertEqual(self.rows('wifi', 'sauna'), [])
+        self.assertEqual(self.rows('pool', bitmap=0b011), [0])
+        self.assertEqual(self.rows(), [0, 1, 2])
+
+    def test_counts(self):
+        self.assertEqual(self.index.counts(0b111),
+                         {'wifi': 2, 'pool': 2, 'parking': 1})
+        self.assertEqual(self.index.counts(0b010), {'wifi': 1})
+
+    def test_set_replaces_values(self):
+        self.index.set(1, ['parking'])
+        self.assertEqual(self.rows('wifi'), [0])
+        self.assertEqual(self.rows('parking'), [1, 2])
+
+    def test_discard_and_move(self):
+        # Row 0 is removed and row 2 moved into it, as a ColumnStore does
+        self.index.discard(0)
+        self.index.move(2, 0)
+        self.assertEqual(self.rows('pool'), [0])
+        self.assertEqual(self.rows('wifi'), [1])
+        self.assertEqual(self.index.bitmap('parking'), 0b001)
+        self.index.discard(0)
+        self.index.discard(1)
+        self.assertEqual(len(self.index), 0)
+
+
+class TestRangeBitmap(unittest.TestCase):
+
+    def setUp(self):
+        owner = User("John", "Doe", "john@example.com")
+        self.store = ColumnStore(('price',))
+        self.places = [Place(f"Place {price}", "", price, 0, 0, owner)
+                       for price in (120, 80, 200, 50)]
+        for place in self.places:
+            self.store.add(place)
+
+    def test_matches_range_query(self):
+        self.assertEqual(self.store.range_bitmap(), 0b1111)
+        self.assertEqual(self.store.range_bitmap(price=(None, None)), 0b1111)
+        numpy = columns.numpy
+        for module in (numpy, None):
+            columns.numpy = module
+            try:
+                self.assertEqual(self.store.range_bitmap(price=(75, 150)),
+                                 0b0011)
+                self.assertEqual(self.store.range_bitmap(price=(500, None)),
+                                 0)
+            finally:
+                columns.numpy = numpy
+
+    def test_remove_reports_moved_row(self):
+        first, _, _, last = self.places
+        self.assertEqual(self.store.remove(first.id), (0, 3))
+        self.assertEqual(self.store.rows[last.id], 0)
+        self.assertEqual(self.store.remove(last.id), (0, 2))
+        self.assertEqual(self.store.remove(self.places[1].id), (1, None))
+        self.assertIsNone(self.store.remove(first.id))
+
+
+if __name__ == '__main__':
+    unittest.main()
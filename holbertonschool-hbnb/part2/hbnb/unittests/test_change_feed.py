@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import uuid
+from app import create_app
+from app.models.user import User
+from app.persistence.change_feed import ChangeFeed
+from app.persistence.repository import InMemoryRepository
+from app.persistence.sqlite_repository import SQLiteRepository
+from app.services import facade
+
+
+def summary(events):
+    return [(event.type, event.obj_id) for event in events]
+
+
+class TestChangeFeed(unittest.TestCase):
+
+    def test_since_returns_events_in_order(self):
+        feed = ChangeFeed()
+        feed.publish('created', 'users', ['a', 'b'])
+        feed.publish('updated', 'users', ['a'], ['email'])
+        self.assertEqual(feed.last_seq, 3)
+        events = feed.since(1)
+        self.assertEqual([event.seq for event in events], [2, 3])
+        self.assertEqual(events[1].to_dict()['fields'], ['email'])
+        self.assertEqual(len(feed.since(0, limit=2)), 2)
+        self.assertEqual(feed.since(3), [])
+
+    def test_ring_buffer_drops_oldest_events(self):
+        feed = ChangeFeed(size=3)
+        feed.publish('created', 'users', ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(feed.first_seq, 3)
+        self.assertIsNone(feed.since(1))
+        self.assertEqual(summary(feed.since(2)),
+                         [('created', 'c'), ('created', 'd'),
+                          ('created', 'e')])
+        # A sequence number from before a restart
+        self.assertIsNone(feed.since(10))
+
+    def test_cursor_of_a_restarted_feed_is_rejected(self):
+        before = ChangeFeed()
+        before.publish('created', 'users', ['a', 'b', 'c', 'd', 'e'])
+        cursor = before.cursor(before.last_seq)
+        # The process restarts and its new feed gets further than 5
+        after = ChangeFeed()
+        after.publish('created', 'users', list('fghijklmno'))
+        self.assertNotEqual(after.epoch, before.epoch)
+        self.assertIsNone(after.parse_cursor(cursor))
+        self.assertEqual(before.parse_cursor(cursor), 5)
+        self.assertEqual(after.parse_cursor('3'), 3)
+        for invalid in ('', 'x', f'{after.epoch}:-1', f'{after.epoch}:'):
+            with self.assertRaises(ValueError):
+                after.parse_cursor(invalid)
+
+    def test_wait_wakes_up_on_publish(self):
+        feed = ChangeFeed()
+        self.assertFalse(feed.wait(0, timeout=0.01))
+        timer = threading.Timer(
+            0.05, feed.publish, ('deleted', 'users', ['a']))
+        timer.start()
+        self.assertTrue(feed.wait(0, timeout=5))
+        timer.join()
+
+
+class TestRepositoryEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.feed = ChangeFeed()
+
+    def check_writes(self, repo):
+        repo.attach_feed(self.feed, 'users')
+        user = User("John", "Doe", "john@example.com")
+        other = User("Jane", "Doe", "jane@example.com")
+        repo.add(user)
+        repo.add_many([other])
+        repo.update(user.id, {'first_name': 'John'})
+        repo.update(user.id, {'first_name': 'Jack', 'last_name': 'Roe'})
+        repo.delete(other.id)
+        repo.delete(other.id)
+        events = self.feed.since(0)
+        self.assertEqual(summary(events), [
+            ('created', user.id), ('created', other.id),
+            ('updated', user.id), ('deleted', other.id)])
+        self.assertEqual(events[2].fields, ('first_name', 'last_name'))
+        self.assertEqual({event.collection for event in events}, {'users'})
+
+    def test_in_memory_repository(self):
+        self.check_writes(InMemoryRepository(unique_indexes=['email']))
+
+    def test_sqlite_repository(self):
+        directory = tempfile.mkdtemp()
+        repo = SQLiteRepository(os.path.join(directory, 'hbnb.db'),
+                                'users', User, unique_indexes=['email'])
+        try:
+            self.check_writes(repo)
+
+            # A rolled back batch publishes nothing
+            last = self.feed.last_seq
+            with self.assertRaises(ValueError):
+                with repo.batch():
+                    repo.add(User("Ann", "Doe", "ann@example.com"))
+                    repo.add(User("Ann", "Doe", "ann@example.com"))
+            self.assertEqual(self.feed.last_seq, last)
+        finally:
+            repo.close()
+            shutil.rmtree(directory)
+
+
+class TestChangeEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.client = create_app().test_client()
+        facade.user_repo.clear()
+        facade.place_repo.clear()
+        self.since = facade.changes.last_seq
+
+    def create_user(self, email="john@example.com"):
+        return facade.create_user(
+            {"first_name": "John", "last_name": "Doe", "email": email})
+
+    def test_events_after_since(self):
+        user = self.create_user()
+        facade.update_user(user.id, {"last_name": "Roe"})
+        response = self.client.get(f'/api/v1/changes/?since={self.since}')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(
+            [(event['type'], event['id']) for event in data['events']],
+            [('created', user.id), ('updated', user.id)])
+        self.assertEqual(data['events'][1]['fields'], ['last_name'])
+        self.assertEqual(data['epoch'], facade.changes.epoch)
+        self.assertEqual(data['next'],
+                         f"{data['epoch']}:{data['last_seq']}")
+
+        response = self.client.get(f'/api/v1/changes/?since={data["next"]}')
+        self.assertEqual(response.get_json()['events'], [])
+
+    def test_collections_filter(self):
+        self.create_user()
+        response = self.client.get(
+            f'/api/v1/changes/?since={self.since}&collections=places')
+        data = response.get_json()
+        self.assertEqual(data['events'], [])
+        self.assertEqual(data['next'],
+                         facade.changes.cursor(facade.changes.last_seq))
+
+        response = self.client.get('/api/v1/changes/?collections=rooms')
+        self.assertEqual(response.status_code, 400)
+
+    def test_long_poll(self):
+        timer = threading.Timer(0.05, self.create_user)
+        timer.start()
+        start = time.monotonic()
+        response = self.client.get(
+            f'/api/v1/changes/?since={self.since}&wait=5')
+        timer.join()
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(len(response.get_json()['events']), 1)
+
+    def test_dropped_events(self):
+        facade.changes.clear()
+        self.create_user()
+        # The 'cleared' event of setUp() is gone
+        response = self.client.get(
+            f'/api/v1/changes/?since={self.since - 1}')
+        self.assertEqual(response.status_code, 410)
+        response = self.client.get(f'/api/v1/changes/?since={self.since}')
+        self.assertEqual(len(response.get_json()['events']), 1)
+
+    def test_cursor_from_before_a_restart(self):
+        for _ in range(3):
+            self.create_user(f"{uuid.uuid4()}@example.com")
+        # Same sequence number, epoch of an earlier process
+        response = self.client.get(
+            f'/api/v1/changes/?since=0123456789ab:{self.since}')
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.get_json()['epoch'], facade.changes.epoch)
+        response = self.client.get('/api/v1/changes/?since=abc')
+        self.assertEqual(response.status_code, 400)
+
+    def test_event_stream(self):
+        first = self.create_user()
+        second = self.create_user("jane@example.com")
+        response = self.client.get(
+            '/api/v1/changes/?limit=1',
+            headers={'Accept': 'text/event-stream',
+                     'Last-Event-ID': str(self.since + 1)})
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        body = response.get_data(as_text=True)
+        self.assertIn(f'id: {facade.changes.epoch}:{self.since + 2}\n'
+                      f'event: created\n', body)
+        self.assertIn(second.id, body)
+        self.assertNotIn(first.id, body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+
+import unittest
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import columns
+from app.persistence.columns import ColumnStore
+from app.services.facade import HBnBFacade
+
+
+class TestColumnStore(unittest.TestCase):
+
+    def setUp(self):
+        self.owner = User("John", "Doe", "john@example.com")
+        self.store = ColumnStore(('latitude', 'longitude', 'price'))
+        self.places = [
+            Place("Paris", "", 120, 48.85, 2.35, self.owner),
+            Place("Lyon", "", 80, 45.76, 4.83, self.owner),
+            Place("Nice", "", 200, 43.70, 7.26, self.owner),
+        ]
+        for place in self.places:
+            self.store.add(place)
+
+    def query(self, **bounds):
+        return set(self.store.range_query(**bounds))
+
+    def test_price_range(self):
+        paris, lyon, nice = self.places
+        self.assertEqual(self.query(price=(100, None)), {paris.id, nice.id})
+        self.assertEqual(self.query(price=(80, 120)), {paris.id, lyon.id})
+
+    def test_bounding_box(self):
+        paris, lyon, nice = self.places
+        self.assertEqual(
+            self.query(latitude=(45, 50), longitude=(2, 5)),
+            {paris.id, lyon.id})
+
+    def test_update_and_remove(self):
+        paris, lyon, nice = self.places
+        paris.price = 50
+        self.store.update(paris)
+        self.assertEqual(self.query(price=(None, 90)), {paris.id, lyon.id})
+
+        self.store.remove(paris.id)
+        self.assertEqual(self.query(price=(None, 90)), {lyon.id})
+        self.assertEqual(self.store.value(nice.id, 'price'), 200)
+        self.assertEqual(len(self.store), 2)
+
+    def test_python_fallback_matches(self):
+        numpy = columns.numpy
+        columns.numpy = None
+        try:
+            fallback = self.query(price=(90, None), longitude=(None, 5))
+        finally:
+            columns.numpy = numpy
+        self.assertEqual(fallback, self.query(price=(90, None),
+                                              longitude=(None, 5)))
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            self.store.range_query(rating=(1, 5))
+
+
+class TestFacadePlaceRanges(unittest.TestCase):
+
+    def test_columns_follow_create_and_update(self):
+        facade = HBnBFacade()
+        owner = facade.create_user({
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "john@example.com"
+        })
+        place = facade.create_place({
+            "title": "Test Place",
+            "price": 100,
+            "latitude": 45,
+            "longitude": 3,
+            "owner_id": owner.id
+        })
+        self.assertEqual(facade.get_places_in_range(max_price=150), [place])
+
+        facade.update_place(place.id, {"price": 300})
+        self.assertEqual(facade.get_places_in_range(max_price=150), [])
+        self.assertEqual(
+            facade.get_places_in_range(min_latitude=44, max_latitude=46),
+            [place])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+
+import tempfile
+import threading
+import unittest
+from app.models.user import User
+from app.persistence.concurrency import (
+    ReadWriteLock, ThreadSafeRepository, thread_safe_repository_factory)
+from app.persistence.file_repository import ThreadSafeFileRepository
+from app.services.facade import HBnBFacade
+
+
+def run_threads(target, count):
+    """Start `count` threads running target(i) at the same time."""
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        target(i)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestReadWriteLock(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = ReadWriteLock()
+
+    def test_readers_share_the_lock(self):
+        inside = threading.Barrier(2, timeout=5)
+
+        def reader(i):
+            with self.lock.read():
+                # Both readers must be inside at once to pass
+                inside.wait()
+
+        run_threads(reader, 2)
+
+    def test_writer_excludes_readers(self):
+        events = []
+        self.lock.acquire_write()
+        reader = threading.Thread(target=lambda: (
+            self.lock.acquire_read(), events.append('read'),
+            self.lock.release_read()))
+        reader.start()
+        reader.join(0.1)
+        events.append('write done')
+        self.lock.release_write()
+        reader.join()
+        self.assertEqual(events, ['write done', 'read'])
+
+    def test_reentrant(self):
+        with self.lock.write():
+            with self.lock.write():
+                with self.lock.read():
+                    pass
+        with self.lock.read():
+            with self.lock.read():
+                pass
+        # Fully released: a writer gets in
+        with self.lock.write():
+            pass
+
+    def test_no_upgrade(self):
+        with self.lock.read():
+            with self.assertRaises(RuntimeError):
+                self.lock.acquire_write()
+
+
+class TestThreadSafeRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ThreadSafeRepository(unique_indexes=['email'])
+
+    def test_unique_insert_is_atomic(self):
+        errors = []
+
+        def register(i):
+            try:
+                self.repo.add(User("John", "Doe", "same@example.com"))
+            except ValueError as error:
+                errors.append(error)
+
+        run_threads(register, 8)
+        self.assertEqual(len(self.repo.get_all()), 1)
+        self.assertEqual(len(errors), 7)
+
+    def test_concurrent_writes_and_reads(self):
+        def work(i):
+            for j in range(200):
+                user = User("John", "Doe", f"user{i}-{j}@example.com")
+                self.repo.add(user)
+                self.assertIs(
+                    self.repo.get_by_attribute('email', user.email), user)
+                self.repo.get_page(10)
+
+        run_threads(work, 4)
+        self.assertEqual(len(self.repo.get_all()), 800)
+        items, _ = self.repo.get_page(1000)
+        self.assertEqual(len(items), 800)
+
+    def test_file_repository_variant(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repo = ThreadSafeFileRepository(
+                f"{directory}/users", User, unique_indexes=['email'])
+
+            def work(i):
+                for j in range(50):
+                    repo.add(User("John", "Doe", f"u{i}-{j}@example.com"))
+
+            run_threads(work, 4)
+            repo.close()
+            reloaded = ThreadSafeFileRepository(f"{directory}/users", User)
+            self.assertEqual(len(reloaded.get_all()), 200)
+            reloaded.close()
+
+
+class TestThreadSafeFacade(unittest.TestCase):
+
+    def setUp(self):
+        self.facade = HBnBFacade(thread_safe_repository_factory)
+        self.owner = self.facade.create_user({
+            "first_name": "John", "last_name": "Doe",
+            "email": "owner@example.com"})
+        self.place = self.facade.create_place({
+            "title": "Loft", "description": "", "price": 100,
+            "latitude": 45, "longitude": 3,
+            "owner_id": self.owner.id, "amenities": []})
+
+    def test_concurrent_review_deletes_count_once(self):
+        review = self.facade.create_review({
+            "text": "Great", "rating": 5,
+            "user_id": self.owner.id, "place_id": self.place.id})
+        results = []
+        run_threads(
+            lambda i: results.append(self.facade.delete_review(review.id)), 8)
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(self.facade.get_place_rating(self.place.id)['count'], 0)
+
+    def test_concurrent_bulk_signups(self):
+        results = []
+
+        def signup(i):
+            results.extend(self.facade.create_users([
+                {"first_name": "A", "last_name": "B",
+                 "email": f"shared{j}@example.com"} for j in range(20)]))
+
+        run_threads(signup, 4)
+        created = [user for user, error in results if user is not None]
+        self.assertEqual(len(created), 20)
+        self.assertEqual(len(self.facade.get_all_users()), 21)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+#!/usr/bin/python3
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from app.models.user import User
+from app.persistence.file_repository import (
+    FileRepository, ThreadSafeFileRepository, file_repository_factory)
+from app.services.facade import HBnBFacade
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class LockCheckedFile:
+    """File wrapper recording the writes made without `lock` held."""
+
+    def __init__(self, file, lock):
+        self.file = file
+        self.lock = lock
+        self.unlocked_calls = []
+
+    def write(self, data):
+        if not self.lock.locked():
+            self.unlocked_calls.append('write')
+        return self.file.write(data)
+
+    def flush(self):
+        if not self.lock.locked():
+            self.unlocked_calls.append('flush')
+        self.file.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+class TestFileRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'users')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open_repo(self, **options):
+        return FileRepository(
+            self.path, User, unique_indexes=['email'], **options)
+
+    def test_replay_log(self):
+        repo = self.open_repo()
+        user = User("John", "Doe", "john@example.com")
+        repo.add(user)
+        repo.update(user.id, {'first_name': 'Jack'})
+        repo.add(User("Jane", "Doe", "jane@example.com"))
+        repo.delete(repo.get_by_attribute('email', 'jane@example.com').id)
+        repo.close()
+
+        reopened = self.open_repo()
+        self.assertEqual(len(reopened.get_all()), 1)
+        restored = reopened.get(user.id)
+        self.assertEqual(restored.first_name, 'Jack')
+        self.assertEqual(restored.created_at, user.created_at)
+        self.assertIs(
+            reopened.get_by_attribute('email', 'john@example.com'), restored)
+        reopened.close()
+
+    def test_update_logs_changed_fields_only(self):
+        repo = self.open_repo()
+        user = User("John", "Doe", "john@example.com")
+        repo.add(user)
+        repo.update(user.id, {'first_name': 'John'})
+        repo.update(user.id, {'first_name': 'Jack', 'last_name': 'Doe'})
+        repo.close()
+
+        with open(repo.log_path) as log:
+            entries = [json.loads(line) for line in log]
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[1]['op'], 'patch')
+        self.assertEqual(sorted(entries[1]['data']),
+                         ['_updated', 'first_name'])
+
+        reopened = self.open_repo()
+        restored = reopened.get(user.id)
+        self.assertEqual(restored.first_name, 'Jack')
+        self.assertEqual(restored.updated_at, user.updated_at)
+        reopened.close()
+
+    def test_compaction_writes_snapshot_and_truncates_log(self):
+        repo = self.open_repo(compact_every=3)
+        for i in range(4):
+            repo.add(User("John", "Doe", f"john{i}@example.com"))
+        repo.close()
+
+        self.assertTrue(os.path.exists(repo.snapshot_path))
+        with open(repo.log_path) as log:
+            self.assertEqual(len(log.readlines()), 1)
+
+        reopened = self.open_repo()
+        self.assertEqual(len(reopened.get_all()), 4)
+        reopened.close()
+
+    def test_torn_tail_is_ignored(self):
+        repo = self.open_repo()
+        repo.add(User("John", "Doe", "john@example.com"))
+        repo.close()
+        with open(repo.log_path, 'a') as log:
+            log.write('{"op": "add", "id"')
+
+        reopened = self.open_repo()
+        self.assertEqual(len(reopened.get_all()), 1)
+        reopened.add(User("Jane", "Doe", "jane@example.com"))
+        reopened.close()
+
+        self.assertEqual(len(self.open_repo().get_all()), 2)
+
+    def crash_after_write(self, idle):
+        """Add a user in a child process killed without closing."""
+        subprocess.run(
+            [sys.executable, '-c',
+             'import os, sys, time\n'
+             'from app.models.user import User\n'
+             'from app.persistence.file_repository import FileRepository\n'
+             'repo = FileRepository(sys.argv[1], User)\n'
+             'repo.add(User("John", "Doe", "john@example.com"))\n'
+             'time.sleep(float(sys.argv[2]))\n'
+             'os._exit(0)\n',
+             self.path, str(idle)],
+            cwd=PROJECT_ROOT, check=True)
+
+    def test_acknowledged_write_survives_crash(self):
+        for idle in (0, 0.2):
+            self.crash_after_write(idle)
+            reopened = self.open_repo()
+            self.assertEqual(len(reopened.get_all()), 1, idle)
+            reopened.clear()
+            reopened.close()
+
+    def test_idle_writes_are_synced(self):
+        repo = ThreadSafeFileRepository(self.path, User, fsync_every=64,
+                                        fsync_interval=0.02)
+        try:
+            repo.add(User("John", "Doe", "john@example.com"))
+            self.assertEqual(repo._pending, 1)
+            deadline = time.monotonic() + 5
+            while repo._pending and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(repo._pending, 0)
+        finally:
+            repo.close()
+
+    def test_writes_during_timed_syncs(self):
+        repo = self.open_repo(fsync_every=10 ** 6, fsync_interval=0.002,
+                              compact_every=0)
+        timed_syncs = []
+        timed_sync = repo._timed_sync
+
+        def count():
+            timed_syncs.append(1)
+            timed_sync()
+        repo._timed_sync = count
+        repo._log = LockCheckedFile(repo._log, repo._sync_lock)
+
+        added = 0
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline or not timed_syncs:
+            repo.add(User("John", "Doe", f"john{added}@example.com"))
+            added += 1
+        repo.close()
+
+        self.assertTrue(timed_syncs)
+        self.assertFalse(repo._log.unlocked_calls)
+        with open(repo.log_path) as log:
+            self.assertEqual(len([json.loads(line) for line in log]),
+                             added)
+        reopened = self.open_repo()
+        self.assertEqual(len(reopened.get_all()), added)
+        reopened.close()
+
+    def test_facade_resolves_references_after_restart(self):
+        facade = HBnBFacade(file_repository_factory(self.directory))
+        owner = facade.create_user({
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "john@example.com"
+        })
+        place = facade.create_place({
+            "title": "Test Place",
+            "price": 100,
+            "latitude": 45,
+            "longitude": 3,
+            "owner_id": owner.id
+        })
+        for repo in facade._repositories().values():
+            repo.close()
+
+        restarted = HBnBFacade(file_repository_factory(self.directory))
+        restored = restarted.get_place(place.id)
+        self.assertIs(restored.owner, restarted.get_user(owner.id))
+        self.assertEqual(
+            restarted.place_repo.get_all_by_attribute('owner', restored.owner),
+            [restored])
+
+
+if __name__ == '__main__':
+    unittest.main()
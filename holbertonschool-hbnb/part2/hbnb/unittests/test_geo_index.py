@@ -0,0 +1,51 @@
+#!/usr/bin/python3
+
+import random
+import unittest
+from app.persistence.geo_index import GridIndex, haversine_km
+
+
+class TestGridIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = GridIndex(cell_deg=1.0)
+        rng = random.Random(7)
+        self.points = {
+            f"p{i}": (rng.uniform(-90, 90), rng.uniform(-180, 180))
+            for i in range(2000)
+        }
+        for obj_id, (lat, lon) in self.points.items():
+            self.index.add(obj_id, lat, lon)
+
+    def brute_force(self, lat, lon, radius_km, limit):
+        matches = sorted(
+            (haversine_km(lat, lon, p_lat, p_lon), obj_id)
+            for obj_id, (p_lat, p_lon) in self.points.items())
+        return [m for m in matches if m[0] <= radius_km][:limit]
+
+    def test_haversine(self):
+        # Paris - Lyon is about 392 km
+        self.assertAlmostEqual(
+            haversine_km(48.8566, 2.3522, 45.7640, 4.8357), 392, delta=3)
+
+    def test_matches_brute_force(self):
+        for lat, lon in [(0, 0), (45, 3), (-60, 120), (89.5, 10),
+                         (10, 179.9), (-10, -179.9)]:
+            self.assertEqual(
+                self.index.nearest(lat, lon, 1500, 5),
+                self.brute_force(lat, lon, 1500, 5))
+
+    def test_move_and_remove(self):
+        self.index.add("home", 48.85, 2.35)
+        self.assertEqual(self.index.nearest(48.85, 2.35, 1, 1)[0][1], "home")
+
+        self.index.add("home", -33.87, 151.21)
+        self.assertEqual(self.index.nearest(48.85, 2.35, 1, 1), [])
+
+        self.index.remove("home")
+        self.assertEqual(self.index.nearest(-33.87, 151.21, 1, 1), [])
+        self.assertEqual(len(self.index), 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+
+import os
+import threading
+import unittest
+import uuid
+from app.models.base_model import set_id_generator
+from app.models.ids import TimeOrderedIds, uuid4_id
+from app.models.user import User
+
+
+class TestTimeOrderedIds(unittest.TestCase):
+
+    def setUp(self):
+        self.generate = TimeOrderedIds(pool_size=16)
+
+    def test_uuid_version_7(self):
+        micros = 1_700_000_000_123_456
+        value = uuid.UUID(self.generate(micros))
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+        self.assertEqual(value.int >> 80, micros // 1000)
+
+    def test_sorted_by_time(self):
+        ids = [self.generate(micros)
+               for micros in range(1_700_000_000_000_000,
+                                   1_700_000_000_100_000, 333)]
+        self.assertEqual(ids, sorted(ids))
+
+    def test_unique_across_pool_refills(self):
+        ids = {self.generate(1_700_000_000_000_000) for _ in range(1000)}
+        self.assertEqual(len(ids), 1000)
+
+    def test_unique_across_threads(self):
+        results = []
+
+        def worker():
+            results.extend(self.generate(1_700_000_000_000_000)
+                           for _ in range(500))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(results)), 2000)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires fork()")
+    def test_child_does_not_reuse_parent_pool(self):
+        self.generate(0)
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            os.write(write_end, self.generate(0).encode())
+            os._exit(0)
+        os.close(write_end)
+        child_id = os.read(read_end, 64).decode()
+        os.close(read_end)
+        os.waitpid(pid, 0)
+        self.assertNotEqual(child_id, self.generate(0))
+
+
+class TestIdGenerator(unittest.TestCase):
+
+    def test_models_use_time_ordered_ids(self):
+        user = User("John", "Doe", "john@example.com")
+        self.assertEqual(uuid.UUID(user.id).version, 7)
+        self.assertEqual(uuid.UUID(user.id).int >> 80, user._created // 1000)
+
+    def test_set_id_generator(self):
+        previous = set_id_generator(uuid4_id)
+        try:
+            user = User("John", "Doe", "john@example.com")
+        finally:
+            set_id_generator(previous)
+        self.assertEqual(uuid.UUID(user.id).version, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+
+import os
+import shutil
+import tempfile
+import unittest
+from app import create_app
+from app.api.metrics import init_metrics
+from app.services import app_metrics, facade
+from app.services.metrics import Histogram, Metrics
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_quantiles(self):
+        histogram = Histogram((0.01, 0.1, 1.0))
+        for _ in range(90):
+            histogram.observe(0.005)
+        for _ in range(10):
+            histogram.observe(0.5)
+        self.assertEqual(histogram.counts, [90, 0, 10, 0])
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.01 * 50 / 90)
+        self.assertAlmostEqual(histogram.quantile(0.95), 0.1 + 0.9 * 0.5)
+        self.assertAlmostEqual(histogram.quantile(0.99), 0.1 + 0.9 * 0.9)
+        self.assertIsNone(Histogram().quantile(0.5))
+
+    def test_overflow_reported_as_last_bound(self):
+        histogram = Histogram((0.01, 0.1))
+        histogram.observe(30)
+        self.assertEqual(histogram.quantile(0.99), 0.1)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = Metrics(buckets=(0.1, 1.0))
+
+    def test_render(self):
+        self.metrics.observe_request('GET', '/api/v1/users/', 200, 0.05)
+        self.metrics.observe_request('GET', '/api/v1/users/', 200, 0.5)
+        self.metrics.observe_span('facade.get_user', 2.0)
+        text = self.metrics.render({'hbnb_response_cache_hits': 3})
+        labels = 'method="GET",endpoint="/api/v1/users/"'
+        self.assertIn(
+            f'hbnb_requests_total{{{labels},status="200"}} 2', text)
+        self.assertIn(
+            f'hbnb_request_duration_seconds_bucket{{{labels},le="0.1"}} 1',
+            text)
+        self.assertIn(
+            f'hbnb_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2',
+            text)
+        self.assertIn(f'hbnb_request_duration_seconds_count{{{labels}}} 2',
+                      text)
+        self.assertIn(
+            f'hbnb_request_latency_quantile_seconds{{{labels},'
+            f'quantile="0.5"}} 0.1', text)
+        self.assertIn('hbnb_span_duration_seconds_bucket{span='
+                      '"facade.get_user",le="1.0"} 0', text)
+        self.assertIn('hbnb_response_cache_hits 3', text)
+
+    def test_instrument(self):
+        class Service:
+            def double(self, value):
+                return value * 2
+
+            def _private(self):
+                return None
+
+        service = Service()
+        self.metrics.instrument(service, 'service')
+        self.metrics.instrument(service, 'service')
+        self.assertEqual(service.double(2), 4)
+        self.assertNotIn('_private', vars(service))
+        self.assertIn('span="service.double",le="+Inf"} 1',
+                      self.metrics.render())
+
+
+class TestMetricsMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.app = create_app()
+        facade.user_repo.clear()
+        app_metrics.reset()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_requests_and_spans(self):
+        init_metrics(self.app)
+        client = self.app.test_client()
+        user = facade.create_user({"first_name": "John", "last_name": "Doe",
+                                   "email": "john@example.com"})
+        client.get(f'/api/v1/users/{user.id}')
+        client.get('/api/v1/users/unknown')
+
+        response = client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.get_data(as_text=True)
+        labels = 'method="GET",endpoint="/api/v1/users/<user_id>"'
+        self.assertIn(f'hbnb_requests_total{{{labels},status="200"}} 1',
+                      text)
+        self.assertIn(f'hbnb_requests_total{{{labels},status="404"}} 1',
+                      text)
+        self.assertIn('span="facade.get_user"', text)
+        self.assertIn('span="repository.users.get"', text)
+        self.assertIn('hbnb_response_cache_misses', text)
+
+    def test_slow_requests_profiled(self):
+        init_metrics(self.app, profile_dir=self.directory, sample_rate=1.0,
+                     slow_ms=0)
+        self.app.test_client().get('/api/v1/users/')
+        dumps = os.listdir(self.directory)
+        self.assertEqual(len(dumps), 1)
+        self.assertIn('GET_api_v1_users', dumps[0])
+
+    def test_fast_requests_not_dumped(self):
+        init_metrics(self.app, profile_dir=self.directory, sample_rate=1.0,
+                     slow_ms=60_000)
+        self.app.test_client().get('/api/v1/users/')
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -220,6 +220,29 @@ class TestPlaceEndpoints(unittest.TestCase):
 
         self.assertEqual(response.status_code, 400)
 
+    def test_create_place_with_amenities(self):
+        owner_id = self.create_test_user()
+        amenity_ids = [facade.create_amenity({"name": name}).id
+                       for name in ("Wi-Fi", "Pool")]
+        payload = self.create_place_payload(owner_id)
+        payload["amenities"] = amenity_ids
+
+        response = self.client.post('/api/v1/places/', json=payload)
+        self.assertEqual(response.status_code, 201)
+        place = facade.get_place(response.get_json()["id"])
+        self.assertCountEqual([a.id for a in place.amenities], amenity_ids)
+
+    def test_create_place_reports_all_missing_amenities(self):
+        owner_id = self.create_test_user()
+        amenity_id = facade.create_amenity({"name": "Wi-Fi"}).id
+        payload = self.create_place_payload(owner_id)
+        payload["amenities"] = ["missing-1", amenity_id, "missing-2"]
+
+        response = self.client.post('/api/v1/places/', json=payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("missing-1, missing-2", response.get_data(as_text=True))
+        self.assertEqual(facade.get_all_places(), [])
+
     def test_get_place_by_id_valid(self):
         owner_id = self.create_test_user()
 
@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 
+import json
 import unittest
 import uuid
 from app import create_app
@@ -241,6 +242,128 @@ class TestPlaceEndpoints(unittest.TestCase):
         self.assertEqual(data["title"], "Test Place")
         self.assertEqual(data["owner"]["id"], owner_id)
 
+    def test_stream_places_ndjson(self):
+        owner_id = self.create_test_user()
+        for _ in range(3):
+            self.client.post(
+                '/api/v1/places/',
+                json=self.create_place_payload(owner_id)
+            )
+        expected = self.client.get('/api/v1/places/').get_json()
+
+        response = self.client.get(
+            '/api/v1/places/', headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.status_code, 200)
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertCountEqual([json.loads(line) for line in lines], expected)
+
+    def test_get_place_etag(self):
+        owner_id = self.create_test_user()
+        place_id = self.client.post(
+            '/api/v1/places/',
+            json=self.create_place_payload(owner_id)
+        ).get_json()["id"]
+
+        etag = self.client.get(f'/api/v1/places/{place_id}').headers["ETag"]
+        response = self.client.get(
+            f'/api/v1/places/{place_id}', headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        # A change to the owner is part of the response, so of the tag
+        self.client.put(f'/api/v1/users/{owner_id}', json={
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "email": f"jane{uuid.uuid4()}@example.com"
+        })
+        response = self.client.get(
+            f'/api/v1/places/{place_id}', headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["owner"]["first_name"], "Jane")
+
+    def test_noop_update_keeps_etag(self):
+        owner_id = self.create_test_user()
+        payload = self.create_place_payload(owner_id)
+        place_id = self.client.post(
+            '/api/v1/places/', json=payload).get_json()["id"]
+
+        etag = self.client.get(f'/api/v1/places/{place_id}').headers["ETag"]
+        response = self.client.put(f'/api/v1/places/{place_id}', json={
+            "title": payload["title"], "price": payload["price"]})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            f'/api/v1/places/{place_id}', headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_place_fields_and_expand(self):
+        owner_id = self.create_test_user()
+        amenity_id = facade.create_amenity({"name": "Wi-Fi"}).id
+        payload = self.create_place_payload(owner_id)
+        payload["amenities"] = [amenity_id]
+        place_id = self.client.post(
+            '/api/v1/places/', json=payload).get_json()["id"]
+
+        response = self.client.get(
+            f'/api/v1/places/{place_id}?fields=title,price')
+        self.assertEqual(response.get_json(),
+                         {"title": "Test Place", "price": 100.0})
+
+        data = self.client.get(
+            f'/api/v1/places/{place_id}?expand=owner').get_json()
+        self.assertEqual(data["owner"]["id"], owner_id)
+        self.assertEqual(data["amenity_ids"], [amenity_id])
+        self.assertNotIn("amenities", data)
+        self.assertIn("rating", data)
+
+        data = self.client.get(
+            f'/api/v1/places/{place_id}?expand=').get_json()
+        self.assertEqual(data["owner_id"], owner_id)
+        self.assertNotIn("owner", data)
+
+        data = self.client.get(
+            f'/api/v1/places/{place_id}?fields=id&expand=amenities').get_json()
+        self.assertEqual(data, {"id": place_id, "amenities": [
+            {"id": amenity_id, "name": "Wi-Fi"}]})
+
+    def test_get_place_invalid_fields(self):
+        owner_id = self.create_test_user()
+        place_id = self.client.post(
+            '/api/v1/places/',
+            json=self.create_place_payload(owner_id)
+        ).get_json()["id"]
+        for query in ('fields=title,secret', 'fields=', 'expand=reviews'):
+            response = self.client.get(f'/api/v1/places/{place_id}?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_get_places_expand_owner(self):
+        owner_id = self.create_test_user()
+        self.client.post(
+            '/api/v1/places/',
+            json=self.create_place_payload(owner_id)
+        )
+        response = self.client.get('/api/v1/places/?fields=id,price&expand=owner')
+        self.assertEqual(response.status_code, 200)
+        row = response.get_json()[0]
+        self.assertEqual(sorted(row), ["id", "owner", "price"])
+        etag = response.headers["ETag"]
+
+        # The embedded owner is part of the cached response
+        self.client.put(f'/api/v1/users/{owner_id}', json={
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "email": f"jane{uuid.uuid4()}@example.com"
+        })
+        response = self.client.get(
+            '/api/v1/places/?fields=id,price&expand=owner',
+            headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()[0]["owner"]["first_name"], "Jane")
+
+        response = self.client.get(
+            '/api/v1/places/?expand=owner',
+            headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(json.loads(response.get_data(as_text=True))["owner"]["id"],
+                         owner_id)
+
     def test_get_place_by_id_not_found(self):
         response = self.client.get('/api/v1/places/nonexistent-id')
         self.assertEqual(response.status_code, 404)
@@ -278,6 +401,224 @@ class TestPlaceEndpoints(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data, [])
 
+    def test_get_places_paginated(self):
+        owner_id = self.create_test_user()
+        for _ in range(3):
+            self.client.post(
+                '/api/v1/places/',
+                json=self.create_place_payload(owner_id)
+            )
+
+        response = self.client.get('/api/v1/places/?limit=2')
+        self.assertEqual(response.status_code, 200)
+        first_page = response.get_json()
+        self.assertEqual(len(first_page), 2)
+        cursor = response.headers.get('X-Next-Cursor')
+
+        response = self.client.get(f'/api/v1/places/?limit=2&cursor={cursor}')
+        second_page = response.get_json()
+        self.assertEqual(len(second_page), 1)
+        self.assertNotIn(
+            second_page[0]["id"], [place["id"] for place in first_page])
+
+    def test_get_places_invalid_limit(self):
+        response = self.client.get('/api/v1/places/?limit=0')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_create_places(self):
+        owner_id = self.create_test_user()
+        response = self.client.post('/api/v1/places/bulk', json=[
+            self.create_place_payload(owner_id),
+            self.create_place_payload(owner_id, price=-1),
+            self.create_place_payload("invalid-owner-id"),
+            self.create_place_payload(owner_id, latitude=10)
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        results = response.get_json()
+        self.assertEqual(
+            [result["status"] for result in results], [201, 400, 400, 201])
+        self.assertEqual(results[3]["owner_id"], owner_id)
+        self.assertEqual(len(self.client.get('/api/v1/places/').get_json()), 2)
+
+    def test_places_near(self):
+        owner_id = self.create_test_user()
+        for latitude, longitude in [(48.8566, 2.3522), (45.7640, 4.8357),
+                                    (48.8049, 2.1204)]:
+            self.client.post(
+                '/api/v1/places/',
+                json=self.create_place_payload(owner_id, latitude, longitude)
+            )
+
+        response = self.client.get(
+            '/api/v1/places/near?lat=48.86&lon=2.35&radius_km=50&limit=5')
+        self.assertEqual(response.status_code, 200)
+
+        data = response.get_json()
+        self.assertEqual(len(data), 2)
+        self.assertLessEqual(data[0]["distance_km"], data[1]["distance_km"])
+        self.assertEqual(data[0]["latitude"], 48.8566)
+
+    def test_search_places(self):
+        owner_id = self.create_test_user()
+        amenity_id = facade.create_amenity({"name": "Swimming pool"}).id
+        loft = self.client.post('/api/v1/places/', json={
+            **self.create_place_payload(owner_id),
+            "title": "Sunny loft", "amenities": [amenity_id]
+        }).get_json()
+        self.client.post('/api/v1/places/', json={
+            **self.create_place_payload(owner_id), "title": "Quiet cabin"})
+
+        response = self.client.get('/api/v1/places/search?q=sunny%20lo')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([place["id"] for place in data], [loft["id"]])
+        self.assertGreater(data[0]["score"], 0)
+
+        response = self.client.get('/api/v1/places/search?q=pool')
+        self.assertEqual(len(response.get_json()), 1)
+
+        # The index follows the updates of places and amenities
+        self.client.put(f'/api/v1/places/{loft["id"]}',
+                        json={"title": "Bright studio"})
+        facade.update_amenity(amenity_id, {"name": "Jacuzzi"})
+        for query, expected in (('sunny', 0), ('studio', 1),
+                                ('pool', 0), ('jacuzzi', 1)):
+            response = self.client.get(f'/api/v1/places/search?q={query}')
+            self.assertEqual(len(response.get_json()), expected, query)
+
+    def test_search_places_invalid_parameters(self):
+        response = self.client.get('/api/v1/places/search')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/places/search?q=loft&limit=0')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/places/search?q=loft&limit=500')
+        self.assertEqual(response.status_code, 400)
+
+    def test_filter_places_by_amenities_and_price(self):
+        owner_id = self.create_test_user()
+        wifi = facade.create_amenity({"name": "Wifi"}).id
+        pool = facade.create_amenity({"name": "Pool"}).id
+        ids = [self.client.post('/api/v1/places/', json={
+            **self.create_place_payload(owner_id, price=price),
+            "amenities": amenities
+        }).get_json()["id"] for price, amenities in (
+            (50, [wifi]), (100, [wifi, pool]), (150, [pool]), (200, []))]
+
+        response = self.client.get(
+            f'/api/v1/places/?amenities={wifi},{pool}')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["count"], 1)
+        self.assertEqual([place["id"] for place in data["places"]],
+                         [ids[1]])
+        self.assertEqual(data["facets"]["amenities"], {wifi: 1, pool: 1})
+
+        response = self.client.get('/api/v1/places/?min_price=75')
+        data = response.get_json()
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(data["facets"]["amenities"], {wifi: 1, pool: 2})
+
+        response = self.client.get(
+            f'/api/v1/places/?amenities={pool}&max_price=120&fields=id,price')
+        self.assertEqual(response.get_json()["places"],
+                         [{"id": ids[1], "price": 100}])
+
+        response = self.client.get(
+            '/api/v1/places/?min_price=0&limit=2&offset=3')
+        data = response.get_json()
+        self.assertEqual(data["count"], 4)
+        self.assertEqual(len(data["places"]), 1)
+
+    def test_filter_places_follows_writes(self):
+        owner_id = self.create_test_user()
+        wifi = facade.create_amenity({"name": "Wifi"}).id
+        first, second, third = [self.client.post(
+            '/api/v1/places/', json=self.create_place_payload(owner_id)
+        ).get_json()["id"] for _ in range(3)]
+
+        def matches():
+            response = self.client.get(f'/api/v1/places/?amenities={wifi}')
+            return sorted(place["id"] for place in
+                          response.get_json()["places"])
+
+        self.assertEqual(matches(), [])
+        response = self.client.put(
+            f'/api/v1/places/{first}/amenities/{wifi}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(facade.get_place(first).amenity_ids, [wifi])
+        facade.add_place_amenity(third, wifi)
+        facade.add_place_amenity(third, wifi)
+        self.assertEqual(matches(), sorted([first, third]))
+        self.assertEqual(facade.get_place(third).amenity_ids, [wifi])
+
+        # The last row moves into the hole and keeps its amenities
+        response = self.client.delete(f'/api/v1/places/{first}')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.delete(f'/api/v1/places/{first}')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(matches(), [third])
+        self.assertEqual(
+            self.client.get(f'/api/v1/places/{first}').status_code, 404)
+
+        facade.add_place_amenity(second, wifi)
+        self.assertEqual(matches(), sorted([second, third]))
+
+        with self.assertRaises(ValueError):
+            facade.add_place_amenity(second, "unknown")
+        response = self.client.put(
+            f'/api/v1/places/{second}/amenities/unknown')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.put(
+            f'/api/v1/places/unknown/amenities/{wifi}')
+        self.assertEqual(response.status_code, 404)
+
+    def test_filter_places_invalid_parameters(self):
+        for query in ('min_price=cheap', 'amenities=a&cursor=x',
+                      'amenities=a&offset=-1', 'amenities=a&limit=0'):
+            response = self.client.get(f'/api/v1/places/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_places_near_invalid_parameters(self):
+        response = self.client.get('/api/v1/places/near?lat=100&lon=2')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get('/api/v1/places/near?lon=2')
+        self.assertEqual(response.status_code, 400)
+
+    def test_update_place_ignores_properties(self):
+        owner_id = self.create_test_user()
+        place_id = self.client.post(
+            '/api/v1/places/', json=self.create_place_payload(owner_id)
+        ).get_json()["id"]
+
+        response = self.client.put(
+            f'/api/v1/places/{place_id}',
+            json={"title": "Renamed", "amenity_ids": ["x"],
+                  "sort_key": [0, "a"], "created_at": "x", "id": "zzz"})
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual((data["id"], data["title"]), (place_id, "Renamed"))
+        self.assertEqual(facade.get_place(place_id).amenity_ids, [])
+
+    def test_update_place_with_echoed_body(self):
+        owner_id = self.create_test_user()
+        place_id = self.client.post(
+            '/api/v1/places/', json=self.create_place_payload(owner_id)
+        ).get_json()["id"]
+        body = self.client.get(f'/api/v1/places/{place_id}').get_json()
+        etag = self.client.get(f'/api/v1/places/{place_id}').headers['ETag']
+
+        # Read-only keys (version, nested owner) are ignored
+        response = self.client.put(f'/api/v1/places/{place_id}', json={
+            **body, "title": "Renamed", "version": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["owner_id"], owner_id)
+        self.assertNotEqual(facade.get_place(place_id).version, 1)
+        response = self.client.get(f'/api/v1/places/{place_id}')
+        self.assertEqual(response.get_json()["owner"]["id"], owner_id)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
     def test_update_place_valid(self):
         owner_id = self.create_test_user()
 
@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+
+import unittest
+from app.persistence.ratings import RatingAggregates
+
+
+class TestRatingAggregates(unittest.TestCase):
+
+    def setUp(self):
+        self.ratings = RatingAggregates()
+
+    def test_empty_summary(self):
+        summary = self.ratings.summary("p1")
+        self.assertEqual(summary["count"], 0)
+        self.assertIsNone(summary["average"])
+        self.assertEqual(sum(summary["histogram"].values()), 0)
+
+    def test_add_change_remove(self):
+        for rating in (5, 3, 3):
+            self.ratings.add("p1", rating)
+        self.ratings.add("p2", 1)
+        self.ratings.change("p1", 5, 4)
+        self.ratings.remove("p1", 3)
+
+        summary = self.ratings.summary("p1")
+        self.assertEqual(summary["count"], 2)
+        self.assertEqual(summary["sum"], 7)
+        self.assertEqual(summary["average"], 3.5)
+        self.assertEqual(summary["histogram"],
+                         {"1": 0, "2": 0, "3": 1, "4": 1, "5": 0})
+        self.assertEqual(self.ratings.summary("p2")["count"], 1)
+
+    def test_last_review_removed(self):
+        self.ratings.add("p1", 2)
+        self.ratings.remove("p1", 2)
+        self.assertEqual(len(self.ratings), 0)
+        self.assertEqual(self.ratings.summary("p1")["count"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
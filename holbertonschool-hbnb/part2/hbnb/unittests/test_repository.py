@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+
+import unittest
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.repository import InMemoryRepository
+
+
+class TestInMemoryRepositoryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.user_repo = InMemoryRepository(unique_indexes=['email'])
+        self.place_repo = InMemoryRepository(indexes=['owner'])
+        self.owner = User("John", "Doe", "john@example.com")
+        self.user_repo.add(self.owner)
+
+    def test_unique_index_lookup(self):
+        found = self.user_repo.get_by_attribute('email', 'john@example.com')
+        self.assertIs(found, self.owner)
+        self.assertIsNone(
+            self.user_repo.get_by_attribute('email', 'nobody@example.com'))
+
+    def test_unique_index_rejects_duplicate(self):
+        with self.assertRaises(ValueError):
+            self.user_repo.add(User("Jane", "Doe", "john@example.com"))
+
+    def test_unique_index_follows_update(self):
+        self.user_repo.update(self.owner.id, {'email': 'new@example.com'})
+        self.assertIsNone(
+            self.user_repo.get_by_attribute('email', 'john@example.com'))
+        self.assertIs(
+            self.user_repo.get_by_attribute('email', 'new@example.com'),
+            self.owner)
+
+    def test_unique_index_update_conflict(self):
+        other = User("Jane", "Doe", "jane@example.com")
+        self.user_repo.add(other)
+        with self.assertRaises(ValueError):
+            self.user_repo.update(other.id, {'email': 'john@example.com'})
+        self.assertEqual(other.email, 'jane@example.com')
+
+    def test_unique_index_follows_delete(self):
+        self.user_repo.delete(self.owner.id)
+        self.assertIsNone(
+            self.user_repo.get_by_attribute('email', 'john@example.com'))
+        self.user_repo.add(User("Jane", "Doe", "john@example.com"))
+
+    def test_multi_index(self):
+        first = Place("A", "Desc", 100, 45, 3, self.owner)
+        second = Place("B", "Desc", 100, 45, 3, self.owner)
+        self.place_repo.add(first)
+        self.place_repo.add(second)
+
+        places = self.place_repo.get_all_by_attribute('owner', self.owner)
+        self.assertCountEqual(places, [first, second])
+
+        self.place_repo.delete(first.id)
+        self.assertEqual(
+            self.place_repo.get_all_by_attribute('owner', self.owner),
+            [second])
+
+    def test_add_many_is_all_or_nothing(self):
+        users = [
+            User("Jane", "Doe", "jane@example.com"),
+            User("Jack", "Doe", "john@example.com")
+        ]
+        with self.assertRaises(ValueError):
+            self.user_repo.add_many(users)
+        self.assertEqual(len(self.user_repo.get_all()), 1)
+
+        self.user_repo.add_many(users[:1])
+        self.assertIs(
+            self.user_repo.get_by_attribute('email', 'jane@example.com'),
+            users[0])
+
+    def test_unindexed_attribute_falls_back_to_scan(self):
+        self.assertIs(
+            self.user_repo.get_by_attribute('first_name', 'John'),
+            self.owner)
+
+    def test_get_many(self):
+        other = User("Jane", "Doe", "jane@example.com")
+        self.user_repo.add(other)
+        found = self.user_repo.get_many([self.owner.id, 'missing', other.id])
+        self.assertEqual(found, {self.owner.id: self.owner, other.id: other})
+        self.assertEqual(self.user_repo.get_many([]), {})
+
+    def test_update_skips_unchanged_fields(self):
+        version = self.user_repo.version
+        record = self.user_repo.update(
+            self.owner.id, {'email': 'john@example.com'})
+        self.assertFalse(record)
+        self.assertEqual(self.user_repo.version, version)
+
+        record = self.user_repo.update(
+            self.owner.id, {'email': 'john@example.com', 'last_name': 'Roe'})
+        self.assertEqual(record.changes, {'last_name': 'Roe'})
+        self.assertEqual(self.user_repo.version, version + 1)
+        self.assertIsNone(self.user_repo.update('missing', {}))
+
+    def test_clear_resets_indexes(self):
+        self.user_repo.clear()
+        self.assertEqual(self.user_repo.get_all(), [])
+        self.assertIsNone(
+            self.user_repo.get_by_attribute('email', 'john@example.com'))
+
+
+class TestInMemoryRepositoryPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        self.users = [
+            User("John", "Doe", f"john{i}@example.com") for i in range(5)
+        ]
+        for user in self.users:
+            self.repo.add(user)
+        self.users.sort(key=lambda user: (user.created_at, user.id))
+
+    def test_pages_cover_everything_once(self):
+        seen = []
+        items, cursor = self.repo.get_page(2)
+        seen.extend(items)
+        while cursor:
+            items, cursor = self.repo.get_page(2, cursor)
+            seen.extend(items)
+        self.assertEqual(seen, self.users)
+
+    def test_last_page_has_no_cursor(self):
+        items, cursor = self.repo.get_page(5)
+        self.assertEqual(len(items), 5)
+        self.assertIsNone(cursor)
+
+    def test_cursor_survives_deletion(self):
+        items, cursor = self.repo.get_page(2)
+        self.repo.delete(items[-1].id)
+        items, _ = self.repo.get_page(2, cursor)
+        self.assertEqual(items, self.users[2:4])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.repo.get_page(2, "not-a-cursor")
+
+    def test_iter_pages(self):
+        batches = list(self.repo.iter_pages(2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(sum(batches, []), self.users)
+        self.assertEqual(list(InMemoryRepository().iter_pages(2)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+
+import unittest
+from app.services.cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_hit_and_miss_counters(self):
+        cache = ResponseCache()
+        self.assertIsNone(cache.get(('users', 1)))
+        cache.put(('users', 1), b'[]', {'X-Next-Cursor': 'abc'})
+        self.assertEqual(cache.get(('users', 1)),
+                         (b'[]', {'X-Next-Cursor': 'abc'}))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_lru_eviction_by_entries(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put('a', b'1')
+        cache.put('b', b'2')
+        cache.get('a')
+        cache.put('c', b'3')
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_memory_cap(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.put('a', b'x' * 6)
+        cache.put('b', b'y' * 6)
+        self.assertEqual(len(cache), 1)
+        self.assertLessEqual(cache.size, 10)
+        cache.put('c', b'z' * 11)
+        self.assertIsNone(cache.get('c'))
+
+    def test_etag_depends_on_key(self):
+        cache = ResponseCache()
+        self.assertEqual(cache.etag(('user', 'u1', 5)),
+                         cache.etag(('user', 'u1', 5)))
+        self.assertNotEqual(cache.etag(('user', 'u1', 5)),
+                            cache.etag(('user', 'u1', 6)))
+        self.assertNotEqual(ResponseCache().etag('k'), cache.etag('k'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -176,6 +176,76 @@ class TestReviewEndpoints(unittest.TestCase):
         response = self.client.delete('/api/v1/reviews/nonexistent-id')
         self.assertEqual(response.status_code, 404)
 
+    def test_place_reviews_listing(self):
+        """Test listing the reviews of a place through the place index"""
+        user_id = self.create_test_user()
+        place_id = self.create_test_place(user_id)
+        other_id = self.create_test_place(user_id)
+        first = self.client.post(
+            '/api/v1/reviews/',
+            json=self.create_review_payload(user_id, place_id, rating=4)
+        ).get_json()["id"]
+        second = self.client.post(
+            '/api/v1/reviews/',
+            json=self.create_review_payload(user_id, place_id, rating=2)
+        ).get_json()["id"]
+        self.client.post(
+            '/api/v1/reviews/',
+            json=self.create_review_payload(user_id, other_id)
+        )
+
+        response = self.client.get(f'/api/v1/places/{place_id}/reviews')
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual([r["id"] for r in response.get_json()],
+                              [first, second])
+
+        response = self.client.get('/api/v1/places/nonexistent-id/reviews')
+        self.assertEqual(response.status_code, 404)
+
+    def test_place_rating_aggregates(self):
+        """Test the rating summary follows review create/update/delete"""
+        user_id = self.create_test_user()
+        place_id = self.create_test_place(user_id)
+
+        rating = self.client.get(
+            f'/api/v1/places/{place_id}').get_json()["rating"]
+        self.assertEqual(rating["count"], 0)
+        self.assertIsNone(rating["average"])
+
+        ids = [
+            self.client.post(
+                '/api/v1/reviews/',
+                json=self.create_review_payload(user_id, place_id, rating=r)
+            ).get_json()["id"]
+            for r in (5, 4, 4)
+        ]
+        self.client.put(f'/api/v1/reviews/{ids[0]}', json={"rating": 1})
+        self.client.delete(f'/api/v1/reviews/{ids[1]}')
+
+        rating = self.client.get(
+            f'/api/v1/places/{place_id}').get_json()["rating"]
+        self.assertEqual(rating["count"], 2)
+        self.assertEqual(rating["sum"], 5)
+        self.assertEqual(rating["average"], 2.5)
+        self.assertEqual(rating["histogram"],
+                         {"1": 1, "2": 0, "3": 0, "4": 1, "5": 0})
+
+    def test_update_review_invalid_rating(self):
+        """Test updating a review with an invalid rating"""
+        user_id = self.create_test_user()
+        place_id = self.create_test_place(user_id)
+        review_id = self.client.post(
+            '/api/v1/reviews/',
+            json=self.create_review_payload(user_id, place_id)
+        ).get_json()["id"]
+
+        response = self.client.put(
+            f'/api/v1/reviews/{review_id}', json={"rating": 0})
+        self.assertEqual(response.status_code, 400)
+        rating = self.client.get(
+            f'/api/v1/places/{place_id}').get_json()["rating"]
+        self.assertEqual(rating["histogram"]["5"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
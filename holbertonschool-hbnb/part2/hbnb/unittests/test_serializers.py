@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+
+import json
+import unittest
+from flask_restx import fields
+from app.api.serializers import Serializer
+from app.api.v1.serializers import place_detail_serializer, user_serializer
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.user import User
+
+
+class TestSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.owner = User("John", "Doe", "john@example.com")
+        self.place = Place("Loft", "Nice", 120.0, 48.85, 2.35, self.owner)
+        self.wifi = Amenity("Wifi")
+        self.place.add_amenity(self.wifi)
+
+    def test_flat_fields(self):
+        self.assertEqual(user_serializer(self.owner), {
+            'id': self.owner.id,
+            'first_name': "John",
+            'last_name': "Doe",
+            'email': "john@example.com"
+        })
+
+    def test_attribute_path(self):
+        serializer = Serializer('Ref', {
+            'id': fields.String,
+            'owner_id': fields.String(attribute='owner.id')
+        })
+        self.assertEqual(serializer(self.place),
+                         {'id': self.place.id, 'owner_id': self.owner.id})
+
+    def test_compiled_on_first_use(self):
+        serializer = Serializer('Lazy', {'id': fields.String})
+        self.assertIsNone(serializer._functions)
+        self.assertEqual(serializer(self.owner), {'id': self.owner.id})
+        self.assertIn('def serialize_lazy(obj)', serializer.source)
+
+    def test_nested_and_list(self):
+        data = place_detail_serializer(self.place)
+        self.assertEqual(data['owner'], user_serializer(self.owner))
+        self.assertEqual(data['amenities'],
+                         [{'id': self.wifi.id, 'name': "Wifi"}])
+
+    def test_many(self):
+        other = User("Jane", "Doe", "jane@example.com")
+        self.assertEqual(
+            [row['first_name'] for row in
+             user_serializer.many([self.owner, other])],
+            ["John", "Jane"])
+
+    def test_dumps_matches_dicts(self):
+        for serializer, obj in ((user_serializer, self.owner),
+                                (place_detail_serializer, self.place)):
+            self.assertEqual(json.loads(serializer.dumps(obj)),
+                             serializer(obj))
+            self.assertEqual(json.loads(serializer.dumps_many([obj, obj])),
+                             serializer.many([obj, obj]))
+
+    def test_dumps_escapes_strings(self):
+        self.owner.first_name = 'Jo "\\ é'
+        self.assertEqual(json.loads(user_serializer.dumps(self.owner)),
+                         user_serializer(self.owner))
+
+    def test_dumps_falls_back_on_unexpected_values(self):
+        self.place.description = None
+        self.assertIsNone(
+            json.loads(place_detail_serializer.dumps_many(
+                [self.place]))[0]['description'])
+
+    def test_invalid_spec(self):
+        with self.assertRaises(ValueError):
+            Serializer('Bad', {'id': fields.String(attribute='id; import os')})
+        with self.assertRaises(ValueError):
+            Serializer('Bad', {'not valid': fields.String})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from app.persistence.sqlite_repository import sqlite_repository_factory
+from app.services.facade import HBnBFacade
+
+
+def shared_facade(path, **options):
+    return HBnBFacade(
+        sqlite_repository_factory(path, track_changes=True, **options))
+
+
+def close(facade):
+    for repo in facade._repositories().values():
+        repo.close()
+
+
+def create_owner(path, queue):
+    """Child process: create a user through a facade of its own."""
+    facade = shared_facade(path)
+    user = facade.create_user({
+        "first_name": "Child",
+        "last_name": "Process",
+        "email": "child@example.com"
+    })
+    queue.put(user.id)
+
+
+class TestSharedStorage(unittest.TestCase):
+    """Two facades on one database behave like two worker processes."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'hbnb.db')
+        self.first = shared_facade(self.path)
+        self.second = shared_facade(self.path)
+        self.owner = self.first.create_user({
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "john@example.com"
+        })
+
+    def tearDown(self):
+        close(self.first)
+        close(self.second)
+        shutil.rmtree(self.directory)
+
+    def create_place(self, facade, latitude=45.0, longitude=3.0):
+        return facade.create_place({
+            "title": "Shared Place",
+            "price": 100,
+            "latitude": latitude,
+            "longitude": longitude,
+            "owner_id": self.owner.id
+        })
+
+    def test_objects_are_shared(self):
+        version = self.second.collection_version('User')
+        user = self.first.create_user({
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "email": "jane@example.com"
+        })
+        self.assertEqual(self.second.get_user(user.id).email,
+                         "jane@example.com")
+        self.assertNotEqual(self.second.collection_version('User'), version)
+        with self.assertRaises(ValueError):
+            self.second.create_user({
+                "first_name": "Jane",
+                "last_name": "Smith",
+                "email": "jane@example.com"
+            })
+
+    def test_place_indexes_follow_other_writers(self):
+        place = self.create_place(self.first)
+        near = self.second.get_places_near(45.0, 3.0, 10, 5)
+        self.assertEqual([p.id for p, _ in near], [place.id])
+
+        self.first.update_place(place.id, {"price": 300})
+        self.assertEqual(
+            [p.id for p in self.second.get_places_in_range(min_price=200)],
+            [place.id])
+
+        self.first.place_repo.delete(place.id)
+        self.assertEqual(self.second.get_places_near(45.0, 3.0, 10, 5), [])
+
+    def test_ratings_follow_other_writers(self):
+        place = self.create_place(self.first)
+        review = self.second.create_review({
+            "text": "Great",
+            "rating": 4,
+            "user_id": self.owner.id,
+            "place_id": place.id
+        })
+        self.assertEqual(self.first.get_place_rating(place.id)['count'], 1)
+
+        self.first.update_review(review.id, {"rating": 2})
+        self.assertEqual(self.second.get_place_rating(place.id)['sum'], 2)
+
+        # Deleted by the process that did not create it
+        self.assertTrue(self.first.delete_review(review.id))
+        self.assertEqual(self.second.get_place_rating(place.id)['count'], 0)
+
+    def test_reload_after_log_cut(self):
+        # The log size is fixed by whoever creates the database
+        path = os.path.join(self.directory, 'small_log.db')
+        first = shared_facade(path, change_log_size=2)
+        second = shared_facade(path)
+        try:
+            owner = first.create_user({
+                "first_name": "Jane",
+                "last_name": "Doe",
+                "email": "jane@example.com"
+            })
+            places = [first.create_place({
+                "title": "Shared Place",
+                "price": 100,
+                "latitude": 45.0,
+                "longitude": 3.0 + i / 100,
+                "owner_id": owner.id
+            }) for i in range(5)]
+            self.assertIsNone(
+                second.place_repo.changes_since(
+                    second._change_cursors['places']))
+            near = second.get_places_near(45.0, 3.0, 50, 10)
+            self.assertCountEqual([p.id for p, _ in near],
+                                  [p.id for p in places])
+        finally:
+            close(first)
+            close(second)
+
+    @unittest.skipUnless(
+        'fork' in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_forked_process(self):
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        child = context.Process(target=create_owner, args=(self.path, queue))
+        child.start()
+        user_id = queue.get(timeout=30)
+        child.join(30)
+        self.assertEqual(child.exitcode, 0)
+        self.assertEqual(self.first.get_user(user_id).first_name, "Child")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from app.models.user import User
+from app.persistence.sqlite_repository import (
+    SQLiteRepository, sqlite_repository_factory)
+from app.services.facade import HBnBFacade
+
+
+class TestSQLiteRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'hbnb.db')
+        self.repo = SQLiteRepository(
+            self.path, 'users', User, unique_indexes=['email'])
+
+    def tearDown(self):
+        self.repo.close()
+        shutil.rmtree(self.directory)
+
+    def test_crud(self):
+        user = User("John", "Doe", "john@example.com")
+        self.repo.add(user)
+
+        restored = self.repo.get(user.id)
+        self.assertEqual(restored.email, "john@example.com")
+        self.assertEqual(restored.created_at, user.created_at)
+
+        self.repo.update(user.id, {'first_name': 'Jack'})
+        self.assertEqual(self.repo.get(user.id).first_name, 'Jack')
+
+        self.repo.delete(user.id)
+        self.assertIsNone(self.repo.get(user.id))
+
+    def test_partial_update(self):
+        user = User("John", "Doe", "john@example.com")
+        self.repo.add(user)
+        version = self.repo.version
+        self.assertFalse(self.repo.update(user.id, {'email': user.email}))
+        self.assertEqual(self.repo.version, version)
+
+        record = self.repo.update(
+            user.id, {'email': 'jack@example.com', 'first_name': 'Jack'})
+        self.assertEqual(sorted(record.changes), ['email', 'first_name'])
+        restored = self.repo.get(user.id)
+        self.assertEqual(restored.first_name, 'Jack')
+        self.assertEqual(restored.last_name, 'Doe')
+        self.assertEqual(restored.updated_at, record.obj.updated_at)
+        self.assertEqual(
+            self.repo.get_by_attribute('email', 'jack@example.com').id,
+            user.id)
+
+    def test_unique_index(self):
+        self.repo.add(User("John", "Doe", "john@example.com"))
+        with self.assertRaises(ValueError):
+            self.repo.add(User("Jane", "Doe", "john@example.com"))
+        found = self.repo.get_by_attribute('email', 'john@example.com')
+        self.assertEqual(found.first_name, "John")
+
+    def test_get_many(self):
+        users = [User("John", "Doe", f"john{i}@example.com")
+                 for i in range(3)]
+        self.repo.add_many(users)
+        found = self.repo.get_many([users[0].id, 'missing', users[2].id])
+        self.assertEqual(sorted(found), sorted([users[0].id, users[2].id]))
+        self.assertEqual(found[users[2].id].email, "john2@example.com")
+        self.assertEqual(self.repo.get_many([]), {})
+
+    def test_unindexed_lookup(self):
+        self.repo.add(User("John", "Doe", "john@example.com"))
+        found = self.repo.get_by_attribute('first_name', 'John')
+        self.assertEqual(found.email, "john@example.com")
+        self.assertIsNone(self.repo.get_by_attribute('first_name', 'Jack'))
+
+    def test_pagination(self):
+        for i in range(5):
+            self.repo.add(User("John", "Doe", f"john{i}@example.com"))
+        seen = []
+        items, cursor = self.repo.get_page(2)
+        seen.extend(items)
+        while cursor:
+            items, cursor = self.repo.get_page(2, cursor)
+            seen.extend(items)
+        self.assertEqual(len({user.id for user in seen}), 5)
+
+    def test_batch_rollback(self):
+        with self.assertRaises(ValueError):
+            with self.repo.batch():
+                self.repo.add(User("John", "Doe", "john@example.com"))
+                self.repo.add(User("Jane", "Doe", "john@example.com"))
+        self.assertEqual(self.repo.get_all(), [])
+
+    def test_connection_per_thread(self):
+        self.repo.add(User("John", "Doe", "john@example.com"))
+        results = []
+
+        def worker():
+            results.append(
+                self.repo.get_by_attribute('email', 'john@example.com'))
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertEqual(results[0].first_name, "John")
+        self.assertEqual(len(self.repo._connections), 2)
+
+    def test_facade_references(self):
+        facade = HBnBFacade(sqlite_repository_factory(self.path))
+        owner = facade.create_user({
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "owner@example.com"
+        })
+        place = facade.create_place({
+            "title": "Test Place",
+            "price": 100,
+            "latitude": 45,
+            "longitude": 3,
+            "owner_id": owner.id
+        })
+        restored = facade.get_place(place.id)
+        self.assertEqual(restored.owner.id, owner.id)
+        self.assertEqual(
+            facade.place_repo.get_by_attribute('owner', owner).id, place.id)
+        for repo in facade._repositories().values():
+            repo.close()
+
+
+class TestSQLiteChangeLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'hbnb.db')
+        # Two handles on one database, as in two worker processes
+        self.repo = SQLiteRepository(
+            self.path, 'users', User, unique_indexes=['email'],
+            track_changes=True, change_log_size=3)
+        self.other = SQLiteRepository(
+            self.path, 'users', User, unique_indexes=['email'],
+            track_changes=True, change_log_size=3)
+
+    def tearDown(self):
+        self.repo.close()
+        self.other.close()
+        shutil.rmtree(self.directory)
+
+    def test_version_is_shared(self):
+        version = self.other.version
+        self.repo.add(User("John", "Doe", "john@example.com"))
+        self.assertGreater(self.other.version, version)
+        self.assertEqual(self.other.version, self.repo.version)
+
+    def test_changes_since(self):
+        cursor = self.other.change_cursor()
+        user = User("John", "Doe", "john@example.com")
+        self.repo.add(user)
+        self.repo.update(user.id, {'first_name': 'Jack'})
+        cursor, ids = self.other.changes_since(cursor)
+        self.assertEqual(ids, {user.id})
+        self.assertEqual(self.other.changes_since(cursor), (cursor, set()))
+
+        self.repo.delete(user.id)
+        self.assertEqual(self.other.changes_since(cursor)[1], {user.id})
+
+    def test_cut_log_asks_for_reload(self):
+        cursor = self.other.change_cursor()
+        for i in range(5):
+            self.repo.add(User("John", "Doe", f"john{i}@example.com"))
+        self.assertIsNone(self.other.changes_since(cursor))
+        cursor = self.other.change_cursor()
+        self.assertEqual(self.other.changes_since(cursor), (cursor, set()))
+
+
+if __name__ == '__main__':
+    unittest.main()
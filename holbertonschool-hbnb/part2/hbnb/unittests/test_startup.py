@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+
+import subprocess
+import sys
+import unittest
+from app import create_app
+from app.cli import PROJECT_ROOT, by_package, parse_importtime, total_us
+from app.services.facade import HBnBFacade
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _json
+import time:       300 |        420 |   json.decoder
+import time:       500 |        920 | json
+import time:        80 |         80 | app
+"""
+
+
+class TestImportReport(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        entries = parse_importtime(SAMPLE)
+        self.assertEqual(entries[0], ('_json', 120, 120, 2))
+        self.assertEqual(entries[2], ('json', 500, 920, 0))
+        self.assertEqual(total_us(entries), 1000)
+        self.assertEqual(by_package(entries),
+                         {'_json': 120, 'json': 800, 'app': 80})
+
+    def test_command(self):
+        runner = create_app().test_cli_runner()
+        result = runner.invoke(args=['import-report', '--top', '3',
+                                     '--repeat', '1'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('import time of', result.output)
+        self.assertIn('by top-level package', result.output)
+
+        result = runner.invoke(args=['import-report', '--repeat', '1',
+                                     '--budget-ms', '0.001'])
+        self.assertEqual(result.exit_code, 1)
+
+    def test_numpy_not_imported_at_startup(self):
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import sys; from app import create_app; create_app(); '
+             'print("numpy" in sys.modules)'],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+
+
+class TestLazyIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.facade = HBnBFacade(lazy_indexes=True)
+        self.owner = self.facade.create_user({
+            "first_name": "John",
+            "last_name": "Doe",
+            "email": "john@example.com"
+        })
+
+    def create_place(self):
+        return self.facade.create_place({
+            "title": "Lazy Place",
+            "price": 100,
+            "latitude": 45.0,
+            "longitude": 3.0,
+            "owner_id": self.owner.id
+        })
+
+    def test_place_indexes_built_by_first_query(self):
+        place = self.create_place()
+        self.assertEqual(len(self.facade.place_geo), 0)
+        near = self.facade.get_places_near(45.0, 3.0, 10, 5)
+        self.assertEqual([p.id for p, _ in near], [place.id])
+
+        other = self.create_place()
+        self.assertCountEqual(
+            [p.id for p in self.facade.get_places_in_range(min_price=50)],
+            [place.id, other.id])
+
+    def test_ratings_built_by_first_query(self):
+        place = self.create_place()
+        review = self.facade.create_review({
+            "text": "Great",
+            "rating": 4,
+            "user_id": self.owner.id,
+            "place_id": place.id
+        })
+        self.assertEqual(len(self.facade.place_ratings), 0)
+        self.assertEqual(self.facade.get_place_rating(place.id)['count'], 1)
+
+        self.facade.delete_review(review.id)
+        self.assertEqual(self.facade.get_place_rating(place.id)['count'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
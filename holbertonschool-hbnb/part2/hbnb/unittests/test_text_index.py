@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+
+import unittest
+from app.persistence.text_index import TextIndex, tokenize
+
+
+class TestTextIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = TextIndex({'title': 3.0})
+        self.index.add('loft', {'title': 'Sunny loft',
+                                'description': 'A loft near the café'})
+        self.index.add('cabin', {'title': 'Cosy cabin',
+                                 'description': 'Quiet cabin, sunny deck'})
+        self.index.add('flat', {'title': 'Flat',
+                                'description': 'Cosy and central'})
+
+    def ids(self, query, **options):
+        return [doc_id for _, doc_id in self.index.search(query, **options)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Café, CRÈME-brûlée!"),
+                         ['cafe', 'creme', 'brulee'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.ids('sunny cabin'), ['cabin'])
+        self.assertEqual(self.ids('cafe'), ['loft'])
+        self.assertEqual(self.ids('sunny castle'), [])
+        self.assertEqual(self.ids(''), [])
+
+    def test_title_weighs_more(self):
+        # 'cosy' is in the title of the cabin, the description of the flat
+        self.assertEqual(self.ids('cosy'), ['cabin', 'flat'])
+
+    def test_prefix_of_last_term(self):
+        self.assertEqual(self.ids('co'), ['cabin', 'flat'])
+        self.assertEqual(self.ids('sunny ca'), ['cabin', 'loft'])
+        self.assertEqual(self.ids('co', prefix=False), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.ids('co', limit=1)), 1)
+
+    def test_replace_and_remove(self):
+        self.index.add('cabin', {'title': 'Mountain hut'})
+        self.assertEqual(self.ids('cosy'), ['flat'])
+        self.assertEqual(self.ids('hut'), ['cabin'])
+        self.index.remove('cabin')
+        self.assertEqual(self.ids('hut'), [])
+        self.assertEqual(self.index.expand('m'), [])
+        self.assertEqual(len(self.index), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 
+import json
 import unittest
 import uuid
 from app import create_app
@@ -137,6 +138,20 @@ class TestUserEndpoints(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data["id"], user_id)
 
+    def test_get_user_fields(self):
+        user_id = self.client.post(
+            '/api/v1/users/',
+            json=self.create_user_payload()
+        ).get_json()["id"]
+
+        response = self.client.get(f'/api/v1/users/{user_id}?fields=id,first_name')
+        self.assertEqual(response.get_json(),
+                         {"id": user_id, "first_name": "John"})
+        response = self.client.get('/api/v1/users/?fields=last_name')
+        self.assertEqual(response.get_json(), [{"last_name": "Doe"}])
+        response = self.client.get(f'/api/v1/users/{user_id}?fields=password')
+        self.assertEqual(response.status_code, 400)
+
     def test_get_user_by_id_not_found(self):
         response = self.client.get('/api/v1/users/nonexistent-id')
 
@@ -149,6 +164,26 @@ class TestUserEndpoints(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json(), [])
 
+    def test_stream_users_empty(self):
+        response = self.client.get('/api/v1/users/?stream=true')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [])
+
+    def test_stream_users(self):
+        self.client.post('/api/v1/users/bulk', json=[
+            self.create_user_payload() for _ in range(3)])
+        expected = self.client.get('/api/v1/users/').get_json()
+
+        response = self.client.get('/api/v1/users/?stream=true')
+        self.assertTrue(response.is_streamed)
+        self.assertCountEqual(response.get_json(), expected)
+
+        response = self.client.get(
+            '/api/v1/users/', headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertCountEqual([json.loads(line) for line in lines], expected)
+
     def test_get_all_users_with_data(self):
         self.client.post(
             '/api/v1/users/',
@@ -163,6 +198,45 @@ class TestUserEndpoints(unittest.TestCase):
         self.assertIsInstance(data, list)
         self.assertGreaterEqual(len(data), 1)
 
+    def test_get_users_paginated(self):
+        for _ in range(3):
+            self.client.post('/api/v1/users/', json=self.create_user_payload())
+
+        response = self.client.get('/api/v1/users/?limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 2)
+        cursor = response.headers.get('X-Next-Cursor')
+        self.assertIsNotNone(cursor)
+
+        response = self.client.get(f'/api/v1/users/?limit=2&cursor={cursor}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 1)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_get_users_invalid_cursor(self):
+        response = self.client.get('/api/v1/users/?cursor=invalid')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_create_users(self):
+        duplicate = f"john{uuid.uuid4()}@example.com"
+        response = self.client.post('/api/v1/users/bulk', json=[
+            self.create_user_payload(email=duplicate),
+            self.create_user_payload(email=duplicate),
+            self.create_user_payload(email="invalid-email"),
+            self.create_user_payload()
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        results = response.get_json()
+        self.assertEqual(
+            [result["status"] for result in results], [201, 400, 400, 201])
+        self.assertEqual(len(self.client.get('/api/v1/users/').get_json()), 2)
+
+    def test_bulk_create_users_not_a_list(self):
+        response = self.client.post(
+            '/api/v1/users/bulk', json=self.create_user_payload())
+        self.assertEqual(response.status_code, 400)
+
     def test_update_user_valid(self):
         create_response = self.client.post(
             '/api/v1/users/',
@@ -184,6 +258,29 @@ class TestUserEndpoints(unittest.TestCase):
         data = response.get_json()
         self.assertEqual(data["first_name"], "Updated")
 
+    def test_update_user_ignores_protected_fields(self):
+        payload = self.create_user_payload()
+        user_id = self.client.post(
+            '/api/v1/users/', json=payload).get_json()["id"]
+
+        for data in ({"created_at": "x"}, {"updated_at": "x"},
+                     {"sort_key": [0, "a"]}, {"id": "zzz"},
+                     {"_updated": 0}):
+            response = self.client.put(f'/api/v1/users/{user_id}',
+                                       json={**payload, **data})
+            self.assertEqual(response.status_code, 200, data)
+            self.assertEqual(response.get_json()["id"], user_id)
+
+        # The user keeps its id, in the storage and in the email index
+        self.assertEqual(
+            self.client.get('/api/v1/users/zzz').status_code, 404)
+        self.assertEqual(
+            self.client.get(f'/api/v1/users/{user_id}').status_code, 200)
+        self.assertEqual(facade.get_user_by_email(payload["email"]).id,
+                         user_id)
+        response = self.client.post('/api/v1/users/', json=payload)
+        self.assertEqual(response.status_code, 400)
+
     def test_update_user_not_found(self):
         response = self.client.put(
             '/api/v1/users/nonexistent-id',
@@ -193,6 +290,38 @@ class TestUserEndpoints(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertIn("error", response.get_json())
 
+    def test_get_users_etag(self):
+        self.client.post('/api/v1/users/', json=self.create_user_payload())
+        response = self.client.get('/api/v1/users/')
+        etag = response.headers["ETag"]
+
+        response = self.client.get(
+            '/api/v1/users/', headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.client.post('/api/v1/users/', json=self.create_user_payload())
+        response = self.client.get(
+            '/api/v1/users/', headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(len(response.get_json()), 2)
+
+    def test_get_user_etag_changes_on_update(self):
+        user_id = self.client.post(
+            '/api/v1/users/', json=self.create_user_payload()
+        ).get_json()["id"]
+        etag = self.client.get(f'/api/v1/users/{user_id}').headers["ETag"]
+
+        self.client.put(f'/api/v1/users/{user_id}', json={
+            "first_name": "Updated",
+            "last_name": "Name",
+            "email": f"updated{uuid.uuid4()}@example.com"
+        })
+        response = self.client.get(
+            f'/api/v1/users/{user_id}', headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["first_name"], "Updated")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
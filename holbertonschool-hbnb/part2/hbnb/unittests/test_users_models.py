@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 import unittest
+from datetime import datetime
 from app.models.user import User
 
 
@@ -61,6 +62,58 @@ class TestUserModel(unittest.TestCase):
             user = User("John", "Doe", email)
             self.assertEqual(user.email, email)
 
+    def test_user_has_no_instance_dict(self):
+        user = User("John", "Doe", "john@example.com")
+        self.assertFalse(hasattr(user, '__dict__'))
+        with self.assertRaises(AttributeError):
+            user.nickname = "JD"
+
+    def test_update_ignores_unknown_attributes(self):
+        user = User("John", "Doe", "john@example.com")
+        before = user.updated_at
+        user.update({'first_name': 'Jack', 'nickname': 'JD'})
+        self.assertEqual(user.first_name, 'Jack')
+        self.assertFalse(hasattr(user, 'nickname'))
+        self.assertGreaterEqual(user.updated_at, before)
+
+    def test_update_returns_changes(self):
+        user = User("John", "Doe", "john@example.com")
+        record = user.update({'first_name': 'Jack', 'last_name': 'Doe'})
+        self.assertTrue(record)
+        self.assertEqual(record.changes, {'first_name': 'Jack'})
+        self.assertEqual(record.previous, {'first_name': 'John'})
+        self.assertTrue(record.touches('first_name', 'email'))
+        self.assertFalse(record.touches('last_name'))
+        self.assertEqual(record.version, user.version)
+
+    def test_noop_update_keeps_version(self):
+        user = User("John", "Doe", "john@example.com")
+        version = user.version
+        record = user.update({'first_name': 'John', 'nickname': 'JD'})
+        self.assertFalse(record)
+        self.assertEqual(user.version, version)
+
+    def test_update_ignores_protected_fields(self):
+        user = User("John", "Doe", "john@example.com")
+        user_id, created, version = user.id, user._created, user.version
+        record = user.update({'id': 'other', '_created': 0, '_updated': 0,
+                              'created_at': 'x', 'updated_at': 'x',
+                              'sort_key': (0, 'a'), 'version': 1})
+        self.assertFalse(record)
+        self.assertEqual((user.id, user._created, user.version),
+                         (user_id, created, version))
+        self.assertNotIn('id', User.updatable_fields())
+        self.assertIn('email', User.updatable_fields())
+
+    def test_timestamps_are_datetimes(self):
+        user = User("John", "Doe", "john@example.com")
+        self.assertIsInstance(user.created_at, datetime)
+        self.assertEqual(user.created_at, user.updated_at)
+
+        moment = datetime(2024, 1, 2, 3, 4, 5, 678901)
+        user.created_at = moment
+        self.assertEqual(user.created_at, moment)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file